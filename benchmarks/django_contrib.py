@@ -0,0 +1,59 @@
+"""
+Compares Django's plain ASGI handler with `lynara.contrib.django` on a view
+without and with a database query.
+
+    python -m benchmarks.django_contrib
+"""
+
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.types import LifespanMode
+from tests.apps.django_app import django_asgi_app, lynara_django_app
+
+EVENT_PATH = Path(__file__).parent.parent / "tests/event_examples/api_gw_v2.json"
+ROUNDS = 5000
+
+
+def get_event(path):
+    event = json.loads(EVENT_PATH.read_text())
+    event["requestContext"]["http"]["method"] = "GET"
+    event["requestContext"]["http"]["path"] = path
+    return event
+
+
+def main():
+    handlers = {"django": django_asgi_app, "lynara": lynara_django_app}
+    paths = {"view": "/django/", "query": "/django/connection/"}
+    runs = {
+        (path_name, handler_name): (
+            Lynara(handler, lifespan_mode=LifespanMode.OFF),
+            get_event(path),
+        )
+        for path_name, path in paths.items()
+        for handler_name, handler in handlers.items()
+    }
+    timings: dict[tuple[str, str], list[float]] = {key: [] for key in runs}
+    # Rounds are interleaved so drift of the machine affects every run alike
+    for round_number in range(ROUNDS + 100):
+        for key, (lynara, event) in runs.items():
+            start = perf_counter()
+            lynara.handle(event, None, APIGatewayProxyEventV2Interface)
+            if round_number >= 100:
+                timings[key].append(perf_counter() - start)
+
+    for (path_name, handler_name), (lynara, _) in runs.items():
+        lynara.close()
+        results = sorted(timings[path_name, handler_name])
+        print(  # noqa: T201
+            f"{path_name:<6} {handler_name:<7} "
+            f"median {median(results) * 1000:.3f} ms, "
+            f"p99 {results[int(len(results) * 0.99)] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
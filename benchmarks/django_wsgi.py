@@ -0,0 +1,63 @@
+"""
+Compares handling the same Django app through the ASGI and the WSGI path.
+
+    python -m benchmarks.django_wsgi
+"""
+
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara, LynaraWSGI
+from lynara.types import LifespanMode
+from tests.apps.django_app import django_asgi_app, django_wsgi_app
+
+EVENT_PATH = Path(__file__).parent.parent / "tests/event_examples/api_gw_v2.json"
+ROUNDS = 2000
+
+
+def get_event():
+    event = json.loads(EVENT_PATH.read_text())
+    event["requestContext"]["http"]["method"] = "GET"
+    event["requestContext"]["http"]["path"] = "/django/"
+    return event
+
+
+def measure(handler) -> list[float]:
+    event = get_event()
+    for _ in range(100):
+        handler(event)
+    timings = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        handler(event)
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def main():
+    asgi = Lynara(django_asgi_app, lifespan_mode=LifespanMode.OFF)
+    wsgi = LynaraWSGI(django_wsgi_app)
+    try:
+        # Through the warm loop kept by handle, as the ASGI path is deployed
+        results = {
+            "ASGI (handle)": measure(
+                lambda event: asgi.handle(event, None, APIGatewayProxyEventV2Interface)
+            ),
+            "WSGI": measure(
+                lambda event: wsgi.run(event, None, APIGatewayProxyEventV2Interface)
+            ),
+        }
+    finally:
+        asgi.close()
+    for name, timings in results.items():
+        timings.sort()
+        print(  # noqa: T201
+            f"{name:<20} median {median(timings) * 1000:.3f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
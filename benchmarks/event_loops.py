@@ -0,0 +1,67 @@
+"""
+Compares the FastAPI and Django test apps handled on each event loop
+implementation available.
+
+    python -m benchmarks.event_loops
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.loops import get_loop_factory
+from lynara.types import LifespanMode
+from tests.apps.django_app import django_asgi_app
+from tests.apps.fastapi_app import get_fast_api_app
+
+EVENT_PATH = Path(__file__).parent.parent / "tests/event_examples/api_gw_v2.json"
+ROUNDS = 5000
+
+
+def get_event(path):
+    event = json.loads(EVENT_PATH.read_text())
+    event["requestContext"]["http"]["method"] = "GET"
+    event["requestContext"]["http"]["path"] = path
+    return event
+
+
+def main():
+    loop_factories = {"asyncio": asyncio.new_event_loop}
+    if get_loop_factory() is not asyncio.new_event_loop:
+        loop_factories["uvloop"] = get_loop_factory()
+    apps = {
+        "FastAPI": (get_fast_api_app(), "/fastapi/"),
+        "Django": (django_asgi_app, "/django/"),
+    }
+    runs = {
+        (app_name, loop_name): (
+            Lynara(app, lifespan_mode=LifespanMode.OFF, loop_factory=loop_factory),
+            get_event(path),
+        )
+        for app_name, (app, path) in apps.items()
+        for loop_name, loop_factory in loop_factories.items()
+    }
+    timings: dict[tuple[str, str], list[float]] = {key: [] for key in runs}
+    # Rounds are interleaved so drift of the machine affects every loop alike
+    for round_number in range(ROUNDS + 100):
+        for key, (lynara, event) in runs.items():
+            start = perf_counter()
+            lynara.handle(event, None, APIGatewayProxyEventV2Interface)
+            if round_number >= 100:
+                timings[key].append(perf_counter() - start)
+
+    for (app_name, loop_name), (lynara, _) in runs.items():
+        lynara.close()
+        results = sorted(timings[app_name, loop_name])
+        print(  # noqa: T201
+            f"{app_name:<8} {loop_name:<8} "
+            f"median {median(results) * 1000:.3f} ms, "
+            f"p99 {results[int(len(results) * 0.99)] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
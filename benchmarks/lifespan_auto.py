@@ -0,0 +1,60 @@
+"""
+Compares invocations of the Django test app, which does not support lifespan,
+driven with `asyncio.run` in each lifespan mode, with and without the outcome
+of the AUTO mode probe remembered.
+
+    python -m benchmarks.lifespan_auto
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.types import LifespanMode
+from tests.apps.django_app import django_asgi_app
+
+EVENT_PATH = Path(__file__).parent.parent / "tests/event_examples/api_gw_v2.json"
+ROUNDS = 5000
+REPROBED = "AUTO, re-probed each time"
+
+
+def get_event():
+    event = json.loads(EVENT_PATH.read_text())
+    event["requestContext"]["http"]["method"] = "GET"
+    event["requestContext"]["http"]["path"] = "/django/"
+    return event
+
+
+def main():
+    event = get_event()
+    runs = {
+        "OFF": Lynara(django_asgi_app, lifespan_mode=LifespanMode.OFF),
+        "AUTO": Lynara(django_asgi_app, lifespan_mode=LifespanMode.AUTO),
+        REPROBED: Lynara(django_asgi_app, lifespan_mode=LifespanMode.AUTO),
+    }
+    timings: dict[str, list[float]] = {name: [] for name in runs}
+    # Rounds are interleaved so drift of the machine affects every mode alike
+    for round_number in range(ROUNDS + 100):
+        for name, lynara in runs.items():
+            if name == REPROBED:
+                # Forgets the outcome, as before it was remembered
+                lynara.lifespan_supported[0] = None
+            start = perf_counter()
+            asyncio.run(lynara.run(event, None, APIGatewayProxyEventV2Interface))
+            if round_number >= 100:
+                timings[name].append(perf_counter() - start)
+
+    for name, results in timings.items():
+        results.sort()
+        print(  # noqa: T201
+            f"{name:<26} "
+            f"median {median(results) * 1000:.3f} ms, "
+            f"p99 {results[int(len(results) * 0.99)] * 1000:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,60 @@
-from lynara.interfaces import (
-    APIGatewayProxyEventV1Interface,
-    APIGatewayProxyEventV2Interface,
-    LifespanInterface,
-)
-from lynara.runner import Lynara
+from importlib import import_module
+
+# Avoids importing `typing` at runtime, type checkers treat it as the real flag
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from lynara.interfaces import (
+        APIGatewayProxyEventV1Interface,
+        APIGatewayProxyEventV2Interface,
+        DirectInvocationInterface,
+        EventInterface,
+        EventRule,
+        FunctionURLStreamingInterface,
+        LifespanInterface,
+    )
+    from lynara.routing import Mount
+    from lynara.runner import Lynara
+    from lynara.wsgi import LynaraWSGI
+
+# Exports are resolved on first access so a cold start only pays for the
+# modules the handler actually uses
+_EXPORTS = {
+    "Lynara": "lynara.runner",
+    "LynaraWSGI": "lynara.wsgi",
+    "Mount": "lynara.routing",
+    "APIGatewayProxyEventV2Interface": "lynara.interfaces.api_http",
+    "APIGatewayProxyEventV1Interface": "lynara.interfaces.api_rest",
+    "DirectInvocationInterface": "lynara.interfaces.direct",
+    "EventInterface": "lynara.interfaces.events",
+    "EventRule": "lynara.interfaces.events",
+    "FunctionURLStreamingInterface": "lynara.interfaces.function_url",
+    "LifespanInterface": "lynara.interfaces.lifespan",
+}
 
 __all__ = [
     "Lynara",
+    "LynaraWSGI",
+    "Mount",
     "APIGatewayProxyEventV2Interface",
     "APIGatewayProxyEventV1Interface",
+    "DirectInvocationInterface",
+    "EventInterface",
+    "EventRule",
+    "FunctionURLStreamingInterface",
     "LifespanInterface",
 ]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
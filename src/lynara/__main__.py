@@ -0,0 +1,78 @@
+import argparse
+import logging
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lynara")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bundle = commands.add_parser(
+        "bundle", help="build a deployment zip optimized for cold starts"
+    )
+    bundle.add_argument("handler", help="the handler entry point, `module.function`")
+    bundle.add_argument("-o", "--output", type=Path, default=Path("bundle.zip"))
+    bundle.add_argument(
+        "-s", "--source", type=Path, default=Path("."), help="the app's directory"
+    )
+    bundle.add_argument("-r", "--requirements", type=Path)
+    bundle.add_argument(
+        "--python",
+        default=sys.executable,
+        help="the interpreter of the target Python version, used to install, "
+        "compile and measure",
+    )
+    bundle.add_argument(
+        "--platform", help="the target platform of binary wheels, passed to pip"
+    )
+    bundle.add_argument(
+        "--trace-imports",
+        action="store_true",
+        help="drop the modules not imported during a priming run",
+    )
+    bundle.add_argument(
+        "--event",
+        type=Path,
+        help="a JSON event the priming run invokes the handler with",
+    )
+    bundle.add_argument(
+        "--keep",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="a glob of bundle paths never stripped or pruned",
+    )
+    bundle.add_argument(
+        "--strip-test-packages",
+        action="store_true",
+        help="also strip test and docs directories that are subpackages, "
+        "which may be imported at runtime",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from lynara.bundle import build_bundle
+
+    report = build_bundle(
+        args.handler,
+        args.output,
+        source=args.source,
+        requirements=args.requirements,
+        python=args.python,
+        platform=args.platform,
+        trace=args.trace_imports,
+        event=args.event,
+        keep=args.keep,
+        strip_packages=args.strip_test_packages,
+    )
+    sys.stdout.write(f"{args.output}\n{report.format()}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path
+from statistics import median
+
+LOGGER = logging.getLogger(__name__)
+
+STRIPPED_DIRECTORIES = {"tests", "test", "docs", "doc", "examples", "__pycache__"}
+STRIPPED_SUFFIXES = {".pyi", ".pyx", ".pxd", ".c", ".h"}
+# Files of `*.dist-info` read at runtime, by `importlib.metadata` or entry points
+KEPT_DIST_INFO_FILES = {"METADATA", "entry_points.txt", "top_level.txt"}
+IGNORED_SOURCES = {".git", ".venv", "venv", "node_modules", ".pytest_cache"}
+# Zip entries get a fixed date, so identical inputs build identical bundles
+ZIP_DATE_TIME = (2020, 1, 1, 0, 0, 0)
+
+PRIMING_SCRIPT = """
+import importlib, json, sys
+module_name, output, handler_name, event_path = sys.argv[1:5]
+module = importlib.import_module(module_name)
+if event_path:
+    with open(event_path) as event:
+        getattr(module, handler_name)(json.load(event), None)
+files = [getattr(loaded, "__file__", None) for loaded in list(sys.modules.values())]
+with open(output, "w") as modules:
+    json.dump(files, modules)
+"""
+
+
+class BundleReport:
+    __slots__ = (
+        "size_before",
+        "size_after",
+        "zip_size_before",
+        "zip_size_after",
+        "import_time_before",
+        "import_time_after",
+        "pruned_modules",
+    )
+
+    def __init__(self) -> None:
+        self.size_before = 0
+        self.size_after = 0
+        self.zip_size_before = 0
+        self.zip_size_after = 0
+        self.import_time_before = 0.0
+        self.import_time_after = 0.0
+        self.pruned_modules = 0
+
+    def format(self) -> str:
+        rows = [
+            ("", "before", "after"),
+            ("unpacked", _mb(self.size_before), _mb(self.size_after)),
+            ("zipped", _mb(self.zip_size_before), _mb(self.zip_size_after)),
+            (
+                "import",
+                f"{self.import_time_before * 1000:.1f} ms",
+                f"{self.import_time_after * 1000:.1f} ms",
+            ),
+        ]
+        lines = [f"{name:<10}{before:>12}{after:>12}" for name, before, after in rows]
+        if self.pruned_modules:
+            lines.append(f"pruned {self.pruned_modules} modules never imported")
+        return "\n".join(lines)
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+def get_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def install_requirements(
+    python: str, requirements: Path, target: Path, platform: str | None = None
+) -> None:
+    command = [python, "-m", "pip", "install", "--quiet", "--target", str(target)]
+    command += ["--requirement", str(requirements)]
+    if platform is not None:
+        command += ["--platform", platform, "--only-binary=:all:"]
+    subprocess.run(command, check=True)
+
+
+def copy_sources(source: Path, target: Path) -> None:
+    shutil.copytree(
+        source,
+        target,
+        ignore=shutil.ignore_patterns(*IGNORED_SOURCES),
+        dirs_exist_ok=True,
+    )
+
+
+def is_kept(path: Path, root: Path, keep: list[str]) -> bool:
+    relative_path = path.relative_to(root).as_posix()
+    return any(fnmatch(relative_path, pattern) for pattern in keep)
+
+
+def is_package(path: Path) -> bool:
+    return (path / "__init__.py").is_file()
+
+
+def strip(root: Path, keep: list[str], strip_packages: bool = False) -> None:
+    """
+    Removes tests, docs, examples, type stubs and build leftovers, and the
+    files of `*.dist-info` directories that are not read at runtime.
+
+    Such a directory that is a subpackage, e.g. `django/test`, may be
+    imported at runtime and is only removed with `strip_packages`.
+    """
+    for path in sorted(root.rglob("*"), reverse=True):
+        if not path.exists() or is_kept(path, root, keep):
+            continue
+        if path.is_dir() and path.name in STRIPPED_DIRECTORIES:
+            if is_package(path) and is_package(path.parent) and not strip_packages:
+                continue
+            shutil.rmtree(path)
+            if path.name != "__pycache__":
+                LOGGER.info("Stripped %s", path.relative_to(root).as_posix())
+        elif path.is_file() and (
+            path.suffix in STRIPPED_SUFFIXES
+            or (
+                path.parent.name.endswith(".dist-info")
+                and path.name not in KEPT_DIST_INFO_FILES
+                and not path.name.startswith("LICENSE")
+            )
+        ):
+            path.unlink()
+
+
+def trace_imports(
+    python: str, root: Path, handler: str, event: Path | None = None
+) -> set[Path]:
+    """
+    Imports the handler's module, invokes the handler with `event` when
+    given, and returns the files of every module loaded meanwhile.
+    """
+    module_name, _, handler_name = handler.rpartition(".")
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / "modules.json"
+        subprocess.run(
+            [python, "-c", PRIMING_SCRIPT, module_name, str(output), handler_name]
+            + [str(event) if event is not None else ""],
+            check=True,
+            cwd=root,
+            env={**os.environ, "PYTHONPATH": str(root)},
+        )
+        files = json.loads(output.read_text())
+    return {Path(file).resolve() for file in files if file}
+
+
+def prune(root: Path, loaded: set[Path], keep: list[str]) -> int:
+    """
+    Removes the Python modules that were never loaded. Data files and
+    shared libraries are left alone, loaded modules may read them.
+    """
+    pruned = 0
+    for path in root.rglob("*.py"):
+        if path.resolve() not in loaded and not is_kept(path, root, keep):
+            path.unlink()
+            pruned += 1
+    return pruned
+
+
+def precompile(python: str, root: Path) -> None:
+    # Lambda's file system is read-only and the zip rounds mtimes, so the
+    # bytecode is compiled by the target interpreter and never checked
+    # against the sources, which would make it stale on every cold start
+    subprocess.run(
+        [python, "-m", "compileall", "-q", "-j", "0"]
+        + ["--invalidation-mode", "unchecked-hash", str(root)],
+        check=True,
+    )
+
+
+def write_zip(root: Path, output: Path) -> None:
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                info = zipfile.ZipInfo(
+                    path.relative_to(root).as_posix(), date_time=ZIP_DATE_TIME
+                )
+                info.external_attr = (path.stat().st_mode & 0xFFFF) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                bundle.writestr(info, path.read_bytes())
+
+
+def parse_import_time(output: str, module: str) -> float | None:
+    """
+    Returns the cumulative import time in seconds of `module` from the
+    `-X importtime` report in `output`, skipping whatever else was printed.
+    """
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == module and cumulative.strip().isdigit():
+            return int(cumulative) / 1_000_000
+    return None
+
+
+def measure_import_time(python: str, bundle: Path, module: str, runs: int = 5) -> float:
+    """
+    Median time in seconds of importing `module` in a fresh interpreter from
+    the extracted `bundle`, without writing bytecode, as on Lambda.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        with zipfile.ZipFile(bundle) as archive:
+            archive.extractall(directory)
+        timings = []
+        for _ in range(runs):
+            result = subprocess.run(
+                [python, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                check=True,
+                text=True,
+                cwd=directory,
+                env={
+                    **os.environ,
+                    "PYTHONPATH": directory,
+                    "PYTHONDONTWRITEBYTECODE": "1",
+                },
+            )
+            timing = parse_import_time(result.stderr, module)
+            if timing is None:
+                raise RuntimeError(f"{python} reported no import time for {module}")
+            timings.append(timing)
+    return median(timings)
+
+
+def build_bundle(
+    handler: str,
+    output: Path,
+    *,
+    source: Path = Path("."),
+    requirements: Path | None = None,
+    python: str = sys.executable,
+    platform: str | None = None,
+    trace: bool = False,
+    event: Path | None = None,
+    keep: list[str] | None = None,
+    strip_packages: bool = False,
+) -> BundleReport:
+    """
+    Builds a deployment zip of the app in `source` and its `requirements`
+    for the `handler` entry point (`module.function`) and returns how it
+    compares to the plain installation.
+    """
+    keep = keep or []
+    module = handler.rpartition(".")[0]
+    report = BundleReport()
+    with tempfile.TemporaryDirectory() as directory:
+        build = Path(directory) / "build"
+        build.mkdir()
+        if requirements is not None:
+            install_requirements(python, requirements, build, platform)
+        copy_sources(source, build)
+
+        report.size_before = get_size(build)
+        before = Path(directory) / "before.zip"
+        write_zip(build, before)
+        report.zip_size_before = before.stat().st_size
+        report.import_time_before = measure_import_time(python, before, module)
+
+        if trace:
+            loaded = trace_imports(python, build, handler, event)
+            report.pruned_modules = prune(build, loaded, keep)
+        strip(build, keep, strip_packages)
+        precompile(python, build)
+
+        report.size_after = get_size(build)
+        write_zip(build, output)
+        report.zip_size_after = output.stat().st_size
+        report.import_time_after = measure_import_time(python, output, module)
+    return report
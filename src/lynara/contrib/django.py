@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+import django
+from asgiref.sync import sync_to_async
+from django.core import signals
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections, connections
+from django.urls import Resolver404, get_resolver, resolve
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+    from lynara.resources import ResourceRegistry
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PersistentConnections:
+    """
+    Database connections kept open across the invocations of a container.
+
+    Django ties connections to the request's context and closes them when the
+    request finishes unless `CONN_MAX_AGE` says otherwise, and even then a new
+    ASGI request never sees the previous request's connection. The
+    connections of a finished request are kept here and handed to the next.
+    """
+
+    def __init__(self) -> None:
+        self.connections: dict[str, BaseDatabaseWrapper] = {}
+
+    def restore(self) -> None:
+        for alias, connection in self.connections.items():
+            connections[alias] = connection
+
+    def keep(self) -> None:
+        for connection in connections.all(initialized_only=True):
+            if connection.connection is not None and (
+                (connection.errors_occurred and not connection.is_usable())
+                # The app did not restore autocommit, don't take chances
+                or connection.get_autocommit() != connection.settings_dict["AUTOCOMMIT"]
+            ):
+                connection.close()
+            self.connections[connection.alias] = connection
+
+    def check(self) -> bool:
+        return all(
+            connection.connection is None or connection.is_usable()
+            for connection in self.connections.values()
+        )
+
+    def close(self) -> None:
+        # Closed connections reconnect on their next use
+        for connection in self.connections.values():
+            connection.close()
+
+
+PERSISTENT_CONNECTIONS = PersistentConnections()
+
+
+def _on_request_started(sender: type, **kwargs: Any) -> None:
+    if issubclass(sender, LynaraASGIHandler):
+        PERSISTENT_CONNECTIONS.restore()
+    else:
+        close_old_connections(**kwargs)
+
+
+def _on_request_finished(sender: type, **kwargs: Any) -> None:
+    if issubclass(sender, LynaraASGIHandler):
+        PERSISTENT_CONNECTIONS.keep()
+    else:
+        close_old_connections(**kwargs)
+
+
+def install_signal_receivers() -> None:
+    """
+    Replaces Django's `close_old_connections` receivers with ones keeping the
+    connections of `LynaraASGIHandler` requests open. Requests of other
+    handlers are not affected.
+    """
+    if signals.request_started.disconnect(close_old_connections):
+        signals.request_started.connect(_on_request_started)
+    if signals.request_finished.disconnect(close_old_connections):
+        signals.request_finished.connect(_on_request_finished)
+
+
+def get_warm_up_scope(path: str) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": None,
+        "server": None,
+    }
+
+
+class LynaraASGIHandler(ASGIHandler):
+    """
+    Django's ASGI handler for a Lambda container, serving one request at a
+    time. Sync code of every request runs in the same thread, instead of a
+    new thread per request, so that persistent connections can be used.
+    Do not serve concurrent requests with it, e.g. with `Lynara.run_batch`.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            raise ValueError(
+                f"Django can only handle ASGI/HTTP connections, not {scope['type']}."
+            )
+        await self.handle(scope, receive, send)
+
+    def warm_up(self, paths: Iterable[str] = ()) -> None:
+        """
+        Imports the URLconf and views and populates the URL resolver. Every
+        path of `paths` is then requested through the whole middleware chain,
+        so that what the middleware and views load on first use is loaded.
+        """
+        resolver = get_resolver()
+        resolver.url_patterns
+        resolver.reverse_dict
+        paths = list(paths)
+        for path in paths:
+            try:
+                resolve(path)
+            except Resolver404:
+                LOGGER.warning("Warm-up path %s does not resolve", path)
+        if paths:
+            loop = asyncio.new_event_loop()
+            try:
+                for path in paths:
+                    loop.run_until_complete(self._request(path))
+            finally:
+                loop.close()
+
+    async def _request(self, path: str) -> None:
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+        disconnected = asyncio.Event()
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                LOGGER.debug("Warm-up of %s responded %s", path, message["status"])
+            elif not message.get("more_body", False):
+                disconnected.set()
+
+        await self(get_warm_up_scope(path), receive, send)
+
+    def register_health_checks(self, resources: "ResourceRegistry") -> None:
+        """
+        Checks the persistent connections when the container thaws and closes
+        them when they did not survive, they reconnect on their next use.
+        """
+
+        async def validate(connections: PersistentConnections) -> bool:
+            return await sync_to_async(connections.check)()
+
+        async def reconnect(
+            connections: PersistentConnections,
+        ) -> PersistentConnections:
+            await sync_to_async(connections.close)()
+            return connections
+
+        async def close(connections: PersistentConnections) -> None:
+            await sync_to_async(connections.close)()
+
+        resources.register(
+            "django.db",
+            PERSISTENT_CONNECTIONS,
+            validate=validate,
+            reconnect=reconnect,
+            close=close,
+        )
+
+
+def get_asgi_application(warm_up_paths: Iterable[str] = ()) -> LynaraASGIHandler:
+    """
+    Sets Django up and warms it up once, when the container initializes,
+    keeping database connections open across invocations.
+    """
+    django.setup(set_prefix=False)
+    install_signal_receivers()
+    handler = LynaraASGIHandler()
+    handler.warm_up(warm_up_paths)
+    return handler
@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+from collections.abc import Callable, Iterable
+from time import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from lynara.tracing import Trace
+
+LOGGER = logging.getLogger(__name__)
+
+EXTENSION_API_URL = "http://{runtime_api}/2020-01-01/extension"
+DEFAULT_SOCKET_PATH = "/tmp/lynara-telemetry.sock"
+
+Exporter = Callable[[list[dict[str, Any]]], None]
+
+
+def write_json_lines(batch: list[dict[str, Any]]) -> None:
+    sys.stdout.write("".join(json.dumps(record) + "\n" for record in batch))
+    sys.stdout.flush()
+
+
+class TelemetryClient:
+    """
+    The function side: collects the telemetry of an invocation and hands it
+    to the extension in a single write over a Unix socket when the
+    invocation ends. When the extension cannot be reached the telemetry is
+    dropped rather than delaying the response.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 0.1):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.records: list[dict[str, Any]] = []
+        self._socket: socket.socket | None = None
+
+    def emit(self, kind: str, data: Any) -> None:
+        self.records.append({"type": kind, "data": data})
+
+    def end_invocation(self, request_id: str | None) -> None:
+        records, self.records = self.records, []
+        message = json.dumps({"requestId": request_id, "records": records})
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self.timeout)
+                self._socket.connect(self.socket_path)
+            self._socket.sendall(message.encode() + b"\n")
+        except OSError as exc:
+            LOGGER.warning("Dropped the telemetry of %s: %s", request_id, exc)
+            self.close()
+
+    def close(self) -> None:
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            sock.close()
+
+
+class ExtensionSpanExporter:
+    """Hands traces to the extension instead of exporting them in the handler."""
+
+    def __init__(self, client: TelemetryClient) -> None:
+        self.client = client
+
+    def export(self, trace: "Trace") -> None:
+        self.client.emit("trace", trace.to_dict())
+
+
+class TelemetryExtension:
+    """
+    A Lambda extension receiving telemetry from `TelemetryClient` and
+    exporting it in batches of `batch_size` records, during the
+    post-invocation phase after the response has been sent, and whatever is
+    left on `SHUTDOWN`.
+
+    `start` forks it from the function during the init phase as an internal
+    extension. Lambda does not send `SHUTDOWN` to internal extensions, so
+    the rest is exported when the function's client disconnects on
+    `Lynara.close`. Run as `python -m lynara.extension` from
+    `/opt/extensions` it is an external extension and gets `SHUTDOWN`.
+    """
+
+    def __init__(
+        self,
+        export: Exporter = write_json_lines,
+        *,
+        name: str = "lynara-telemetry",
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        events: Iterable[str] = ("INVOKE", "SHUTDOWN"),
+        batch_size: int = 100,
+        runtime_api: str | None = None,
+    ) -> None:
+        self.export = export
+        self.name = name
+        self.socket_path = socket_path
+        self.events = list(events)
+        self.batch_size = batch_size
+        self.runtime_api = runtime_api or os.environ["AWS_LAMBDA_RUNTIME_API"]
+        self.batch: list[dict[str, Any]] = []
+        self.identifier: str | None = None
+        self._server: socket.socket | None = None
+        self._ended: set[str | None] = set()
+        self._condition = threading.Condition()
+        self._closed = threading.Event()
+
+    def _request(
+        self, path: str, headers: dict[str, str], data: dict[str, Any] | None = None
+    ) -> tuple[dict[str, Any], Any]:
+        from urllib.request import Request, urlopen
+
+        request = Request(
+            EXTENSION_API_URL.format(runtime_api=self.runtime_api) + path,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers=headers,
+            method="POST" if data is not None else "GET",
+        )
+        with urlopen(request) as response:
+            return json.loads(response.read() or b"{}"), response.headers
+
+    def register(self) -> None:
+        _, headers = self._request(
+            "/register", {"Lambda-Extension-Name": self.name}, {"events": self.events}
+        )
+        self.identifier = headers["Lambda-Extension-Identifier"]
+
+    def next_event(self) -> dict[str, Any]:
+        event, _ = self._request(
+            "/event/next", {"Lambda-Extension-Identifier": self.identifier or ""}
+        )
+        return event
+
+    def bind(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._server.listen()
+
+    def _accept(self) -> None:
+        assert self._server is not None
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            # The function's client reconnected after dropping its connection
+            self._closed.clear()
+            threading.Thread(
+                target=self._receive, args=(connection,), daemon=True
+            ).start()
+
+    def _receive(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rb") as lines:
+            for line in lines:
+                message = json.loads(line)
+                with self._condition:
+                    self.batch.extend(message["records"])
+                    self._ended.add(message["requestId"])
+                    self._condition.notify_all()
+        if "SHUTDOWN" not in self.events:
+            # Internal extensions learn about the shutdown from the function's
+            # client disconnecting on `Lynara.close`
+            self._closed.set()
+            with self._condition:
+                self._condition.notify_all()
+            self.flush()
+
+    def wait_for_invocation(self, request_id: str | None, deadline: float) -> None:
+        with self._condition:
+            self._condition.wait_for(
+                lambda: request_id in self._ended or self._closed.is_set(),
+                timeout=max(deadline - time(), 0),
+            )
+            self._ended.discard(request_id)
+
+    def flush(self) -> None:
+        with self._condition:
+            batch, self.batch = self.batch, []
+        if batch:
+            try:
+                self.export(batch)
+            except Exception:
+                LOGGER.exception("Exporting %d telemetry records failed", len(batch))
+
+    def run(self) -> None:
+        if self._server is None:
+            self.bind()
+        self.register()
+        self.serve()
+
+    def serve(self) -> None:
+        """Receives the telemetry and follows the invocations once registered."""
+        threading.Thread(target=self._accept, daemon=True).start()
+        try:
+            while True:
+                event = self.next_event()
+                if event.get("eventType") == "SHUTDOWN":
+                    break
+                # Exporting after the function is done runs alongside the
+                # runtime sending the response instead of delaying it
+                self.wait_for_invocation(
+                    event.get("requestId"), event.get("deadlineMs", 0) / 1000
+                )
+                if len(self.batch) >= self.batch_size:
+                    self.flush()
+        finally:
+            self.flush()
+            self.close()
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def start(self) -> None:
+        """
+        Forks the extension as an internal extension and returns once it has
+        registered. Call it during the init phase, before the first invocation.
+        """
+        self.events = [event for event in self.events if event != "SHUTDOWN"]
+        self.bind()
+        ready_fd, registered_fd = os.pipe()
+        if os.fork() == 0:
+            os.close(ready_fd)
+            try:
+                self.register()
+                # Extensions register during the init phase, which the
+                # function must not leave before
+                os.write(registered_fd, b"\0")
+                os.close(registered_fd)
+                self.serve()
+            except Exception:
+                LOGGER.exception("The %s extension failed", self.name)
+            finally:
+                os._exit(0)
+        os.close(registered_fd)
+        # The forked extension owns the listening socket from now on
+        assert self._server is not None
+        self._server.close()
+        self._server = None
+        with os.fdopen(ready_fd, "rb") as ready:
+            if not ready.read(1):
+                raise RuntimeError(f"The {self.name} extension failed to register")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    TelemetryExtension().run()
+
+
+if __name__ == "__main__":
+    main()
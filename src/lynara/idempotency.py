@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from time import time
+from typing import Any, Protocol
+
+from lynara.interfaces.utils import get_header
+from lynara.types import LambdaEvent
+
+LOGGER = logging.getLogger(__name__)
+
+
+class IdempotencyStore(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def put(self, key: str, response: Any, ttl: float) -> None: ...
+
+
+class MemoryStore:
+    """
+    Responses kept in the container's memory as JSON, so every retry gets a
+    copy of its own, the least recently used are evicted past `maxsize`
+    responses or `maxbytes` of JSON. Responses larger than `maxbytes` are not
+    kept. Retries served by another sandbox are not seen.
+    """
+
+    __slots__ = ("maxsize", "maxbytes", "_responses", "_size")
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = 32 * 1024 * 1024) -> None:
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._responses: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._size = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time():
+            self._evict(key)
+            return None
+        self._responses.move_to_end(key)
+        return json.loads(entry[1])
+
+    async def put(self, key: str, response: Any, ttl: float) -> None:
+        data = json.dumps(response, default=str)
+        if key in self._responses:
+            self._evict(key)
+        if len(data) > self.maxbytes:
+            return
+        self._responses[key] = (time() + ttl, data)
+        self._size += len(data)
+        while len(self._responses) > self.maxsize or self._size > self.maxbytes:
+            self._evict(next(iter(self._responses)))
+
+    def _evict(self, key: str) -> None:
+        self._size -= len(self._responses.pop(key)[1])
+
+
+class DynamoDBStore:
+    """
+    Responses kept as JSON in a DynamoDB table shared by all the sandboxes,
+    with the expiry in the `expires_at` attribute for DynamoDB's TTL. The
+    client defaults to boto3's, available in the Lambda Python runtimes.
+    """
+
+    def __init__(
+        self, table_name: str, client: Any = None, *, key_attribute: str = "id"
+    ) -> None:
+        self.table_name = table_name
+        self.client = client
+        self.key_attribute = key_attribute
+
+    def _get_client(self) -> Any:
+        if self.client is None:
+            import boto3  # type: ignore[import-not-found]
+
+            self.client = boto3.client("dynamodb")
+        return self.client
+
+    def _get(self, key: str) -> Any | None:
+        item = (
+            self._get_client()
+            .get_item(
+                TableName=self.table_name,
+                Key={self.key_attribute: {"S": key}},
+                ConsistentRead=True,
+            )
+            .get("Item")
+        )
+        # DynamoDB deletes expired items eventually, not right away
+        if item is None or float(item["expires_at"]["N"]) < time():
+            return None
+        return json.loads(item["response"]["S"])
+
+    def _put(self, key: str, response: Any, ttl: float) -> None:
+        self._get_client().put_item(
+            TableName=self.table_name,
+            Item={
+                self.key_attribute: {"S": key},
+                "response": {"S": json.dumps(response)},
+                "expires_at": {"N": str(int(time() + ttl))},
+            },
+        )
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, response: Any, ttl: float) -> None:
+        await asyncio.to_thread(self._put, key, response, ttl)
+
+
+class LocalDynamoDBClient:
+    """
+    A stand-in for boto3's DynamoDB client implementing the `get_item` and
+    `put_item` calls of `DynamoDBStore` on dicts, to run it locally.
+    """
+
+    def __init__(self, key_attribute: str = "id") -> None:
+        self.key_attribute = key_attribute
+        self.tables: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def get_item(self, **kwargs: Any) -> dict[str, Any]:
+        table = self.tables.get(kwargs["TableName"], {})
+        item = table.get(kwargs["Key"][self.key_attribute]["S"])
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, **kwargs: Any) -> dict[str, Any]:
+        item = kwargs["Item"]
+        table = self.tables.setdefault(kwargs["TableName"], {})
+        table[item[self.key_attribute]["S"]] = item
+        return {}
+
+
+def get_route(event: LambdaEvent) -> str:
+    """The method and path of an API Gateway, Function URL or direct event."""
+    http = (event.get("requestContext") or {}).get("http")
+    if http is not None:
+        return f"{http.get('method')} {http.get('path')}"
+    return f"{event.get('httpMethod') or event.get('method')} {event.get('path')}"
+
+
+def get_json_path(event: Any, path: str) -> Any:
+    """
+    Resolves a dotted path, with list indexes, e.g. `Records.0.messageId`. A
+    leading `$.` is allowed.
+    """
+    value = event
+    for part in path.removeprefix("$.").split("."):
+        if isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+class Idempotency:
+    """
+    Returns the stored response of events seen before instead of running them
+    again, for retried asynchronous invocations and redelivered messages.
+
+    The key of an event is the value at `json_path` in the event, the
+    `header` of an HTTP event, scoped to the request's method and path, or,
+    by default, the request ID, which retries of an asynchronous invocation
+    keep. Events without a key are run as is.
+    Responses are kept for `ttl` seconds, except for HTTP responses with a
+    5xx status, which should be retried. A duplicate arriving while the
+    first event is still running in the container waits for its response.
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore | None = None,
+        *,
+        json_path: str | None = None,
+        header: str | None = None,
+        ttl: float = 3600,
+    ) -> None:
+        if json_path is not None and header is not None:
+            raise ValueError("Key events by a JSON path or by a header, not both")
+        self.store = store if store is not None else MemoryStore()
+        self.json_path = json_path
+        self.header = header.lower() if header is not None else None
+        self.ttl = ttl
+        self.hits = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def get_key(self, event: LambdaEvent, context) -> str | None:
+        if self.json_path is not None:
+            value = get_json_path(event, self.json_path)
+        elif self.header is not None:
+            value = get_header(event.get("headers"), self.header)
+            if value is not None:
+                # The same client key sent to another route is another request
+                return f"{get_route(event)} {value}"
+        else:
+            value = getattr(context, "aws_request_id", None)
+        if value is None:
+            return None
+        return value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+
+    def should_store(self, response: Any) -> bool:
+        return not (
+            isinstance(response, dict) and response.get("statusCode", 200) >= 500
+        )
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            return await self.store.get(key)
+        except Exception:
+            # Running the event again beats failing it while the store is down
+            LOGGER.exception("Reading the stored response of %s failed", key)
+            return None
+
+    async def put(self, key: str, response: Any) -> None:
+        try:
+            await self.store.put(key, response, self.ttl)
+        except Exception:
+            # The response is ready, a retry would only run it once more
+            LOGGER.exception("Storing the response of %s failed", key)
+
+    async def __call__(
+        self, event: LambdaEvent, context, run: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        key = self.get_key(event, context)
+        if key is None:
+            return await run()
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.hits += 1
+            return await asyncio.shield(in_flight)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await self.get(key)
+            if response is not None:
+                LOGGER.info("Returning the stored response of %s", key)
+                self.hits += 1
+            else:
+                response = await run()
+                if self.should_store(response):
+                    await self.put(key, response)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Retrieved, so an exception no duplicate waited for is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            del self._in_flight[key]
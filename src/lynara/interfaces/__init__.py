@@ -1,9 +1,45 @@
-from lynara.interfaces.api_http import APIGatewayProxyEventV2Interface
-from lynara.interfaces.api_rest import APIGatewayProxyEventV1Interface
-from lynara.interfaces.lifespan import LifespanInterface
+from importlib import import_module
+
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from lynara.interfaces.api_http import APIGatewayProxyEventV2Interface
+    from lynara.interfaces.api_rest import APIGatewayProxyEventV1Interface
+    from lynara.interfaces.direct import DirectInvocationInterface
+    from lynara.interfaces.events import EventInterface, EventRule
+    from lynara.interfaces.function_url import FunctionURLStreamingInterface
+    from lynara.interfaces.lifespan import LifespanInterface
+
+_EXPORTS = {
+    "APIGatewayProxyEventV1Interface": "lynara.interfaces.api_rest",
+    "APIGatewayProxyEventV2Interface": "lynara.interfaces.api_http",
+    "DirectInvocationInterface": "lynara.interfaces.direct",
+    "EventInterface": "lynara.interfaces.events",
+    "EventRule": "lynara.interfaces.events",
+    "FunctionURLStreamingInterface": "lynara.interfaces.function_url",
+    "LifespanInterface": "lynara.interfaces.lifespan",
+}
 
 __all__ = [
     "APIGatewayProxyEventV1Interface",
     "APIGatewayProxyEventV2Interface",
+    "DirectInvocationInterface",
+    "EventInterface",
+    "EventRule",
+    "FunctionURLStreamingInterface",
     "LifespanInterface",
 ]
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -1,11 +1,17 @@
-from base64 import b64decode
+from collections.abc import Iterable
 
-from lynara.interfaces.base import HTTPInterface
-from lynara.interfaces.utils import get_server, strip_api_gateway_path
-from lynara.types import ASGIApp, LambdaEvent, Message, Scope
+from lynara.interfaces.base import HTTP_ASGI_SCOPE, HTTPInterface
+from lynara.interfaces.utils import (
+    get_request_body,
+    get_server,
+    strip_api_gateway_path,
+)
+from lynara.types import ASGIApp, LambdaEvent, Scope
 
 
 class APIGatewayProxyEventV2Interface(HTTPInterface):
+    __slots__ = ()
+
     def __init__(
         self, app: ASGIApp, event: LambdaEvent, context, base_path: str | None = None
     ) -> None:
@@ -18,20 +24,11 @@ class APIGatewayProxyEventV2Interface(HTTPInterface):
             "headers": {},
         }
 
-        body = self.event.get("body", b"")
-        if not body:
-            body = b""
-        if self.event.get("isBase64Encoded"):
-            body = b64decode(body)
-        elif not isinstance(body, bytes):
-            body = body.encode()
-        self.app_queue.put_nowait(
-            {
-                "type": "http.request",
-                "body": body,
-                "more_body": False,
-            }
-        )
+        self._request = {
+            "type": "http.request",
+            "body": get_request_body(self.event),
+            "more_body": False,
+        }
 
     @classmethod
     def match(cls, event: LambdaEvent) -> bool:
@@ -46,10 +43,7 @@ class APIGatewayProxyEventV2Interface(HTTPInterface):
 
         return {
             "type": "http",
-            "asgi": {
-                "version": "3.0",
-                "spec_version": "2.3",
-            },
+            "asgi": HTTP_ASGI_SCOPE,
             "http_version": "1.1",
             "method": self._method,
             "scheme": headers.get("x-forwarded-proto", "https"),
@@ -60,26 +54,17 @@ class APIGatewayProxyEventV2Interface(HTTPInterface):
             "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
             "client": (request_context["http"]["sourceIp"], 0),
             "server": get_server(headers=headers),
+            "extensions": {"http.response.pathsend": {}},
+            "aws.event": self.event,
+            "aws.context": self.context,
         }
 
-    async def receive(self) -> Message:
-        return await self.app_queue.get()
-
-    async def send(self, message: Message) -> None:
-        if message["type"] == "http.response.start":
-            self.lambda_response["statusCode"] = message["status"]
-            for key, value in message.get("headers", []):
-                if key.decode().lower() == "set-cookie":
-                    self.lambda_response["cookies"].append(value.decode())
-                else:
-                    self.lambda_response["headers"][key.decode()] = value.decode()
-
-        elif message["type"] == "http.response.body":
-            self.lambda_response["body"] += message.get("body", b"").decode()
-            more_body = message.get("more_body", False)
-
-            if not more_body:
-                await self.app_queue.put({"type": "http.disconnect"})
-
-        else:
-            raise ValueError(f"Unknown message type: {message['type']}")
+    def start_response(
+        self, status: int, headers: Iterable[tuple[bytes, bytes]]
+    ) -> None:
+        self.lambda_response["statusCode"] = status
+        for key, value in headers:
+            if key.decode().lower() == "set-cookie":
+                self.lambda_response["cookies"].append(value.decode())
+            else:
+                self.lambda_response["headers"][key.decode()] = value.decode()
@@ -1,9 +1,13 @@
-from base64 import b64decode
+from collections.abc import Iterable
 from urllib.parse import urlencode
 
-from lynara.interfaces.base import HTTPInterface
-from lynara.interfaces.utils import get_server, strip_api_gateway_path
-from lynara.types import ASGIApp, LambdaEvent, Message, Scope
+from lynara.interfaces.base import HTTP_ASGI_SCOPE, HTTPInterface
+from lynara.interfaces.utils import (
+    get_request_body,
+    get_server,
+    strip_api_gateway_path,
+)
+from lynara.types import ASGIApp, LambdaEvent, Scope
 
 
 class APIGatewayProxyEventV1Interface(HTTPInterface):
@@ -11,6 +15,8 @@ class APIGatewayProxyEventV1Interface(HTTPInterface):
     `sam local generate-event apigateway aws-proxy`
     """
 
+    __slots__ = ()
+
     def __init__(
         self, app: ASGIApp, event: LambdaEvent, context, base_path: str | None = None
     ) -> None:
@@ -22,20 +28,11 @@ class APIGatewayProxyEventV1Interface(HTTPInterface):
             "multiValueHeaders": {},
             "body": "",
         }
-        body = self.event.get("body", b"")
-        if not body:
-            body = b""
-        if self.event.get("isBase64Encoded"):
-            body = b64decode(body)
-        elif not isinstance(body, bytes):
-            body = body.encode()
-        self.app_queue.put_nowait(
-            {
-                "type": "http.request",
-                "body": body,
-                "more_body": False,
-            }
-        )
+        self._request = {
+            "type": "http.request",
+            "body": get_request_body(self.event),
+            "more_body": False,
+        }
 
     @classmethod
     def match(cls, event: LambdaEvent) -> bool:
@@ -83,17 +80,14 @@ class APIGatewayProxyEventV1Interface(HTTPInterface):
             "query_string": self._encode_query_string(),
             "server": get_server(headers=headers),
             "client": (request_context.get("identity", {}).get("sourceIp"), 0),
-            "asgi": {
-                "version": "3.0",
-                "spec_version": "2.3",
-            },
+            "asgi": HTTP_ASGI_SCOPE,
+            "extensions": {"http.response.pathsend": {}},
+            "aws.event": self.event,
+            "aws.context": self.context,
         }
 
-    async def receive(self) -> Message:
-        return await self.app_queue.get()
-
     def _handle_multi_value_headers(
-        self, response_headers: list[tuple[bytes, bytes]]
+        self, response_headers: Iterable[tuple[bytes, bytes]]
     ) -> tuple[dict[str, str], dict[str, list[str]]]:
         headers: dict[str, str] = {}
         multi_value_headers: dict[str, list[str]] = {}
@@ -114,21 +108,11 @@ class APIGatewayProxyEventV1Interface(HTTPInterface):
 
         return headers, multi_value_headers
 
-    async def send(self, message: Message) -> None:
-        if message["type"] == "http.response.start":
-            self.lambda_response["statusCode"] = message["status"]
-            headers, multi_value_headers = self._handle_multi_value_headers(
-                message.get("headers", [])
-            )
-            self.lambda_response["headers"] = headers
-            self.lambda_response["multiValueHeaders"] = multi_value_headers
-
-        elif message["type"] == "http.response.body":
-            self.lambda_response["body"] += message.get("body", b"").decode()
-            more_body = message.get("more_body", False)
-
-            if not more_body:
-                await self.app_queue.put({"type": "http.disconnect"})
-
-        else:
-            raise ValueError(f"Unknown message type: {message['type']}")
+    def start_response(
+        self, status: int, headers: Iterable[tuple[bytes, bytes]]
+    ) -> None:
+        self.lambda_response["statusCode"] = status
+        (
+            self.lambda_response["headers"],
+            self.lambda_response["multiValueHeaders"],
+        ) = self._handle_multi_value_headers(headers)
@@ -1,11 +1,41 @@
+import mmap
+import os
 from abc import ABC, abstractmethod
-from asyncio import Queue
-from typing import Any
+from asyncio import Future, get_running_loop
+from base64 import b64decode, b64encode
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
 
+from lynara.interfaces.utils import get_header
 from lynara.types import ASGIApp, LambdaEvent, Message, Scope
 
+if TYPE_CHECKING:
+    from lynara.interfaces.ranges import ByteRange
+    from lynara.tracing import Trace
+
+# Shared by every HTTP scope, the ASGI spec does not allow apps to mutate it
+HTTP_ASGI_SCOPE = {"version": "3.0", "spec_version": "2.3"}
+
+# Payload limit of a buffered response of a synchronous invocation
+MAX_RESPONSE_SIZE = 6 * 1024 * 1024
+
 
 class HTTPInterface(ABC):
+    __slots__ = (
+        "app",
+        "event",
+        "context",
+        "is_response_completed",
+        "_method",
+        "lambda_response",
+        "base_path",
+        "_request",
+        "_disconnect",
+        "conditional",
+        "range_requests",
+        "_scope",
+    )
+
     event: LambdaEvent
     context: Any
     is_response_completed: bool
@@ -25,11 +55,24 @@ class HTTPInterface(ABC):
         self.is_response_completed = False
         self._method: str | None = None
         self.lambda_response = {}
-        self.app_queue: Queue[Message] = Queue()
         self.base_path = base_path
+        self._request: Message | None = None
+        self._disconnect: Future[Message] | None = None
+        self.conditional = False
+        self.range_requests = False
+        self._scope: Scope | None = None
+
+    async def __call__(self, trace: "Trace | None" = None) -> Any:
+        if trace is None:
+            await self.app(self.get_scope(), self.receive, self.send)
+            return self.lambda_response
 
-    async def __call__(self) -> Any:
-        await self.app(self.scope, self.receive, self.send)
+        with trace.span("scope"):
+            scope = self.get_scope()
+        scope["lynara.trace"] = trace
+        with trace.span("app") as app_span:
+            send = trace.wrap_send(self.send, parent=app_span)
+            await self.app(scope, self.receive, send)
         return self.lambda_response
 
     @property
@@ -37,10 +80,267 @@ class HTTPInterface(ABC):
     def scope(self) -> Scope:
         raise NotImplementedError
 
-    @abstractmethod
+    def get_scope(self) -> Scope:
+        """
+        Returns the scope built once for the invocation, shared by whatever
+        looks at the request before the app and the app itself.
+        """
+        if self._scope is None:
+            self._scope = self.scope
+        return self._scope
+
+    def pop_request(self) -> Message | None:
+        # The whole request body arrives in the event, so it is handed over once
+        request, self._request = self._request, None
+        return request
+
     async def receive(self) -> Message:
-        raise NotImplementedError
+        request = self.pop_request()
+        if request is not None:
+            return request
+
+        if self.is_response_completed:
+            return {"type": "http.disconnect"}
+
+        # Only apps listening for a disconnect while responding get a future
+        if self._disconnect is None:
+            self._disconnect = get_running_loop().create_future()
+        return await self._disconnect
+
+    def complete_response(self) -> None:
+        self.is_response_completed = True
+        if self._disconnect is not None and not self._disconnect.done():
+            self._disconnect.set_result({"type": "http.disconnect"})
 
-    @abstractmethod
     async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_response(message["status"], message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            more_body = message.get("more_body", False)
+            self.write_body(message.get("body", b""), more_body=more_body)
+            if self.conditional and not more_body:
+                self.apply_conditional()
+            if self.range_requests and not more_body:
+                self.apply_range()
+        elif message["type"] == "http.response.pathsend":
+            self.write_file(message["path"])
+        else:
+            raise ValueError(f"Unknown message type: {message['type']}")
+
+    @abstractmethod
+    def start_response(
+        self, status: int, headers: Iterable[tuple[bytes, bytes]]
+    ) -> None:
         raise NotImplementedError
+
+    def write_body(self, body: bytes, more_body: bool = False) -> None:
+        self.lambda_response["body"] += body.decode()
+        if not more_body:
+            self.complete_response()
+
+    def write_file(self, path: str) -> None:
+        """
+        Sends the file for `http.response.pathsend`, memory-mapped and base64
+        encoded in one pass. The size is checked before anything is encoded.
+        Of a range request, only the requested ranges are encoded.
+        """
+        with open(path, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                self.write_file_data(path, b"")
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self.write_file_data(path, data)
+
+    def write_file_data(self, path: str, data: bytes | mmap.mmap) -> None:
+        size = len(data)
+        oversized = (size + 2) // 3 * 4 > MAX_RESPONSE_SIZE
+        if oversized and (
+            not self.range_requests or self.get_request_header("range") is None
+        ):
+            # Rejected before the ETag reads the whole file
+            raise ValueError(
+                f"File {path} of {size} bytes exceeds the Lambda response limit"
+            )
+        # The ETag and a 304 are decided on the whole file, before any range
+        if self.conditional and self.apply_conditional(data):
+            self.complete_response()
+            return
+        range_header = self.get_range_header()
+        ranges = None
+        if range_header:
+            from lynara.interfaces.ranges import parse_range
+
+            ranges = parse_range(range_header, size)
+        if ranges is not None:
+            # Ranges of files over the response limit can be served
+            self.write_ranges(ranges, size, data)
+            self.complete_response()
+            return
+        if oversized:
+            # The Range header was ignored
+            raise ValueError(
+                f"File {path} of {size} bytes exceeds the Lambda response limit"
+            )
+        self.write_base64_body(b64encode(data).decode("ascii"))
+
+    def write_base64_body(self, body: str) -> None:
+        self.lambda_response["body"] = body
+        self.lambda_response["isBase64Encoded"] = True
+        self.complete_response()
+
+    def get_request_header(self, name: str) -> Any:
+        return get_header(self.event.get("headers"), name)
+
+    def get_body_bytes(self) -> bytes:
+        response = self.lambda_response
+        if response.get("isBase64Encoded"):
+            return b64decode(response["body"])
+        return response["body"].encode()
+
+    def apply_conditional(self, body: bytes | mmap.mmap | None = None) -> bool:
+        """
+        Adds a strong ETag over the whole `body`, the buffered one by default,
+        unless the app set one, and turns the response into a body-less 304
+        when the request's `If-None-Match`, or `If-Modified-Since` against the
+        app's `Last-Modified`, shows the client already has it. Returns
+        whether it did.
+        """
+        response = self.lambda_response
+        if self._method not in ("GET", "HEAD") or response["statusCode"] != 200:
+            return False
+
+        # Loaded by the interfaces with conditional requests on only
+        from lynara.interfaces.conditional import (
+            etag_matches,
+            is_not_modified_since,
+            make_etag,
+        )
+
+        headers = response["headers"]
+        etag = get_header(headers, "etag")
+        if etag is None and self._method == "GET":
+            etag = headers["etag"] = make_etag(
+                self.get_body_bytes() if body is None else body
+            )
+
+        if_none_match = self.get_request_header("if-none-match")
+        if if_none_match is not None:
+            not_modified = etag is not None and etag_matches(etag, if_none_match)
+        else:
+            if_modified_since = self.get_request_header("if-modified-since")
+            last_modified = get_header(headers, "last-modified")
+            not_modified = bool(
+                if_modified_since and last_modified
+            ) and is_not_modified_since(last_modified, if_modified_since)
+
+        if not_modified:
+            response["statusCode"] = 304
+            response["body"] = ""
+            if "isBase64Encoded" in response:
+                response["isBase64Encoded"] = False
+            for name in [
+                name
+                for name in headers
+                if name.lower() in ("content-length", "content-type")
+            ]:
+                del headers[name]
+        return not_modified
+
+    def get_range_header(self) -> str | None:
+        """
+        Returns the request's `Range` header when the response can be sent in
+        ranges, and its `If-Range` matches. Advertises `Accept-Ranges` on the
+        responses that can.
+        """
+        response = self.lambda_response
+        if (
+            not self.range_requests
+            or self._method != "GET"
+            or response["statusCode"] != 200
+        ):
+            return None
+        headers = response["headers"]
+        if get_header(headers, "content-range") is not None:
+            return None
+        if get_header(headers, "accept-ranges") is None:
+            headers["accept-ranges"] = "bytes"
+
+        range_header = self.get_request_header("range")
+        if_range = self.get_request_header("if-range")
+        if range_header is None or if_range is None:
+            return range_header
+
+        from lynara.interfaces.ranges import if_range_matches
+
+        if not if_range_matches(
+            if_range, get_header(headers, "etag"), get_header(headers, "last-modified")
+        ):
+            return None
+        return range_header
+
+    def write_ranges(
+        self, ranges: list["ByteRange"], size: int, data: bytes | mmap.mmap
+    ) -> None:
+        """
+        Turns the response into a 206 with the `ranges` of `data`, a
+        `multipart/byteranges` one for several ranges, or into a 416 when
+        there are no ranges.
+        """
+        response = self.lambda_response
+        headers = response["headers"]
+        content_type = get_header(headers, "content-type")
+        for name in [
+            name
+            for name in headers
+            if name.lower() in ("content-length", "content-type", "content-range")
+        ]:
+            del headers[name]
+
+        if not ranges:
+            response["statusCode"] = 416
+            response["body"] = ""
+            response["isBase64Encoded"] = False
+            headers["content-range"] = f"bytes */{size}"
+            return
+
+        ranged_size = sum(last - first + 1 for first, last in ranges)
+        if (ranged_size + 2) // 3 * 4 > MAX_RESPONSE_SIZE:
+            raise ValueError(
+                f"Ranges of {ranged_size} bytes exceed the Lambda response limit"
+            )
+        if len(ranges) == 1:
+            first, last = ranges[0]
+            body = data[first : last + 1]
+            headers["content-range"] = f"bytes {first}-{last}/{size}"
+            if content_type is not None:
+                headers["content-type"] = content_type
+        else:
+            # Multipart ranges are rare, their imports are not worth a cold start
+            from secrets import token_hex
+
+            from lynara.interfaces.ranges import make_multipart
+
+            boundary = token_hex(16)
+            body = make_multipart(
+                [((first, last), data[first : last + 1]) for first, last in ranges],
+                size,
+                content_type,
+                boundary,
+            )
+            headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        headers["content-length"] = str(len(body))
+        response["statusCode"] = 206
+        # A range may split a multi-byte character of a text body
+        response["body"] = b64encode(body).decode("ascii")
+        response["isBase64Encoded"] = True
+
+    def apply_range(self) -> None:
+        range_header = self.get_range_header()
+        if range_header is None:
+            return
+        from lynara.interfaces.ranges import parse_range
+
+        body = self.get_body_bytes()
+        ranges = parse_range(range_header, len(body))
+        if ranges is not None:
+            self.write_ranges(ranges, len(body), body)
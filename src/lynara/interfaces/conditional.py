@@ -0,0 +1,28 @@
+from hashlib import blake2b
+from mmap import mmap
+
+
+def make_etag(body: bytes | mmap) -> str:
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match uses the weak comparison, the W/ prefix is ignored
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified_since(last_modified: str, if_modified_since: str) -> bool:
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
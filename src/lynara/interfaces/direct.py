@@ -0,0 +1,150 @@
+import json
+import mmap
+from base64 import b64decode
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from lynara.interfaces.base import HTTP_ASGI_SCOPE, HTTPInterface
+from lynara.interfaces.utils import get_request_body, strip_api_gateway_path
+from lynara.types import ASGIApp, LambdaEvent, Scope
+
+if TYPE_CHECKING:
+    from lynara.tracing import Trace
+
+
+class DirectInvocationError(Exception):
+    def __init__(self, status: int, body: Any) -> None:
+        super().__init__(f"Application responded with status {status}: {body}")
+        self.status = status
+        self.body = body
+
+    def __reduce__(self):
+        return type(self), (self.status, self.body)
+
+
+class DirectInvocationInterface(HTTPInterface):
+    """
+    Lambda-to-Lambda calls with a compact envelope instead of a proxy event:
+
+        {"method": "POST", "path": "/items", "query": {"page": "2"},
+         "headers": {"x-tenant": "acme"}, "body": {"name": "Ana"}}
+
+    Only `method` and `path` are required. A JSON `body` is serialized for the
+    app. The invoker gets the response body back, parsed when it is JSON,
+    instead of the API Gateway response shape. Error statuses raise
+    `DirectInvocationError`, which Lambda reports as a function error.
+    """
+
+    __slots__ = ("_body_chunks",)
+
+    def __init__(
+        self, app: ASGIApp, event: LambdaEvent, context, base_path: str | None = None
+    ) -> None:
+        super().__init__(app=app, event=event, context=context, base_path=base_path)
+        self.lambda_response = {"statusCode": 200, "headers": {}}
+        self._body_chunks: list[bytes] = []
+
+        body = self.event.get("body")
+        if isinstance(body, dict | list):
+            body = json.dumps(body).encode()
+        else:
+            body = get_request_body(self.event)
+        self._request = {
+            "type": "http.request",
+            "body": body,
+            "more_body": False,
+        }
+
+    @classmethod
+    def match(cls, event: LambdaEvent) -> bool:
+        return "method" in event and "path" in event and "requestContext" not in event
+
+    def _encode_query_string(self) -> bytes:
+        query = self.event.get("query")
+        if not query:
+            return b""
+        if isinstance(query, str):
+            return query.encode()
+
+        from urllib.parse import urlencode
+
+        return urlencode(query, doseq=True).encode()
+
+    def _get_headers(self) -> list[tuple[bytes, bytes]]:
+        headers = [
+            (key.lower().encode(), value.encode())
+            for key, value in (self.event.get("headers") or {}).items()
+        ]
+        if isinstance(self.event.get("body"), dict | list) and not any(
+            key == b"content-type" for key, _ in headers
+        ):
+            headers.append((b"content-type", b"application/json"))
+        return headers
+
+    @property
+    def scope(self) -> Scope:
+        self._method = self.event["method"].upper()
+        return {
+            "type": "http",
+            "asgi": HTTP_ASGI_SCOPE,
+            "http_version": "1.1",
+            "method": self._method,
+            "scheme": "https",
+            "path": strip_api_gateway_path(
+                self.event["path"], base_path=self.base_path
+            ),
+            "raw_path": None,
+            "query_string": self._encode_query_string(),
+            "root_path": "",
+            "headers": self._get_headers(),
+            "client": None,
+            "server": None,
+            "extensions": {"http.response.pathsend": {}},
+            "aws.event": self.event,
+            "aws.context": self.context,
+        }
+
+    def start_response(
+        self, status: int, headers: Iterable[tuple[bytes, bytes]]
+    ) -> None:
+        self.lambda_response["statusCode"] = status
+        self.lambda_response["headers"] = {
+            key.decode().lower(): value.decode() for key, value in headers
+        }
+
+    def write_body(self, body: bytes, more_body: bool = False) -> None:
+        if body:
+            self._body_chunks.append(body)
+        if not more_body:
+            self.complete_response()
+
+    def write_file(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._body_chunks.append(file.read())
+        self.complete_response()
+
+    def write_base64_body(self, body: str) -> None:
+        self._body_chunks.append(b64decode(body))
+        self.complete_response()
+
+    def apply_conditional(self, body: bytes | mmap.mmap | None = None) -> bool:
+        # Invokers get the body itself, there is no cached copy to revalidate
+        return False
+
+    def get_range_header(self) -> str | None:
+        # Invokers get the whole body, parsed
+        return None
+
+    async def __call__(self, trace: "Trace | None" = None) -> Any:
+        await super().__call__(trace)
+        raw_body = b"".join(self._body_chunks)
+        content_type = self.lambda_response["headers"].get("content-type", "")
+        if raw_body and "json" in content_type:
+            body = json.loads(raw_body)
+        else:
+            body = raw_body.decode()
+
+        status = self.lambda_response["statusCode"]
+        if status >= 400:
+            raise DirectInvocationError(status, body)
+        return body
@@ -0,0 +1,193 @@
+import json
+from collections.abc import Iterable
+from typing import ClassVar
+
+from lynara.interfaces.base import HTTP_ASGI_SCOPE
+from lynara.interfaces.direct import DirectInvocationInterface
+from lynara.types import ASGIApp, LambdaEvent, Scope
+
+S3_SOURCE = "aws:s3"
+SNS_SOURCE = "aws:sns"
+SCHEDULE_SOURCE = "aws.events"
+SCHEDULE_DETAIL_TYPE = "Scheduled Event"
+
+
+def get_event_key(event: LambdaEvent) -> tuple[str, str | None] | None:
+    """
+    Returns the source of the event and what narrows it down further: the
+    EventBridge detail-type, the S3 bucket or the SNS topic name.
+    """
+    if "source" in event and "detail-type" in event:
+        return event["source"], event["detail-type"]
+
+    records = event.get("Records")
+    if not records:
+        return None
+    record = records[0]
+    source = record.get("eventSource") or record.get("EventSource")
+    if source == S3_SOURCE:
+        return source, record["s3"]["bucket"]["name"]
+    if source == SNS_SOURCE:
+        return source, record["Sns"]["TopicArn"].rsplit(":", 1)[-1]
+    return source, None
+
+
+def get_rule_name(arn: str) -> str:
+    """Returns the name of an EventBridge rule from its ARN, or the name itself."""
+    return arn.rsplit("/", 1)[-1]
+
+
+def get_rule_names(event: LambdaEvent) -> list[str]:
+    """Returns the names of the EventBridge rules in the event's `resources`."""
+    return [
+        get_rule_name(resource)
+        for resource in event.get("resources") or ()
+        if isinstance(resource, str) and ":rule/" in resource
+    ]
+
+
+class EventRule:
+    """
+    Routes events to `method` `path` of the app. A rule without `detail_type`,
+    `bucket` or `topic` matches any event from its source, and one without
+    `rule` any EventBridge rule, named or by ARN, in the event's `resources`.
+    """
+
+    __slots__ = ("path", "method", "source", "qualifier", "rule_name")
+
+    def __init__(
+        self,
+        path: str,
+        method: str = "POST",
+        *,
+        source: str | None = None,
+        detail_type: str | None = None,
+        bucket: str | None = None,
+        topic: str | None = None,
+        rule: str | None = None,
+    ) -> None:
+        self.path = path
+        self.method = method.upper()
+        qualifier: str | None = detail_type
+        if bucket is not None:
+            source, qualifier = source or S3_SOURCE, bucket
+        elif topic is not None:
+            source, qualifier = source or SNS_SOURCE, topic.rsplit(":", 1)[-1]
+        if source is None:
+            raise ValueError("An event rule needs a source, a bucket or a topic")
+        self.source = source
+        self.qualifier = qualifier
+        self.rule_name = None if rule is None else get_rule_name(rule)
+
+    @classmethod
+    def schedule(
+        cls, path: str, method: str = "POST", *, rule: str | None = None
+    ) -> "EventRule":
+        return cls(
+            path,
+            method,
+            source=SCHEDULE_SOURCE,
+            detail_type=SCHEDULE_DETAIL_TYPE,
+            rule=rule,
+        )
+
+
+class EventRuleTable:
+    """
+    Rules indexed by source, then by detail-type, bucket or topic, and then
+    by EventBridge rule name, so resolving an event costs a few dict lookups
+    however many rules there are.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, rules: Iterable[EventRule]) -> None:
+        self._index: dict[str, dict[str | None, dict[str | None, EventRule]]] = {}
+        for rule in rules:
+            by_name = self._index.setdefault(rule.source, {}).setdefault(
+                rule.qualifier, {}
+            )
+            if rule.rule_name in by_name:
+                name = "" if rule.rule_name is None else f" {rule.rule_name}"
+                raise ValueError(
+                    f"Duplicate event rule for {rule.source} {rule.qualifier}{name}"
+                )
+            by_name[rule.rule_name] = rule
+
+    def resolve(self, event: LambdaEvent) -> EventRule | None:
+        key = get_event_key(event)
+        if key is None:
+            return None
+        by_qualifier = self._index.get(key[0])
+        if by_qualifier is None:
+            return None
+        for qualifier in (key[1], None):
+            by_name = by_qualifier.get(qualifier)
+            if by_name is None:
+                continue
+            # Only named rules need the event's resources
+            if len(by_name) > 1 or None not in by_name:
+                for name in get_rule_names(event):
+                    if name in by_name:
+                        return by_name[name]
+            if None in by_name:
+                return by_name[None]
+        return None
+
+
+class EventInterface(DirectInvocationInterface):
+    """
+    Non-HTTP events (EventBridge, scheduled, S3 and SNS notifications) routed
+    to the app by a rule table, with the whole event as the JSON request body.
+    Bind the rules with `EventInterface.with_rules(...)`. Records of S3 and SNS
+    batches are routed by the first record.
+    """
+
+    __slots__ = ("rule",)
+
+    rules: ClassVar[EventRuleTable] = EventRuleTable(())
+
+    @classmethod
+    def with_rules(cls, *rules: EventRule) -> type["EventInterface"]:
+        return type(
+            cls.__name__, (cls,), {"__slots__": (), "rules": EventRuleTable(rules)}
+        )
+
+    def __init__(
+        self, app: ASGIApp, event: LambdaEvent, context, base_path: str | None = None
+    ) -> None:
+        rule = self.rules.resolve(event)
+        if rule is None:
+            raise LookupError(f"No event rule matches the event {get_event_key(event)}")
+        self.rule = rule
+        super().__init__(app=app, event=event, context=context, base_path=base_path)
+        self._request = {
+            "type": "http.request",
+            "body": json.dumps(event).encode(),
+            "more_body": False,
+        }
+
+    @classmethod
+    def match(cls, event: LambdaEvent) -> bool:
+        return cls.rules.resolve(event) is not None
+
+    @property
+    def scope(self) -> Scope:
+        self._method = self.rule.method
+        return {
+            "type": "http",
+            "asgi": HTTP_ASGI_SCOPE,
+            "http_version": "1.1",
+            "method": self._method,
+            "scheme": "https",
+            "path": self.rule.path,
+            "raw_path": None,
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json")],
+            "client": None,
+            "server": None,
+            "extensions": {"http.response.pathsend": {}},
+            "aws.event": self.event,
+            "aws.context": self.context,
+        }
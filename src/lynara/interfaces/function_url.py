@@ -0,0 +1,181 @@
+import json
+import os
+from asyncio import TimerHandle, get_running_loop
+from base64 import b64decode, b64encode
+from collections.abc import Iterable
+from typing import Any, ClassVar, Protocol
+
+from lynara.interfaces.api_http import APIGatewayProxyEventV2Interface
+from lynara.interfaces.utils import get_header
+from lynara.types import ASGIApp, LambdaEvent
+
+# Separates the JSON prelude from the body of a streamed Function URL response
+PRELUDE_DELIMITER = b"\0" * 8
+
+# Bodies produced over time, streamed from the start rather than buffered
+STREAMED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/x-ndjson",
+    "audio/",
+    "video/",
+)
+
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+class ResponseStream(Protocol):
+    def write(self, data: bytes) -> None: ...
+
+
+def make_prelude(lambda_response: dict[str, Any]) -> bytes:
+    prelude = {
+        "statusCode": lambda_response["statusCode"],
+        "headers": lambda_response["headers"],
+        "cookies": lambda_response.get("cookies", []),
+    }
+    return json.dumps(prelude).encode() + PRELUDE_DELIMITER
+
+
+def encode_response(lambda_response: dict[str, Any]) -> bytes:
+    """
+    Encodes a buffered response in the shape of a streamed one, the prelude
+    followed by the raw body.
+    """
+    body = lambda_response["body"]
+    if lambda_response.get("isBase64Encoded"):
+        data = b64decode(body)
+    else:
+        data = body.encode()
+    return make_prelude(lambda_response) + data
+
+
+class FunctionURLStreamingInterface(APIGatewayProxyEventV2Interface):
+    """
+    Function URL invocations in the `RESPONSE_STREAM` mode. Responses are
+    buffered, so small ones are sent in one write, and switch to streaming
+    once more than `buffer_size` bytes are buffered or `buffer_time` seconds
+    passed since the response started. A `Content-Length` over `buffer_size`
+    or a streamed content type, such as server-sent events, starts streaming
+    with the response headers.
+
+    The stream is the context's `response_stream`, set by `StreamingRuntime`.
+    Without one the response is buffered, as with the V2 interface. Tune the
+    thresholds with `FunctionURLStreamingInterface.with_thresholds(...)`.
+    """
+
+    __slots__ = ("stream", "streaming", "_chunks", "_buffered_size", "_timer")
+
+    buffer_size: ClassVar[int] = 64 * 1024
+    buffer_time: ClassVar[float] = 0.1
+
+    @classmethod
+    def with_thresholds(
+        cls, *, size: int | None = None, seconds: float | None = None
+    ) -> type["FunctionURLStreamingInterface"]:
+        return type(
+            cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "buffer_size": cls.buffer_size if size is None else size,
+                "buffer_time": cls.buffer_time if seconds is None else seconds,
+            },
+        )
+
+    def __init__(
+        self, app: ASGIApp, event: LambdaEvent, context, base_path: str | None = None
+    ) -> None:
+        super().__init__(app=app, event=event, context=context, base_path=base_path)
+        self.stream: ResponseStream | None = getattr(context, "response_stream", None)
+        self.streaming = False
+        # Raw bytes, a chunk may end in the middle of a character or be binary
+        self._chunks: list[bytes] = []
+        self._buffered_size = 0
+        self._timer: TimerHandle | None = None
+
+    def start_response(
+        self, status: int, headers: Iterable[tuple[bytes, bytes]]
+    ) -> None:
+        super().start_response(status, headers)
+        if self.stream is None:
+            return
+        response_headers = self.lambda_response["headers"]
+        content_type = get_header(response_headers, "content-type") or ""
+        content_length = get_header(response_headers, "content-length")
+        if content_type.startswith(STREAMED_CONTENT_TYPES):
+            self.start_streaming()
+        elif content_length is None or not content_length.isdigit():
+            self._timer = get_running_loop().call_later(
+                self.buffer_time, self.start_streaming
+            )
+        elif int(content_length) > self.buffer_size:
+            self.start_streaming()
+
+    def start_streaming(self) -> None:
+        """
+        Sends the response headers and what was buffered so far, the rest of
+        the body is written to the stream as the app sends it.
+        """
+        self._cancel_timer()
+        if self.streaming or self.is_response_completed or self.stream is None:
+            return
+        self.streaming = True
+        # The headers are sent, the whole body is no longer at hand
+        self.conditional = False
+        self.range_requests = False
+        body = b"".join(self._chunks)
+        self._chunks.clear()
+        self.stream.write(make_prelude(self.lambda_response) + body)
+
+    def write_body(self, body: bytes, more_body: bool = False) -> None:
+        if self.streaming:
+            assert self.stream is not None
+            if body:
+                self.stream.write(body)
+            if not more_body:
+                self.complete_response()
+            return
+        if body:
+            self._chunks.append(body)
+            self._buffered_size += len(body)
+        if not more_body:
+            self.finish_buffering()
+        elif self._buffered_size > self.buffer_size:
+            self.start_streaming()
+
+    def finish_buffering(self) -> None:
+        """
+        Sets the buffered body as text, or base64 encoded when it is not
+        UTF-8, and completes the response.
+        """
+        body = b"".join(self._chunks)
+        self._chunks.clear()
+        try:
+            self.lambda_response["body"] = body.decode()
+        except UnicodeDecodeError:
+            self.write_base64_body(b64encode(body).decode("ascii"))
+            return
+        self.complete_response()
+
+    def write_file(self, path: str) -> None:
+        if not self.streaming and (
+            self.stream is None
+            or os.path.getsize(path) <= self.buffer_size
+            or self.get_range_header() is not None
+        ):
+            super().write_file(path)
+            return
+        self.start_streaming()
+        with open(path, "rb") as file:
+            while chunk := file.read(FILE_CHUNK_SIZE):
+                self.write_body(chunk, more_body=True)
+        self.write_body(b"")
+
+    def complete_response(self) -> None:
+        self._cancel_timer()
+        super().complete_response()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
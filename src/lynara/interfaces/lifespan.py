@@ -5,15 +5,30 @@ from lynara.types import ASGIApp, LifespanMode, Message
 
 LOGGER = logging.getLogger(__name__)
 
+LIFESPAN_ASGI_SCOPE = {"spec_version": "1.0", "version": "3.0"}
+
 
 class LifespanInterface:
+    __slots__ = (
+        "app",
+        "lifespan_mode",
+        "scope",
+        "_queue",
+        "_startup_event",
+        "_shutdown_event",
+        "error_occured",
+        "startup_failed",
+        "shutdown_failed",
+        "_received",
+    )
+
     def __init__(self, app: ASGIApp, lifespan_mode: LifespanMode) -> None:
         self.app = app
         self.lifespan_mode = lifespan_mode
         self.validate_mode()
         self.scope = {
             "type": "lifespan",
-            "asgi": {"spec_version": "1.0", "version": "3.0"},
+            "asgi": LIFESPAN_ASGI_SCOPE,
             "state": {},
         }
         self._queue: asyncio.Queue[Message] = asyncio.Queue()
@@ -22,6 +37,15 @@ class LifespanInterface:
         self.error_occured = False
         self.startup_failed = False
         self.shutdown_failed = False
+        self._received = False
+
+    @property
+    def unsupported(self) -> bool:
+        """
+        Whether the app failed without asking for the startup message, as apps
+        rejecting the lifespan scope do, rather than failing to start up.
+        """
+        return self.error_occured and not self._received
 
     def validate_mode(self) -> None:
         if self.lifespan_mode == LifespanMode.OFF:
@@ -35,8 +59,7 @@ class LifespanInterface:
         await self.shutdown()
 
     async def startup(self) -> None:
-        loop = asyncio.get_event_loop()
-        main_lifespan_task = loop.create_task(self.main())
+        main_lifespan_task = asyncio.get_running_loop().create_task(self.main())
         await self._queue.put({"type": "lifespan.startup"})
         await self._startup_event.wait()
 
@@ -47,6 +70,9 @@ class LifespanInterface:
             possible_exception = main_lifespan_task.exception()
             if isinstance(possible_exception, Exception):
                 raise possible_exception
+        elif self.error_occured and main_lifespan_task.done():
+            # Retrieved so asyncio does not log it as never retrieved
+            main_lifespan_task.exception()
 
     async def shutdown(self):
         await self._queue.put({"type": "lifespan.shutdown"})
@@ -71,6 +97,7 @@ class LifespanInterface:
             self._shutdown_event.set()
 
     async def receive(self) -> Message:
+        self._received = True
         return await self._queue.get()
 
     async def send(self, message: Message) -> None:
@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+
+# More ranges than that are answered with the whole body, as RFC 9110 allows
+MAX_RANGES = 16
+
+ByteRange = tuple[int, int]
+
+
+def parse_range(range_header: str, size: int) -> list[ByteRange] | None:
+    """
+    Returns the satisfiable ranges of a `Range: bytes=...` header for a body
+    of `size` bytes, as inclusive `(first, last)` offsets, possibly none, or
+    `None` when the header is invalid and has to be ignored.
+    """
+    unit, _, specs = range_header.partition("=")
+    items = specs.split(",")
+    if unit.strip().lower() != "bytes" or not specs or len(items) > MAX_RANGES:
+        return None
+    ranges = []
+    for item in items:
+        first, dash, last = item.strip().partition("-")
+        first, last = first.strip(), last.strip()
+        if not dash or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # A suffix range, the last `last` bytes
+            if int(last) and size:
+                ranges.append((max(size - int(last), 0), size - 1))
+            continue
+        if last and int(last) < int(first):
+            return None
+        if int(first) < size:
+            ranges.append((int(first), min(int(last) if last else size, size - 1)))
+    return ranges
+
+
+def if_range_matches(
+    if_range: str, etag: str | None, last_modified: str | None
+) -> bool:
+    # If-Range uses the strong comparison, weak ETags never match
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return etag is not None and not etag.startswith("W/") and etag == if_range
+
+    from email.utils import parsedate_to_datetime
+
+    if last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(if_range) == parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+def make_multipart(
+    parts: Sequence[tuple[ByteRange, bytes]],
+    size: int,
+    content_type: str | None,
+    boundary: str,
+) -> bytes:
+    chunks = []
+    for (first, last), part in parts:
+        chunks.append(f"--{boundary}\r\n".encode())
+        if content_type is not None:
+            chunks.append(f"content-type: {content_type}\r\n".encode())
+        chunks.append(f"content-range: bytes {first}-{last}/{size}\r\n\r\n".encode())
+        chunks.append(part)
+        chunks.append(b"\r\n")
+    chunks.append(f"--{boundary}--\r\n".encode())
+    return b"".join(chunks)
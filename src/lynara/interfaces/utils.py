@@ -1,6 +1,10 @@
+from base64 import b64decode
+from collections.abc import Mapping
 from typing import Any
 from urllib.parse import unquote
 
+from lynara.types import LambdaEvent
+
 
 def get_server(headers: dict[str, Any]) -> tuple[str, int]:
     server_name = headers.get("host", "lynara")
@@ -25,3 +29,26 @@ def strip_api_gateway_path(path: str, *, base_path: str | None = None) -> str:
         path = path[len(normalized_base_path) :]
 
     return unquote(path)
+
+
+def get_request_body(event: LambdaEvent) -> bytes:
+    body = event.get("body")
+    if not body:
+        return b""
+    if event.get("isBase64Encoded"):
+        return b64decode(body)
+    if not isinstance(body, bytes):
+        return body.encode()
+    return body
+
+
+def get_header(headers: Mapping[str, Any] | None, name: str) -> Any:
+    """Case-insensitive lookup of `name`, which has to be lowercase."""
+    if not headers:
+        return None
+    if name in headers:
+        return headers[name]
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
@@ -0,0 +1,89 @@
+import json
+import logging
+import sys
+from contextvars import ContextVar
+from time import gmtime, strftime
+from typing import TextIO
+
+EXCEPTION_FORMATTER = logging.Formatter()
+
+# Set per invocation, invocations of a batch run in tasks of their own
+REQUEST_ID: ContextVar[str | None] = ContextVar("lynara.request_id", default=None)
+
+
+class BufferedJSONHandler(logging.Handler):
+    """
+    Keeps the log records of an invocation in memory as JSON lines, in the
+    shape of Lambda's JSON log format, and writes them to the stream in one
+    write when `Lynara.run` finishes.
+
+    Records at `flush_level` and above are written immediately together
+    with everything buffered before them, as is a buffer that reaches
+    `capacity` records. The buffer is also flushed when the handler is
+    closed, including by `logging.shutdown` at exit.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        flush_level: int = logging.ERROR,
+        capacity: int = 1000,
+        level: int = logging.NOTSET,
+    ) -> None:
+        super().__init__(level)
+        self.stream = stream
+        self.flush_level = flush_level
+        self.capacity = capacity
+        self.buffer: list[str] = []
+
+    @property
+    def request_id(self) -> str | None:
+        return REQUEST_ID.get()
+
+    def begin(self, request_id: str | None) -> None:
+        self.flush()
+        REQUEST_ID.set(request_id)
+
+    def format(self, record: logging.LogRecord) -> str:
+        log = {
+            "timestamp": strftime("%Y-%m-%dT%H:%M:%S", gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "requestId": self.request_id,
+        }
+        if record.exc_info:
+            log["exception"] = EXCEPTION_FORMATTER.formatException(record.exc_info)
+        elif record.exc_text:
+            log["exception"] = record.exc_text
+        if record.stack_info:
+            log["stack"] = record.stack_info
+        return json.dumps(log, default=str)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if record.levelno >= self.flush_level or len(self.buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if not self.buffer:
+                return
+            lines, self.buffer = self.buffer, []
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            super().close()
@@ -0,0 +1,13 @@
+import asyncio
+from collections.abc import Callable
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+
+def get_loop_factory() -> LoopFactory:
+    """Returns uvloop's loop factory when it is installed, asyncio's otherwise."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop
+    return uvloop.new_event_loop
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import tracemalloc
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_rss() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # Peak rather than current RSS, the best available without procfs
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryGrowthDetector:
+    """
+    Measures memory every `every` invocations of a warm container and logs
+    the growth as structured JSON.
+
+    With `use_tracemalloc` the top growing allocation sites since the previous
+    measurement are reported too. Tracing every allocation slows the app down,
+    so this is best enabled on a fraction of the fleet. Otherwise the RSS of
+    the process is measured, which is close to free.
+
+    When the growth since the first measurement passes `recycle_threshold`
+    bytes, `recycle_requested` is set. `Lynara.handle` then posts the response
+    to the Lambda Runtime API itself and recycles the container, so the next
+    event gets a fresh one.
+    """
+
+    def __init__(
+        self,
+        every: int = 100,
+        use_tracemalloc: bool = False,
+        top: int = 10,
+        traceback_limit: int = 1,
+        recycle_threshold: int | None = None,
+    ) -> None:
+        self.every = every
+        self.use_tracemalloc = use_tracemalloc
+        self.top = top
+        self.recycle_threshold = recycle_threshold
+        self.invocations = 0
+        self.recycle_requested = False
+        self._baseline: int | None = None
+        self._previous: int | None = None
+        self._previous_snapshot: tracemalloc.Snapshot | None = None
+        if use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(traceback_limit)
+
+    def after_invocation(self) -> None:
+        self.invocations += 1
+        if self.invocations % self.every == 0:
+            self.check()
+
+    def take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+
+    def check(self) -> dict[str, Any]:
+        report: dict[str, Any] = {"invocations": self.invocations}
+        snapshot = None
+        if self.use_tracemalloc:
+            size = tracemalloc.get_traced_memory()[0]
+            snapshot = self.take_snapshot()
+            if self._previous_snapshot is not None:
+                report["top"] = [
+                    {
+                        "site": str(stat.traceback),
+                        "size_diff": stat.size_diff,
+                        "count_diff": stat.count_diff,
+                    }
+                    for stat in snapshot.compare_to(self._previous_snapshot, "lineno")
+                    if stat.size_diff > 0
+                ][: self.top]
+        else:
+            size = get_rss()
+
+        if self._baseline is None:
+            self._baseline = size
+        report["size"] = size
+        report["growth"] = size - self._previous if self._previous is not None else 0
+        report["total_growth"] = size - self._baseline
+        self._previous = size
+        self._previous_snapshot = snapshot
+
+        LOGGER.info("%s", json.dumps({"lynara.memory": report}))
+        if (
+            self.recycle_threshold is not None
+            and report["total_growth"] > self.recycle_threshold
+        ):
+            LOGGER.warning(
+                "Memory grew by %d bytes over %d invocations, recycling the container",
+                report["total_growth"],
+                self.invocations,
+            )
+            self.recycle_requested = True
+        return report
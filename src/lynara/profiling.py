@@ -0,0 +1,196 @@
+import json
+import logging
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from time import perf_counter, sleep, time
+from types import CodeType, FrameType
+from typing import Any, Literal
+
+LOGGER = logging.getLogger(__name__)
+
+Stack = tuple[CodeType, ...]
+
+
+def get_stack(frame: FrameType | None) -> Stack:
+    codes = []
+    while frame is not None:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+def format_code(code: CodeType) -> str:
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def to_collapsed(samples: list[Stack]) -> str:
+    """Brendan Gregg's collapsed stacks, one `root;...;leaf count` per line."""
+    counts = Counter(samples)
+    return "\n".join(
+        f"{';'.join(format_code(code) for code in stack)} {count}"
+        for stack, count in counts.most_common()
+    )
+
+
+def to_speedscope(
+    samples: list[Stack], interval: float, duration: float, name: str
+) -> dict[str, Any]:
+    frame_indexes: dict[CodeType, int] = {}
+    frames: list[dict[str, Any]] = []
+    indexed_samples: list[list[int]] = []
+    for stack in samples:
+        indexed_stack: list[int] = []
+        for code in stack:
+            if code not in frame_indexes:
+                frame_indexes[code] = len(frames)
+                frames.append(
+                    {
+                        "name": code.co_name,
+                        "file": code.co_filename,
+                        "line": code.co_firstlineno,
+                    }
+                )
+            indexed_stack.append(frame_indexes[code])
+        indexed_samples.append(indexed_stack)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": duration,
+                "samples": indexed_samples,
+                "weights": [interval] * len(indexed_samples),
+            }
+        ],
+    }
+
+
+class Profile:
+    """The samples of one invocation, collected while it is entered."""
+
+    __slots__ = ("profiler", "label", "samples", "thread_id", "start_time")
+
+    def __init__(self, profiler: "SlowInvocationProfiler", label: str | None) -> None:
+        self.profiler = profiler
+        self.label = label
+        self.samples: list[Stack] = []
+        self.thread_id = 0
+        self.start_time = 0.0
+
+    def __enter__(self) -> "Profile":
+        self.thread_id = threading.get_ident()
+        self.start_time = perf_counter()
+        self.profiler._activate(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.profiler._deactivate(self)
+        duration = perf_counter() - self.start_time
+        if duration >= self.profiler.threshold and self.samples:
+            try:
+                self.profiler.emit(self.samples, duration, self.label)
+            except Exception:
+                LOGGER.exception("Emitting the profile failed")
+
+
+class SlowInvocationProfiler:
+    """
+    Samples the stack of the thread running the invocation from a background
+    thread every `interval` seconds. Samples are only references to code
+    objects, they are formatted and emitted only when the invocation took
+    longer than `threshold` seconds and dropped otherwise.
+
+    Invocations overlapping on the loop, as in `Lynara.run_batch`, share its
+    thread, so a sample could belong to any of them: sampling pauses while
+    more than one invocation is in flight.
+
+    Profiles are logged, or written to `output_dir` when given (e.g. `/tmp`),
+    as collapsed stacks or a speedscope JSON file.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        interval: float = 0.005,
+        output_format: Literal["collapsed", "speedscope"] = "collapsed",
+        output_dir: str | Path | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.output_format = output_format
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self._profiles: list[Profile] = []
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def profile(self, label: str | None = None) -> Profile:
+        return Profile(self, label)
+
+    def _activate(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+            if self._thread is None:
+                # One sampler thread per container, idle between invocations
+                self._thread = threading.Thread(
+                    target=self._sample, name="lynara-profiler", daemon=True
+                )
+                self._thread.start()
+            self._active.set()
+
+    def _deactivate(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.remove(profile)
+            if not self._profiles:
+                self._active.clear()
+
+    def _sample(self) -> None:
+        while True:
+            self._active.wait()
+            with self._lock:
+                profile = self._profiles[0] if len(self._profiles) == 1 else None
+            if profile is not None:
+                frame = sys._current_frames().get(profile.thread_id)
+                if frame is not None:
+                    stack = get_stack(frame)
+                    with self._lock:
+                        # Dropped when the invocation ended meanwhile or
+                        # another one started
+                        if self._profiles == [profile]:
+                            profile.samples.append(stack)
+                del frame
+            sleep(self.interval)
+
+    def emit(
+        self, samples: list[Stack], duration: float, label: str | None = None
+    ) -> None:
+        name = label or f"invocation-{time():.0f}"
+        if self.output_format == "speedscope":
+            output = json.dumps(
+                to_speedscope(samples, self.interval, duration, name=name)
+            )
+            suffix = ".speedscope.json"
+        else:
+            output = to_collapsed(samples)
+            suffix = ".collapsed"
+
+        if self.output_dir is None:
+            LOGGER.warning(
+                "Slow invocation %s took %.3f s, profile:\n%s", name, duration, output
+            )
+            return
+        path = self.output_dir / f"{name}{suffix}"
+        path.write_text(output)
+        LOGGER.warning(
+            "Slow invocation %s took %.3f s, profile written to %s",
+            name,
+            duration,
+            path,
+        )
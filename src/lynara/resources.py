@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from time import time
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+Validate = Callable[[Any], Awaitable[bool]]
+Reconnect = Callable[[Any], Awaitable[Any]]
+Close = Callable[[Any], Awaitable[None]]
+
+
+class Resource:
+    __slots__ = ("name", "value", "validate", "reconnect", "close", "_revalidation")
+
+    def __init__(
+        self,
+        name: str,
+        value: Any,
+        validate: Validate,
+        reconnect: Reconnect,
+        close: Close | None = None,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.validate = validate
+        self.reconnect = reconnect
+        self.close = close
+        self._revalidation: asyncio.Future[None] | None = None
+
+    async def revalidate(self) -> None:
+        # Overlapping invocations wait for the revalidation in flight instead
+        # of reconnecting the resource once each
+        if self._revalidation is None:
+            self._revalidation = asyncio.ensure_future(self._revalidate())
+            self._revalidation.add_done_callback(self._revalidated)
+        # One invocation cancelled does not cancel it for the others
+        await asyncio.shield(self._revalidation)
+
+    def _revalidated(self, revalidation: asyncio.Future[None]) -> None:
+        self._revalidation = None
+
+    async def _revalidate(self) -> None:
+        try:
+            if await self.validate(self.value):
+                return
+        except Exception:
+            LOGGER.debug("Validation of %s raised, reconnecting", self.name)
+        LOGGER.info("Resource %s did not survive the freeze, reconnecting", self.name)
+        try:
+            self.value = await self.reconnect(self.value)
+        except Exception:
+            LOGGER.exception("Reconnecting resource %s failed", self.name)
+
+
+class ResourceRegistry:
+    """
+    Holds loop-bound resources (DB pools, HTTP clients) across warm invocations.
+
+    The Lambda sandbox is frozen between invocations. When the wall-clock gap
+    since the previous invocation exceeds `thaw_threshold` seconds all
+    resources are validated in parallel, and reconnected when found dead,
+    before the next event is dispatched.
+    """
+
+    __slots__ = ("thaw_threshold", "_resources", "_last_invocation")
+
+    def __init__(self, thaw_threshold: float = 60.0) -> None:
+        self.thaw_threshold = thaw_threshold
+        self._resources: dict[str, Resource] = {}
+        self._last_invocation: float | None = None
+
+    def register(
+        self,
+        name: str,
+        value: Any,
+        *,
+        validate: Validate,
+        reconnect: Reconnect,
+        close: Close | None = None,
+    ) -> None:
+        self._resources[name] = Resource(name, value, validate, reconnect, close)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._resources[name].value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def is_thawed(self, now: float) -> bool:
+        return (
+            self._last_invocation is not None
+            and now - self._last_invocation > self.thaw_threshold
+        )
+
+    async def before_invocation(self) -> None:
+        if self._resources and self.is_thawed(time()):
+            await self.revalidate()
+
+    def after_invocation(self) -> None:
+        self._last_invocation = time()
+
+    async def revalidate(self) -> None:
+        await asyncio.gather(
+            *(resource.revalidate() for resource in self._resources.values())
+        )
+
+    async def aclose(self) -> None:
+        resources = list(self._resources.values())
+        self._resources.clear()
+        for resource in reversed(resources):
+            if resource.close is None:
+                continue
+            try:
+                await resource.close(resource.value)
+            except Exception:
+                LOGGER.exception("Closing resource %s failed", resource.name)
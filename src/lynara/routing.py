@@ -0,0 +1,115 @@
+from collections.abc import Iterable, Mapping
+
+from lynara.types import AnyASGIApp, ASGIApp, Receive, Scope, Send
+
+
+def normalize_prefix(prefix: str) -> str:
+    prefix = prefix.strip("/")
+    return f"/{prefix}" if prefix else ""
+
+
+class Mount:
+    """
+    An ASGI app served under a path prefix, optionally only for a given host
+    (matched against the `Host` header) or API Gateway stage.
+    """
+
+    __slots__ = ("prefix", "app", "host", "stage")
+
+    def __init__(
+        self,
+        prefix: str,
+        app: AnyASGIApp,
+        *,
+        host: str | None = None,
+        stage: str | None = None,
+    ) -> None:
+        self.prefix = normalize_prefix(prefix)
+        self.app = app
+        self.host = host.lower() if host else None
+        self.stage = stage
+
+    def matches(self, host: str | None, stage: str | None) -> bool:
+        return (self.host is None or self.host == host) and (
+            self.stage is None or self.stage == stage
+        )
+
+
+class _Node:
+    __slots__ = ("children", "mounts")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.mounts: list[Mount] = []
+
+
+class MountRouter:
+    """
+    ASGI app dispatching to mounted apps by the longest matching path prefix.
+
+    Prefixes are compiled into a trie of path segments once, so resolving a
+    request walks at most as many nodes as the request path has segments.
+    The mounted app receives the full `path` and the matched prefix appended
+    to `root_path`, as Starlette's `Mount` does.
+    """
+
+    __slots__ = ("mounts", "apps", "_root")
+
+    def __init__(self, mounts: Mapping[str, AnyASGIApp] | Iterable[Mount]) -> None:
+        if isinstance(mounts, Mapping):
+            mounts = [Mount(prefix, app) for prefix, app in mounts.items()]
+        self.mounts = list(mounts)
+        self.apps: list[ASGIApp] = list(
+            {id(mount.app): mount.app for mount in self.mounts}.values()
+        )
+        self._root = _Node()
+        for mount in self.mounts:
+            node = self._root
+            for segment in mount.prefix.split("/")[1:]:
+                node = node.children.setdefault(segment, _Node())
+            node.mounts.append(mount)
+            # Host and stage specific mounts take precedence on the same prefix
+            node.mounts.sort(key=lambda m: (m.host is None, m.stage is None))
+
+    def resolve(
+        self, path: str, host: str | None = None, stage: str | None = None
+    ) -> Mount | None:
+        node = self._root
+        resolved = self._select(node, host, stage)
+        for segment in path.split("/"):
+            if not segment:
+                continue
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+            resolved = self._select(node, host, stage) or resolved
+        return resolved
+
+    @staticmethod
+    def _select(node: _Node, host: str | None, stage: str | None) -> Mount | None:
+        for mount in node.mounts:
+            if mount.matches(host, stage):
+                return mount
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_context = scope.get("aws.event", {}).get("requestContext", {})
+        mount = self.resolve(
+            scope["path"],
+            host=scope["server"][0].lower() if scope.get("server") else None,
+            stage=request_context.get("stage"),
+        )
+        if mount is None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 404,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b"Not Found"})
+            return
+
+        scope = {**scope, "root_path": scope.get("root_path", "") + mount.prefix}
+        await mount.app(scope, receive, send)
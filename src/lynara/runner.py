@@ -1,40 +1,399 @@
+import asyncio
+import atexit
+import json
 import logging
-from contextlib import AsyncExitStack
-from time import time
+import os
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import AsyncExitStack, nullcontext
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Any
 
-from lynara import LifespanInterface
 from lynara.interfaces.base import HTTPInterface
-from lynara.types import LifespanMode
+from lynara.interfaces.lifespan import LifespanInterface
+from lynara.resources import ResourceRegistry
+from lynara.routing import Mount, MountRouter
+from lynara.types import AnyASGIApp, ASGIApp, LifespanMode
+
+if TYPE_CHECKING:
+    from lynara.extension import TelemetryClient
+    from lynara.idempotency import Idempotency
+    from lynara.logs import BufferedJSONHandler
+    from lynara.loops import LoopFactory
+    from lynara.memory import MemoryGrowthDetector
+    from lynara.profiling import SlowInvocationProfiler
+    from lynara.static import StaticFiles
+    from lynara.stats import ContainerStats
+    from lynara.tracing import Tracer
+    from lynara.warmup import WarmUp
+    from lynara.workers import WorkerPool
 
 LOGGER = logging.getLogger(__name__)
 
+RUNTIME_RESPONSE_URL = (
+    "http://{runtime_api}/2018-06-01/runtime/invocation/{request_id}/response"
+)
+
 
 class Lynara:
-    def __init__(self, app, lifespan_mode: LifespanMode = LifespanMode.AUTO):
-        self.app = app
+    def __init__(
+        self,
+        app: AnyASGIApp | Mapping[str, AnyASGIApp] | Iterable[Mount],
+        lifespan_mode: LifespanMode = LifespanMode.AUTO,
+        thaw_threshold: float = 60.0,
+        tracer: "Tracer | None" = None,
+        profiler: "SlowInvocationProfiler | None" = None,
+        memory_detector: "MemoryGrowthDetector | None" = None,
+        worker_pool: "WorkerPool | None" = None,
+        conditional_requests: bool = False,
+        range_requests: bool = False,
+        static: "StaticFiles | Iterable[StaticFiles]" = (),
+        log_handler: "BufferedJSONHandler | None" = None,
+        telemetry: "TelemetryClient | None" = None,
+        loop_factory: "LoopFactory" = asyncio.new_event_loop,
+        stats: "ContainerStats | None" = None,
+        warm_up: "WarmUp | None" = None,
+        idempotency: "Idempotency | None" = None,
+    ):
+        self.app: ASGIApp
+        if callable(app):
+            self.app = app
+            self.apps = [app]
+        else:
+            router = MountRouter(app)
+            self.app = router
+            self.apps = router.apps
         self.lifespan_mode = lifespan_mode
+        self.resources = ResourceRegistry(thaw_threshold=thaw_threshold)
+        self.tracer = tracer
+        self.profiler = profiler
+        self.memory_detector = memory_detector
+        self.worker_pool = worker_pool
+        self.conditional_requests = conditional_requests
+        self.range_requests = range_requests
+        self.static = (static,) if not isinstance(static, Iterable) else tuple(static)
+        self.log_handler = log_handler
+        self.telemetry = telemetry
+        self.loop_factory = loop_factory
+        self.stats = stats
+        self.warm_up = warm_up
+        self.idempotency = idempotency
+        # Whether each app supports the lifespan protocol, once probed
+        self.lifespan_supported: list[bool | None] = [None] * len(self.apps)
+        if stats is not None:
+            # Reported as probed, updated in place
+            stats.lifespan_supported = self.lifespan_supported
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lifespan_stack: AsyncExitStack | None = None
 
-    async def run(
+    async def startup(self) -> None:
+        """
+        Starts the lifespan of every app for the lifetime of the container,
+        invocations served afterwards skip the per-invocation lifespan.
+        """
+        async with AsyncExitStack() as stack:
+            await self._enter_lifespans(stack)
+            self._lifespan_stack = stack.pop_all()
+        if self.worker_pool is not None and not self.worker_pool.started:
+            # Forked after startup so the workers inherit the initialized apps
+            self.worker_pool.start(self)
+
+    async def ensure_started(self) -> None:
+        """
+        Starts the lifespans for the lifetime of the container when running
+        through `handle` and they have not started yet. Run alone, invocations
+        keep their own lifespan.
+        """
+        if self._loop is not None and self._lifespan_stack is None:
+            await self.startup()
+
+    async def shutdown(self) -> None:
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+        await self.resources.aclose()
+        stack, self._lifespan_stack = self._lifespan_stack, None
+        if stack is not None:
+            await stack.aclose()
+        if self.log_handler is not None:
+            self.log_handler.flush()
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+    def handle(
         self,
         event,
         context,
         interface_class: type[HTTPInterface],
         base_path: str | None = None,
     ):
-        start_time = time()
+        """
+        Synchronous Lambda entry point keeping one event loop and the apps'
+        lifespans open across warm invocations of the container.
+        """
+        lambda_response = self.invoke(event, context, interface_class, base_path)
+        if self.memory_detector is not None and self.memory_detector.recycle_requested:
+            # The managed runtime posts the response after the handler
+            # returns, too late to exit, so it is posted here
+            if self.post_response(context, lambda_response):
+                self.recycle()
+            self.memory_detector.recycle_requested = False
+        return lambda_response
+
+    def invoke(
+        self,
+        event,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ):
+        """
+        Runs the event on the container's event loop, for runtimes posting
+        the response themselves. Recycling is left to them.
+        """
+        if self._loop is None:
+            self._loop = self.loop_factory()
+            asyncio.set_event_loop(self._loop)
+            atexit.register(self.close)
+        return self._loop.run_until_complete(
+            self.run(event, context, interface_class, base_path=base_path)
+        )
+
+    def post_response(self, context, lambda_response) -> bool:
+        runtime_api = os.environ.get("AWS_LAMBDA_RUNTIME_API")
+        request_id = getattr(context, "aws_request_id", None)
+        if not runtime_api or not request_id:
+            LOGGER.warning("Not running in the Lambda runtime, skipping the recycle")
+            return False
+
+        from urllib.request import Request, urlopen
+
+        request = Request(
+            RUNTIME_RESPONSE_URL.format(runtime_api=runtime_api, request_id=request_id),
+            data=json.dumps(lambda_response).encode(),
+            method="POST",
+        )
+        with urlopen(request, timeout=5):
+            pass
+        return True
+
+    def recycle(self) -> None:
+        """
+        Shuts the container down, as on exit, and exits the process so the
+        next event gets a fresh container. Call it once the response of the
+        invocation was posted.
+        """
+        try:
+            self.close()
+        finally:
+            logging.shutdown()
+            os._exit(0)
+
+    def close(self) -> None:
+        loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        atexit.unregister(self.close)
+        try:
+            loop.run_until_complete(self.shutdown())
+        finally:
+            loop.close()
+
+    def create_interface(
+        self,
+        interface_class: type[HTTPInterface],
+        event,
+        context,
+        base_path: str | None = None,
+    ) -> HTTPInterface:
         interface = interface_class(
             app=self.app, event=event, context=context, base_path=base_path
         )
-        async with AsyncExitStack() as stack:
-            if self.lifespan_mode in (LifespanMode.ON, LifespanMode.AUTO):
-                await stack.enter_async_context(
-                    LifespanInterface(app=self.app, lifespan_mode=self.lifespan_mode)
-                )
-            interface_start_time = time()
-            lambda_response = await interface()
+        interface.conditional = self.conditional_requests
+        interface.range_requests = self.range_requests
+        return interface
+
+    async def _enter_lifespans(self, stack: AsyncExitStack) -> None:
+        if self.lifespan_mode not in (LifespanMode.ON, LifespanMode.AUTO):
+            return
+        for index, app in enumerate(self.apps):
+            if self.lifespan_supported[index] is False:
+                # Found unsupported in AUTO mode, the app is not probed again
+                continue
+            lifespan = await stack.enter_async_context(
+                LifespanInterface(app=app, lifespan_mode=self.lifespan_mode)
+            )
+            if self.lifespan_supported[index] is None:
+                self.lifespan_supported[index] = not lifespan.unsupported
+                if self.stats is not None:
+                    self.stats.counters["lifespan_probes"] += 1
+
+    async def _enter_lifespan(self, stack: AsyncExitStack) -> None:
+        if self._loop is not None:
+            # Running through `handle`, the lifespan spans the whole container
+            await self.startup()
+        else:
+            await self._enter_lifespans(stack)
+
+    async def run(
+        self,
+        event,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ):
+        warm_up = self.warm_up
+        if warm_up is not None and warm_up.matches(event):
+            # Keep-warm pings are no requests, neither the interface nor the
+            # app sees them
+            if self.stats is not None:
+                self.stats.counters["warm_ups"] += 1
+            return await self._run_logged(
+                context, lambda: warm_up.respond(self, event, context)
+            )
+        idempotency = self.idempotency
+        if idempotency is not None:
+            # Stored responses and duplicates waiting for one end their
+            # invocation like the ones running the app
+            return await self._run_logged(
+                context,
+                lambda: idempotency(
+                    event,
+                    context,
+                    lambda: self._run(event, context, interface_class, base_path),
+                ),
+            )
+        return await self._run_logged(
+            context, lambda: self._run(event, context, interface_class, base_path)
+        )
+
+    async def _run_logged(self, context, call: Callable[[], Awaitable[Any]]) -> Any:
+        if self.log_handler is None and self.telemetry is None:
+            return await call()
+
+        request_id = getattr(context, "aws_request_id", None)
+        if self.log_handler is not None:
+            self.log_handler.begin(request_id)
+        try:
+            return await call()
+        finally:
+            # One write for all the records of the invocation
+            if self.log_handler is not None:
+                self.log_handler.flush()
+            if self.telemetry is not None:
+                self.telemetry.end_invocation(request_id)
+
+    def _respond_before_app(self, interface: HTTPInterface) -> dict | None:
+        if self.stats is not None:
+            stats_response = self.stats.respond(interface)
+            if stats_response is not None:
+                return stats_response
+        for static in self.static:
+            # Static files skip the lifespan and the app altogether
+            static_response = static.respond(interface)
+            if static_response is not None:
+                if self.stats is not None:
+                    self.stats.counters["static_responses"] += 1
+                return static_response
+        return None
+
+    async def _call_app(self, interface: HTTPInterface, trace, base_path: str | None):
+        if self.worker_pool is None or not self.worker_pool.should_offload(interface):
+            return await interface(trace)
+        if not self.worker_pool.started:
+            self.worker_pool.start(self)
+        if self.stats is not None:
+            self.stats.counters["offloaded"] += 1
+        return await self.worker_pool.submit(
+            interface.event, interface.context, type(interface), base_path
+        )
+
+    async def _run(
+        self,
+        event,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ):
+        start_time = time()
+        trace = self.tracer.start_trace(event) if self.tracer is not None else None
+        try:
+            scope_start_time = perf_counter()
+            interface = self.create_interface(
+                interface_class, event, context, base_path
+            )
+            scope_duration = perf_counter() - scope_start_time
+            early_response = self._respond_before_app(interface)
+            if early_response is not None:
+                return early_response
+            async with AsyncExitStack() as stack:
+                if self.profiler is not None:
+                    stack.enter_context(
+                        self.profiler.profile(getattr(context, "aws_request_id", None))
+                    )
+                lifespan_start_time = perf_counter()
+                with trace.span("lifespan") if trace is not None else nullcontext():
+                    if self._lifespan_stack is None:
+                        await self._enter_lifespan(stack)
+                lifespan_duration = perf_counter() - lifespan_start_time
+                await self.resources.before_invocation()
+                interface_start_time = time()
+                try:
+                    lambda_response = await self._call_app(interface, trace, base_path)
+                finally:
+                    self.resources.after_invocation()
+        finally:
+            # Also when the app raised or the response came before it
+            if trace is not None and self.tracer is not None:
+                self.tracer.finish(trace)
+        if self.memory_detector is not None:
+            self.memory_detector.after_invocation()
+        if self.stats is not None:
+            self.stats.record_invocation(
+                scope_duration,
+                lifespan_duration,
+                time() - interface_start_time,
+                lambda_response,
+            )
         LOGGER.info(
             "Lynara execution time: %.5f s, out of which interface time: %.5f s",
             (time() - start_time),
             (time() - interface_start_time),
         )
+        if self.telemetry is not None:
+            self.telemetry.emit(
+                "metrics",
+                {
+                    "duration": time() - start_time,
+                    "interface_duration": time() - interface_start_time,
+                    "lifespan_supported": self.lifespan_supported,
+                },
+            )
         return lambda_response
+
+    async def run_batch(
+        self,
+        events: Iterable,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ) -> list:
+        """
+        Runs the events of a batch, e.g. records, concurrently and returns
+        their responses in order, or the exception an event raised. With a
+        worker pool the offloaded events are spread over the worker processes.
+        """
+        per_invocation = self._lifespan_stack is None and self._loop is None
+        if self._lifespan_stack is None:
+            # Started once for the batch rather than by each concurrent run
+            await self.startup()
+        try:
+            return await asyncio.gather(
+                *(
+                    self.run(event, context, interface_class, base_path=base_path)
+                    for event in events
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            if per_invocation and self._lifespan_stack is not None:
+                stack, self._lifespan_stack = self._lifespan_stack, None
+                await stack.aclose()
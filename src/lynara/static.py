@@ -0,0 +1,163 @@
+import logging
+import mimetypes
+import os
+from base64 import b64encode
+from pathlib import Path
+from typing import Any
+
+from lynara.interfaces.base import HTTPInterface
+from lynara.interfaces.conditional import etag_matches, make_etag
+from lynara.routing import normalize_prefix
+
+LOGGER = logging.getLogger(__name__)
+
+# Sibling suffixes of precompressed files, in the order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def get_accepted_encodings(accept_encoding: str | None) -> set[str]:
+    if not accept_encoding:
+        return set()
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=").strip()
+        if quality and quality.replace(".", "", 1).strip("0") == "":
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class Variant:
+    __slots__ = ("path", "encoding", "size", "etag", "body")
+
+    def __init__(self, path: Path, encoding: str | None, content: bytes) -> None:
+        self.path = path
+        self.encoding = encoding
+        self.size = len(content)
+        self.etag = make_etag(content)
+        # Base64 encoded body when it fits in the cache budget
+        self.body: str | None = None
+
+
+class Asset:
+    __slots__ = ("content_type", "variants")
+
+    def __init__(self, content_type: str, variants: list[Variant]) -> None:
+        self.content_type = content_type
+        self.variants = variants
+
+    def select(self, accepted_encodings: set[str]) -> Variant:
+        for variant in self.variants:
+            if variant.encoding is None or variant.encoding in accepted_encodings:
+                return variant
+        return self.variants[-1]
+
+
+class StaticFiles:
+    """
+    Files of `directory` served under `prefix` before the app is called.
+
+    The directory is indexed once, when the container initializes: the
+    content type, size and ETag of every file, and its `.br` and `.gz`
+    siblings, which are served to clients accepting them. File contents are
+    kept in memory, base64 encoded, up to `cache_budget` bytes, preferring
+    the compressed variants. Other files are memory-mapped on each request.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        directory: str | os.PathLike[str],
+        *,
+        cache_budget: int = 32 * 1024 * 1024,
+        cache_control: str | None = None,
+    ) -> None:
+        self.prefix = normalize_prefix(prefix)
+        self.directory = Path(directory)
+        self.cache_budget = cache_budget
+        self.cache_control = cache_control
+        self.cached_size = 0
+        self.assets: dict[str, Asset] = {}
+        self._index()
+
+    def _index(self) -> None:
+        variants: list[Variant] = []
+        compressed_suffixes = tuple(ENCODINGS.values())
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file():
+                continue
+            if path.suffix in compressed_suffixes and path.with_suffix("").is_file():
+                continue
+
+            asset_variants = []
+            for encoding, suffix in ENCODINGS.items():
+                sibling = path.with_name(path.name + suffix)
+                if sibling.is_file():
+                    asset_variants.append(
+                        Variant(sibling, encoding, sibling.read_bytes())
+                    )
+            asset_variants.append(Variant(path, None, path.read_bytes()))
+            variants.extend(asset_variants)
+
+            content_type, _ = mimetypes.guess_type(path.name)
+            url_path = f"{self.prefix}/{path.relative_to(self.directory).as_posix()}"
+            self.assets[url_path] = Asset(
+                content_type or "application/octet-stream", asset_variants
+            )
+
+        # Compressed variants are served the most and are the smallest
+        variants.sort(key=lambda variant: (variant.encoding is None, variant.size))
+        for variant in variants:
+            encoded_size = (variant.size + 2) // 3 * 4
+            if self.cached_size + encoded_size > self.cache_budget:
+                # A smaller variant further on may still fit
+                continue
+            variant.body = b64encode(variant.path.read_bytes()).decode("ascii")
+            self.cached_size += encoded_size
+        LOGGER.debug(
+            "Indexed %d static files in %s, %d bytes cached",
+            len(self.assets),
+            self.directory,
+            self.cached_size,
+        )
+
+    def respond(self, interface: HTTPInterface) -> dict[str, Any] | None:
+        """
+        Answers the request through the interface when it is for a known
+        file and returns the Lambda response, or returns `None`.
+        """
+        scope = interface.get_scope()
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+        asset = self.assets.get(scope["path"])
+        if asset is None:
+            return None
+
+        variant = asset.select(
+            get_accepted_encodings(interface.get_request_header("accept-encoding"))
+        )
+        headers = [(b"etag", variant.etag.encode())]
+        if len(asset.variants) > 1:
+            headers.append((b"vary", b"accept-encoding"))
+        if self.cache_control is not None:
+            headers.append((b"cache-control", self.cache_control.encode()))
+
+        if_none_match = interface.get_request_header("if-none-match")
+        if if_none_match is not None and etag_matches(variant.etag, if_none_match):
+            interface.start_response(304, headers)
+            interface.write_body(b"")
+            return interface.lambda_response
+
+        headers.append((b"content-type", asset.content_type.encode()))
+        headers.append((b"content-length", str(variant.size).encode()))
+        if variant.encoding is not None:
+            headers.append((b"content-encoding", variant.encoding.encode()))
+        interface.start_response(200, headers)
+        if scope["method"] == "HEAD":
+            interface.write_body(b"")
+        elif variant.body is not None:
+            interface.write_base64_body(variant.body)
+        else:
+            interface.write_file(str(variant.path))
+        return interface.lambda_response
@@ -0,0 +1,160 @@
+import hmac
+import json
+from array import array
+from collections import Counter
+from time import time
+from typing import Any
+
+from lynara.interfaces.base import HTTPInterface
+from lynara.routing import normalize_prefix
+
+DEFAULT_PATH = "/_lynara/stats"
+DEFAULT_HEADER = "x-lynara-stats-secret"
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class Histogram:
+    """
+    A histogram of non-negative integers in the layout of HdrHistogram: every
+    power of two is split into `2 ** precision` buckets of equal width, so
+    every recorded value is known within a relative error of
+    `2 ** -precision`. The counts live in one fixed-size array, recording is a
+    handful of integer operations and never allocates.
+
+    Values up to `2 ** max_bits - 1` are tracked, larger ones are counted in
+    the last bucket.
+    """
+
+    __slots__ = ("precision", "counts", "count", "total", "min", "max")
+
+    def __init__(self, precision: int = 4, max_bits: int = 36) -> None:
+        self.precision = precision
+        self.counts = array("Q", bytes(8 * self._index((1 << max_bits) - 1) + 8))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.precision - 1
+        if shift <= 0:
+            return value
+        # The top `precision + 1` bits select the bucket within the power of two
+        return (shift << self.precision) + (value >> shift)
+
+    def _lowest_value(self, index: int) -> int:
+        shift = (index >> self.precision) - 1
+        if shift <= 0:
+            return index
+        return (index - (shift << self.precision)) << shift
+
+    def record(self, value: int) -> None:
+        index = self._index(value)
+        if index >= len(self.counts):
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def percentile(self, percentile: float) -> int:
+        if not self.count:
+            return 0
+        threshold = max(self.count * percentile / 100, 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                # The highest value of the bucket, as HdrHistogram reports
+                return min(self._lowest_value(index + 1) - 1, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.total / self.count if self.count else 0,
+            "max": self.max,
+            **{f"p{p:g}": self.percentile(p) for p in PERCENTILES},
+        }
+
+
+class ContainerStats:
+    """
+    Statistics of the invocations served by the container, kept for its
+    lifetime: counters and histograms of the lifespan, scope build and app
+    times in microseconds and of the response sizes in bytes.
+
+    They are served as JSON to requests for `path` carrying the `secret` in
+    the `header`, before the app is called. Other requests for the path reach
+    the app, so the endpoint does not reveal itself.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        *,
+        path: str = DEFAULT_PATH,
+        header: str = DEFAULT_HEADER,
+    ) -> None:
+        self.secret = secret.encode()
+        self.path = normalize_prefix(path)
+        self.header = header
+        self.started_at = time()
+        # Whether each app supports the lifespan protocol, set by `Lynara`
+        self.lifespan_supported: list[bool | None] = []
+        self.counters: Counter[str] = Counter()
+        self.histograms = {
+            "lifespan": Histogram(),
+            "scope": Histogram(),
+            "app": Histogram(),
+            "response_size": Histogram(),
+        }
+
+    def record_invocation(
+        self,
+        scope_duration: float,
+        lifespan_duration: float,
+        app_duration: float,
+        lambda_response: Any,
+    ) -> None:
+        self.counters["invocations"] += 1
+        self.histograms["scope"].record(int(scope_duration * 1_000_000))
+        self.histograms["lifespan"].record(int(lifespan_duration * 1_000_000))
+        self.histograms["app"].record(int(app_duration * 1_000_000))
+        # Direct invocations return the body itself rather than an HTTP response
+        if isinstance(lambda_response, dict) and isinstance(
+            lambda_response.get("body"), str
+        ):
+            self.histograms["response_size"].record(len(lambda_response["body"]))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "uptime": time() - self.started_at,
+            "invocations": self.counters["invocations"],
+            "warm": self.counters["invocations"] > 0,
+            "lifespan_supported": list(self.lifespan_supported),
+            "counters": dict(self.counters),
+            "histograms": {
+                name: histogram.to_dict() for name, histogram in self.histograms.items()
+            },
+        }
+
+    def respond(self, interface: HTTPInterface) -> dict[str, Any] | None:
+        if interface.get_scope()["path"] != self.path:
+            return None
+        secret = interface.get_request_header(self.header)
+        if secret is None or not hmac.compare_digest(secret.encode(), self.secret):
+            return None
+        interface.start_response(
+            200,
+            [
+                (b"content-type", b"application/json"),
+                (b"cache-control", b"no-store"),
+            ],
+        )
+        interface.write_body(json.dumps(self.to_dict()).encode())
+        return interface.lambda_response
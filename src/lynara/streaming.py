@@ -0,0 +1,263 @@
+import json
+import logging
+import os
+from base64 import b64encode
+from importlib import import_module
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from lynara.interfaces.function_url import (
+    FunctionURLStreamingInterface,
+    encode_response,
+)
+
+if TYPE_CHECKING:
+    from http.client import HTTPConnection
+
+    from lynara.interfaces.base import HTTPInterface
+    from lynara.runner import Lynara
+
+LOGGER = logging.getLogger(__name__)
+
+RUNTIME_API_PATH = "/2018-06-01/runtime"
+HTTP_INTEGRATION_CONTENT_TYPE = "application/vnd.awslambda.http-integration-response"
+
+
+def make_error(error: BaseException) -> dict[str, Any]:
+    return {"errorMessage": str(error), "errorType": type(error).__name__}
+
+
+class RuntimeResponseStream:
+    """
+    The response of an invocation, posted to the Runtime API in the streaming
+    mode as a chunked request opened on the first write. Writes block, the
+    Runtime API is served on the same host.
+    """
+
+    __slots__ = ("runtime_api", "request_id", "_connection")
+
+    def __init__(self, runtime_api: str, request_id: str) -> None:
+        self.runtime_api = runtime_api
+        self.request_id = request_id
+        self._connection: HTTPConnection | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._connection is not None
+
+    def _open(self) -> "HTTPConnection":
+        from http.client import HTTPConnection
+
+        connection = HTTPConnection(self.runtime_api)
+        connection.putrequest(
+            "POST", f"{RUNTIME_API_PATH}/invocation/{self.request_id}/response"
+        )
+        connection.putheader("Lambda-Runtime-Function-Response-Mode", "streaming")
+        connection.putheader("Transfer-Encoding", "chunked")
+        connection.putheader("Content-Type", HTTP_INTEGRATION_CONTENT_TYPE)
+        connection.putheader(
+            "Trailer",
+            "Lambda-Runtime-Function-Error-Type, Lambda-Runtime-Function-Error-Body",
+        )
+        connection.endheaders()
+        self._connection = connection
+        return connection
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            # An empty chunk would end the body
+            return
+        connection = self._connection or self._open()
+        connection.send(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def close(self, error: BaseException | None = None) -> None:
+        """
+        Ends the response. An `error` raised after the response started is
+        reported in the trailers.
+        """
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        trailers = b""
+        if error is not None:
+            error_body = b64encode(json.dumps(make_error(error)).encode())
+            trailers = (
+                b"Lambda-Runtime-Function-Error-Type: %s\r\n"
+                b"Lambda-Runtime-Function-Error-Body: %s\r\n"
+                % (type(error).__name__.encode(), error_body)
+            )
+        try:
+            connection.send(b"0\r\n" + trailers + b"\r\n")
+            connection.getresponse().read()
+        finally:
+            connection.close()
+
+
+class LocalResponseStream:
+    """A stand-in keeping the streamed chunks, to run streaming locally and in tests."""
+
+    __slots__ = ("chunks", "closed", "error")
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+        self.error: BaseException | None = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self.chunks)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    def write(self, data: bytes) -> None:
+        if data:
+            self.chunks.append(data)
+
+    def close(self, error: BaseException | None = None) -> None:
+        self.closed = True
+        self.error = error
+
+
+class InvocationContext:
+    """The Lambda context of an invocation received by `StreamingRuntime`."""
+
+    __slots__ = (
+        "aws_request_id",
+        "invoked_function_arn",
+        "deadline_ms",
+        "function_name",
+        "function_version",
+        "memory_limit_in_mb",
+        "log_group_name",
+        "log_stream_name",
+        "response_stream",
+    )
+
+    def __init__(
+        self,
+        aws_request_id: str,
+        invoked_function_arn: str | None,
+        deadline_ms: int,
+        response_stream: RuntimeResponseStream | LocalResponseStream,
+    ) -> None:
+        self.aws_request_id = aws_request_id
+        self.invoked_function_arn = invoked_function_arn
+        self.deadline_ms = deadline_ms
+        self.function_name = os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+        self.function_version = os.environ.get("AWS_LAMBDA_FUNCTION_VERSION")
+        self.memory_limit_in_mb = os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE")
+        self.log_group_name = os.environ.get("AWS_LAMBDA_LOG_GROUP_NAME")
+        self.log_stream_name = os.environ.get("AWS_LAMBDA_LOG_STREAM_NAME")
+        self.response_stream = response_stream
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(self.deadline_ms - int(time() * 1000), 0)
+
+
+class StreamingRuntime:
+    """
+    A custom runtime handling invocations with `lynara`, for Function URLs in
+    the `RESPONSE_STREAM` mode, which the managed Python runtimes cannot
+    stream to. Responses the interface did not stream are posted once, in the
+    same streamed shape.
+    """
+
+    def __init__(
+        self,
+        lynara: "Lynara",
+        interface_class: type["HTTPInterface"] = FunctionURLStreamingInterface,
+        *,
+        runtime_api: str | None = None,
+    ) -> None:
+        self.lynara = lynara
+        self.interface_class = interface_class
+        self.runtime_api = runtime_api or os.environ["AWS_LAMBDA_RUNTIME_API"]
+
+    def _request(
+        self,
+        path: str,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[bytes, Any]:
+        from urllib.request import Request, urlopen
+
+        request = Request(
+            f"http://{self.runtime_api}{RUNTIME_API_PATH}{path}",
+            data=data,
+            headers=headers or {},
+            method="POST" if data is not None else "GET",
+        )
+        with urlopen(request) as response:
+            return response.read(), response.headers
+
+    def next_invocation(self) -> tuple[Any, InvocationContext]:
+        body, headers = self._request("/invocation/next")
+        request_id = headers["Lambda-Runtime-Aws-Request-Id"]
+        trace_id = headers.get("Lambda-Runtime-Trace-Id")
+        if trace_id:
+            os.environ["_X_AMZN_TRACE_ID"] = trace_id
+        context = InvocationContext(
+            request_id,
+            headers.get("Lambda-Runtime-Invoked-Function-Arn"),
+            int(headers.get("Lambda-Runtime-Deadline-Ms", 0)),
+            RuntimeResponseStream(self.runtime_api, request_id),
+        )
+        return json.loads(body), context
+
+    def post_response(self, context: InvocationContext, lambda_response: Any) -> None:
+        stream = context.response_stream
+        if stream.started:
+            stream.close()
+        elif isinstance(lambda_response, dict) and "statusCode" in lambda_response:
+            stream.write(encode_response(lambda_response))
+            stream.close()
+        else:
+            self._request(
+                f"/invocation/{context.aws_request_id}/response",
+                json.dumps(lambda_response).encode(),
+            )
+
+    def post_error(self, context: InvocationContext, error: BaseException) -> None:
+        stream = context.response_stream
+        if stream.started:
+            stream.close(error)
+            return
+        self._request(
+            f"/invocation/{context.aws_request_id}/error",
+            json.dumps(make_error(error)).encode(),
+            {"Lambda-Runtime-Function-Error-Type": "Unhandled"},
+        )
+
+    def run_once(self) -> None:
+        event, context = self.next_invocation()
+        try:
+            lambda_response = self.lynara.invoke(event, context, self.interface_class)
+        except Exception as error:
+            LOGGER.exception("Invocation %s failed", context.aws_request_id)
+            self.post_error(context, error)
+        else:
+            self.post_response(context, lambda_response)
+        memory_detector = self.lynara.memory_detector
+        if memory_detector is not None and memory_detector.recycle_requested:
+            self.lynara.recycle()
+
+    def run(self) -> None:
+        while True:
+            self.run_once()
+
+
+def main() -> None:
+    """
+    The runtime's entry point, with `_HANDLER` naming the `Lynara` instance
+    as `module.attribute`. Run it from the function's `bootstrap`.
+    """
+    logging.basicConfig(level=logging.INFO)
+    module_name, _, attribute = os.environ["_HANDLER"].rpartition(".")
+    lynara = getattr(import_module(module_name), attribute)
+    StreamingRuntime(lynara).run()
+
+
+if __name__ == "__main__":
+    main()
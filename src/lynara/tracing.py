@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+from random import getrandbits, random
+from time import time_ns
+from typing import Any, Protocol
+
+from lynara.types import LambdaEvent, Message, Send
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TraceContext:
+    """
+    Trace identity received from upstream, in W3C form (32 and 16 hex chars).
+    `sampled` is None when upstream left the sampling decision to us.
+    """
+
+    __slots__ = ("trace_id", "parent_id", "sampled")
+
+    def __init__(
+        self, trace_id: str, parent_id: str | None = None, sampled: bool | None = None
+    ) -> None:
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+
+
+def parse_traceparent(value: str) -> TraceContext | None:
+    parts = value.strip().split("-")
+    if len(parts) < 4 or parts[0] == "ff":
+        return None
+    _, trace_id, parent_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    try:
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    return TraceContext(trace_id.lower(), parent_id.lower(), sampled)
+
+
+def parse_xray_header(value: str) -> TraceContext | None:
+    fields = {}
+    for field in value.split(";"):
+        key, _, field_value = field.strip().partition("=")
+        fields[key] = field_value
+    root = fields.get("Root", "").split("-")
+    if len(root) != 3 or root[0] != "1" or len(root[1]) + len(root[2]) != 32:
+        return None
+    sampled = {"1": True, "0": False}.get(fields.get("Sampled", ""))
+    return TraceContext(f"{root[1]}{root[2]}".lower(), fields.get("Parent"), sampled)
+
+
+def extract_context(event: LambdaEvent) -> TraceContext | None:
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    context = None
+    if "traceparent" in headers:
+        context = parse_traceparent(headers["traceparent"])
+    if context is None and "x-amzn-trace-id" in headers:
+        context = parse_xray_header(headers["x-amzn-trace-id"])
+    if context is None and "_X_AMZN_TRACE_ID" in os.environ:
+        context = parse_xray_header(os.environ["_X_AMZN_TRACE_ID"])
+    return context
+
+
+def new_span_id() -> str:
+    return f"{getrandbits(64):016x}"
+
+
+class Span:
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None) -> None:
+        self.trace = trace
+        self.name = name
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.start_ns = 0
+        self.end_ns = 0
+
+    def start(self) -> "Span":
+        self.start_ns = time_ns()
+        self.trace.spans.append(self)
+        return self
+
+    def end(self) -> None:
+        self.end_ns = time_ns()
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ns": self.end_ns - self.start_ns,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    Spans of a single invocation. Not sampled traces keep the context for
+    propagation but do not record anything.
+    """
+
+    __slots__ = ("trace_id", "sampled", "root", "spans")
+
+    def __init__(self, context: TraceContext | None, sampled: bool) -> None:
+        self.trace_id = context.trace_id if context else f"{getrandbits(128):032x}"
+        self.sampled = sampled
+        self.spans: list[Span] = []
+        self.root = Span(self, "invocation", context.parent_id if context else None)
+        self.root.start()
+
+    def span(self, name: str, parent: Span | None = None) -> Span | _NoopSpan:
+        if not self.sampled:
+            return NOOP_SPAN
+        return Span(self, name, (parent or self.root).span_id)
+
+    def traceparent(self, span: Span | None = None) -> str:
+        span_id = (span or self.root).span_id
+        return f"00-{self.trace_id}-{span_id}-{'01' if self.sampled else '00'}"
+
+    def wrap_send(self, send: Send, parent: Span | None = None) -> Send:
+        """
+        Records the time from the response start until the last body chunk,
+        the part of `send` turning ASGI messages into the Lambda response.
+        """
+        if not self.sampled:
+            return send
+        span = Span(self, "response", (parent or self.root).span_id)
+
+        async def traced_send(message: Message) -> None:
+            if not span.start_ns:
+                span.start()
+            await send(message)
+            if message["type"] != "http.response.start" and not message.get(
+                "more_body", False
+            ):
+                span.end()
+
+        return traced_send
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+class SpanExporter(Protocol):
+    def export(self, trace: Trace) -> None: ...
+
+
+class LoggingSpanExporter:
+    """Writes every sampled trace as a single JSON log line."""
+
+    def __init__(self, logger: logging.Logger = LOGGER, level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def export(self, trace: Trace) -> None:
+        self.logger.log(self.level, "%s", json.dumps(trace.to_dict()))
+
+
+class Tracer:
+    """
+    Head sampling tracer, the decision is made once when the trace starts.
+    An upstream sampling decision (traceparent or X-Ray `Sampled`) is honored,
+    otherwise `sample_rate` of the invocations are sampled.
+    """
+
+    __slots__ = ("exporter", "sample_rate")
+
+    def __init__(
+        self, exporter: SpanExporter | None = None, sample_rate: float = 1.0
+    ) -> None:
+        self.exporter = exporter or LoggingSpanExporter()
+        self.sample_rate = sample_rate
+
+    def start_trace(self, event: LambdaEvent) -> Trace:
+        context = extract_context(event)
+        if context is not None and context.sampled is not None:
+            sampled = context.sampled
+        else:
+            sampled = random() < self.sample_rate
+        return Trace(context, sampled)
+
+    def finish(self, trace: Trace) -> None:
+        trace.root.end()
+        if not trace.sampled:
+            return
+        try:
+            self.exporter.export(trace)
+        except Exception:
+            LOGGER.exception("Exporting trace %s failed", trace.trace_id)
@@ -8,6 +8,8 @@ Message = MutableMapping[str, Any]
 Receive = Callable[[], Awaitable[Message]]
 Send = Callable[[Message], Awaitable[None]]
 ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+# Accepted from users, frameworks type the scope and the callables more narrowly
+AnyASGIApp = Callable[..., Awaitable[None]]
 
 
 class LifespanMode(str, Enum):
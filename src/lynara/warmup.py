@@ -0,0 +1,194 @@
+import asyncio
+import inspect
+import json
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Protocol
+
+from lynara.types import LambdaEvent
+
+if TYPE_CHECKING:
+    from lynara.runner import Lynara
+
+LOGGER = logging.getLogger(__name__)
+
+# The payloads of popular keep-warm schedules: a plain `{"warmer": true}` and
+# the one of serverless-plugin-warmup
+DEFAULT_PATTERNS: tuple[Mapping[str, Any], ...] = (
+    {"warmer": True},
+    {"source": "serverless-plugin-warmup"},
+)
+# Marks the copies of a fan-out, so they do not fan out themselves
+COPY_KEY = "lynara.warm_up.copy"
+
+Prime = Callable[[], Awaitable[None]]
+
+
+class Invoker(Protocol):
+    async def invoke(
+        self, payload: LambdaEvent, context: Any, copies: int
+    ) -> list[Any]: ...
+
+
+class LambdaInvoker:
+    """
+    Invokes the function synchronously through the Lambda API with boto3,
+    available in the Lambda Python runtimes. The function defaults to the
+    invoked one, the same version or alias included.
+    """
+
+    def __init__(self, function_name: str | None = None, client: Any = None) -> None:
+        self.function_name = function_name
+        # A given client is used as is, its connection pool may be too small
+        self.client = client
+        self._client: Any = None
+        self._pool_size = 0
+
+    def _get_client(self, copies: int) -> Any:
+        if self.client is not None:
+            return self.client
+        if self._client is None or copies > self._pool_size:
+            import boto3  # type: ignore[import-not-found]
+            from botocore.config import Config  # type: ignore[import-not-found]
+
+            # A connection for each copy, boto3 keeps 10 by default
+            self._pool_size = max(copies, 10)
+            self._client = boto3.client(
+                "lambda", config=Config(max_pool_connections=self._pool_size)
+            )
+        return self._client
+
+    def _invoke(self, client: Any, payload: LambdaEvent, context: Any) -> Any:
+        response = client.invoke(
+            FunctionName=self.function_name or context.invoked_function_arn,
+            InvocationType="RequestResponse",
+            Payload=json.dumps(payload).encode(),
+        )
+        if "FunctionError" in response:
+            raise RuntimeError(f"Warm-up copy failed: {response['FunctionError']}")
+        return json.loads(response["Payload"].read())
+
+    async def invoke(
+        self, payload: LambdaEvent, context: Any, copies: int
+    ) -> list[Any]:
+        client = self._get_client(copies)
+        loop = asyncio.get_running_loop()
+        # boto3 blocks, each copy waits for its response in a thread of its
+        # own, the default executor would run them in batches
+        with ThreadPoolExecutor(copies, thread_name_prefix="lynara-warm-up") as pool:
+            return await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, self._invoke, client, payload, context)
+                    for _ in range(copies)
+                ),
+                return_exceptions=True,
+            )
+
+
+class LocalInvoker:
+    """
+    A stand-in for `LambdaInvoker` calling `handler`, sync or async, in the
+    same process and keeping the payloads it was invoked with.
+    """
+
+    def __init__(self, handler: Callable[[LambdaEvent, Any], Any]) -> None:
+        self.handler = handler
+        self.payloads: list[LambdaEvent] = []
+
+    async def _invoke(self, payload: LambdaEvent, context: Any) -> Any:
+        self.payloads.append(payload)
+        result = self.handler(payload, context)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def invoke(
+        self, payload: LambdaEvent, context: Any, copies: int
+    ) -> list[Any]:
+        return await asyncio.gather(
+            *(self._invoke(payload, context) for _ in range(copies)),
+            return_exceptions=True,
+        )
+
+
+class WarmUp:
+    """
+    Answers keep-warm pings without building an interface or calling the app.
+    An event is a ping when it contains every item of one of the `patterns`.
+
+    A ping still warms the container up: through `Lynara.handle` the apps'
+    lifespans are started and loop-bound resources revalidated if needed,
+    then `prime` is awaited.
+
+    A ping with `"concurrency": N` keeps N sandboxes warm: it invokes N - 1
+    copies of itself at once through the `invoker` and waits for them. Each
+    copy holds its sandbox for `delay` seconds, so that the copies are not
+    served by one sandbox after another. N is capped at `max_concurrency`.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[Mapping[str, Any]] = DEFAULT_PATTERNS,
+        *,
+        prime: Prime | None = None,
+        invoker: Invoker | None = None,
+        concurrency_key: str = "concurrency",
+        delay: float = 0.075,
+        max_concurrency: int = 100,
+    ) -> None:
+        self.patterns = [dict(pattern) for pattern in patterns]
+        self.prime = prime
+        self.invoker = invoker
+        self.concurrency_key = concurrency_key
+        self.delay = delay
+        self.max_concurrency = max_concurrency
+
+    def matches(self, event: Any) -> bool:
+        if not isinstance(event, dict):
+            return False
+        return any(
+            all(key in event and event[key] == value for key, value in items.items())
+            for items in self.patterns
+        )
+
+    async def fan_out(self, event: LambdaEvent, concurrency: int, context) -> int:
+        if self.invoker is None:
+            raise ValueError("Fanning a warm-up out needs an invoker")
+        payload = {**event, self.concurrency_key: 1, COPY_KEY: True}
+        results = await self.invoker.invoke(payload, context, concurrency - 1)
+        failed = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                LOGGER.warning("Warm-up copy failed: %s", result)
+                failed += 1
+        return failed
+
+    def get_concurrency(self, event: LambdaEvent) -> int:
+        value = event.get(self.concurrency_key)
+        try:
+            concurrency = int(value or 1)
+        except (TypeError, ValueError):
+            LOGGER.warning("Invalid warm-up concurrency %r, warming one up", value)
+            return 1
+        if concurrency > self.max_concurrency:
+            LOGGER.warning(
+                "Warm-up concurrency %d capped at %d", concurrency, self.max_concurrency
+            )
+        return min(max(concurrency, 1), self.max_concurrency)
+
+    async def respond(self, lynara: "Lynara", event: LambdaEvent, context) -> dict:
+        await lynara.ensure_started()
+        await lynara.resources.before_invocation()
+        lynara.resources.after_invocation()
+        if self.prime is not None:
+            await self.prime()
+
+        concurrency = self.get_concurrency(event)
+        failed = 0
+        if event.get(COPY_KEY):
+            await asyncio.sleep(self.delay)
+        elif concurrency > 1:
+            failed = await self.fan_out(event, concurrency, context)
+        LOGGER.debug("Warmed up, %d copies failed", failed)
+        return {"warm_up": True, "concurrency": concurrency, "failed": failed}
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from multiprocessing.connection import Connection
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from lynara.interfaces.base import HTTPInterface
+from lynara.types import LambdaEvent
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from lynara.runner import Lynara
+
+LOGGER = logging.getLogger(__name__)
+
+CONTEXT_ATTRIBUTES = (
+    "function_name",
+    "function_version",
+    "invoked_function_arn",
+    "memory_limit_in_mb",
+    "aws_request_id",
+    "log_group_name",
+    "log_stream_name",
+)
+
+Job = tuple[LambdaEvent, Any, type[HTTPInterface], str | None]
+
+
+class WorkerError(Exception):
+    """An exception raised in a worker that could not be sent back as is."""
+
+
+def snapshot_context(context) -> SimpleNamespace | None:
+    if context is None:
+        return None
+    return SimpleNamespace(
+        **{name: getattr(context, name, None) for name in CONTEXT_ATTRIBUTES}
+    )
+
+
+def serve(connection: Connection, lynara: "Lynara") -> None:
+    loop = lynara.loop_factory()
+    asyncio.set_event_loop(loop)
+    while True:
+        try:
+            job: Job | None = connection.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        event, context, interface_class, base_path = job
+        try:
+            interface = lynara.create_interface(
+                interface_class, event, context, base_path
+            )
+            result: tuple[bool, Any] = (True, loop.run_until_complete(interface()))
+        except Exception as exc:
+            result = (False, exc)
+        try:
+            connection.send(result)
+        except Exception:
+            connection.send((False, WorkerError(repr(result[1]))))
+    connection.close()
+
+
+def worker_main(connection: Connection, lynara: "Lynara") -> None:
+    # Forked from inside the parent's running loop, which the main thread is
+    # still running here. A thread of its own runs the worker's loop instead.
+    thread = threading.Thread(
+        target=serve, args=(connection, lynara), name="lynara-worker"
+    )
+    thread.start()
+    thread.join()
+
+
+class Worker:
+    __slots__ = ("process", "connection")
+
+    def __init__(self, process: "BaseProcess", connection: Connection) -> None:
+        self.process = process
+        self.connection = connection
+
+    async def call(self, job: Job) -> tuple[bool, Any]:
+        self.connection.send(job)
+        # Waits on the pipe in the loop, threads would make later forks unsafe
+        loop = asyncio.get_running_loop()
+        readable: asyncio.Future[None] = loop.create_future()
+        fd = self.connection.fileno()
+
+        def on_readable() -> None:
+            if not readable.done():
+                readable.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+        return self.connection.recv()
+
+
+class WorkerPool:
+    """
+    Worker processes forked from the container once the lifespan has started,
+    so they inherit the loaded and initialized app. CPU-bound invocations are
+    sent to them as serialized events and their Lambda responses come back,
+    leaving the event loop free and using the other vCPUs.
+
+    Invocations are offloaded when their path starts with one of `paths`, or
+    when `predicate(event)` is true to offload whole events. Interface classes
+    are sent by reference and have to be importable.
+
+    Processes talk over pipes rather than `multiprocessing` queues, which need
+    `/dev/shm` that Lambda does not provide.
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        paths: Iterable[str] = (),
+        predicate: Callable[[LambdaEvent], bool] | None = None,
+    ) -> None:
+        self.processes = processes or os.cpu_count() or 1
+        self.paths = tuple(paths)
+        self.predicate = predicate
+        self._workers: list[Worker] = []
+        self._idle: deque[Worker] = deque()
+        self._waiters: deque[asyncio.Future[Worker]] = deque()
+        self._lynara: Lynara | None = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def _spawn(self, lynara: "Lynara") -> Worker:
+        context = multiprocessing.get_context("fork")
+        parent_connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=worker_main,
+            args=(child_connection, lynara),
+            name="lynara-worker",
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        worker = Worker(process, parent_connection)
+        self._workers.append(worker)
+        return worker
+
+    def start(self, lynara: "Lynara") -> None:
+        self._lynara = lynara
+        for _ in range(self.processes):
+            self._idle.append(self._spawn(lynara))
+        LOGGER.debug("Started %d worker processes", self.processes)
+
+    def _replace(self, worker: Worker) -> None:
+        """
+        Terminates a worker whose pipe can no longer be trusted, the answer of
+        a cancelled job would be read as the next one's, and forks another.
+        """
+        if worker not in self._workers:
+            # Closed meanwhile
+            return
+        self._workers.remove(worker)
+        worker.connection.close()
+        worker.process.kill()
+        worker.process.join()
+        if self._lynara is not None:
+            self._release(self._spawn(self._lynara))
+
+    def close(self) -> None:
+        workers, self._workers = self._workers, []
+        self._idle.clear()
+        self._lynara = None
+        for worker in workers:
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+            worker.connection.close()
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+
+    def should_offload(self, interface: HTTPInterface) -> bool:
+        if self.predicate is not None and self.predicate(interface.event):
+            return True
+        return bool(self.paths) and interface.get_scope()["path"].startswith(self.paths)
+
+    async def _acquire(self) -> Worker:
+        if self._idle:
+            return self._idle.popleft()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return await waiter
+
+    def _release(self, worker: Worker) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(worker)
+                return
+        self._idle.append(worker)
+
+    async def submit(
+        self,
+        event: LambdaEvent,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ) -> Any:
+        worker = await self._acquire()
+        job = (event, snapshot_context(context), interface_class, base_path)
+        try:
+            ok, result = await worker.call(job)
+        except asyncio.CancelledError:
+            # The worker is still running the job
+            self._replace(worker)
+            raise
+        except (EOFError, OSError) as exc:
+            self._replace(worker)
+            raise WorkerError(f"Worker {worker.process.pid} died") from exc
+        except Exception:
+            # The job could not be pickled, the worker never got it
+            self._release(worker)
+            raise
+        self._release(worker)
+        if not ok:
+            raise result
+        return result
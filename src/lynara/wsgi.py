@@ -0,0 +1,114 @@
+import logging
+import sys
+from collections.abc import Callable, Iterable
+from io import BytesIO
+from time import time
+from typing import Any
+
+from lynara.interfaces.base import HTTPInterface
+from lynara.types import LambdaEvent, Scope
+
+LOGGER = logging.getLogger(__name__)
+
+WSGIEnviron = dict[str, Any]
+StartResponse = Callable[..., Callable[[bytes], object]]
+WSGIApp = Callable[[WSGIEnviron, StartResponse], Iterable[bytes]]
+
+
+def build_environ(scope: Scope, body: bytes) -> WSGIEnviron:
+    server_name, server_port = scope["server"]
+    client = scope.get("client") or ("", 0)
+    environ: WSGIEnviron = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope["root_path"].encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": client[0] or "",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope["scheme"],
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_key, raw_value in scope["headers"]:
+        key = raw_key.decode("latin-1").upper().replace("-", "_")
+        if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = f"HTTP_{key}"
+        value = raw_value.decode("latin-1")
+        if key in environ:
+            value = f"{environ[key]},{value}"
+        environ[key] = value
+
+    if body and "CONTENT_LENGTH" not in environ:
+        environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+class LynaraWSGI:
+    """
+    Runs a WSGI application directly on the handler thread, no event loop
+    is created and no lifespan protocol is involved.
+    """
+
+    def __init__(self, app: WSGIApp):
+        self.app = app
+
+    def run(
+        self,
+        event: LambdaEvent,
+        context,
+        interface_class: type[HTTPInterface],
+        base_path: str | None = None,
+    ):
+        start_time = time()
+        # Interfaces only use the app when awaited, WSGI apps are called here
+        interface = interface_class(
+            app=self.app,  # type: ignore[arg-type]
+            event=event,
+            context=context,
+            base_path=base_path,
+        )
+        request = interface.pop_request()
+        environ = build_environ(interface.scope, request["body"] if request else b"")
+        response_started = False
+
+        def write(body: bytes) -> None:
+            interface.write_body(body, more_body=True)
+
+        def start_response(status: str, headers, exc_info=None):
+            nonlocal response_started
+            if exc_info is not None and response_started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response_started = True
+            interface.start_response(
+                int(status.split(" ", 1)[0]),
+                [
+                    (key.encode("latin-1"), value.encode("latin-1"))
+                    for key, value in headers
+                ],
+            )
+            return write
+
+        app_start_time = time()
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    interface.write_body(chunk, more_body=True)
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        interface.write_body(b"")
+
+        LOGGER.info(
+            "Lynara execution time: %.5f s, out of which application time: %.5f s",
+            (time() - start_time),
+            (time() - app_start_time),
+        )
+        return interface.lambda_response
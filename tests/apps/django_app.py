@@ -1,13 +1,27 @@
+from pathlib import Path
+from tempfile import gettempdir
+
 from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
 from django.http import HttpResponse
 from django.urls import path
 
+from lynara.contrib.django import get_asgi_application as get_lynara_asgi_application
+
 settings.configure(
     DEBUG=True,
     SECRET_KEY="thisisthesecretkey",
     ALLOWED_HOSTS=["*"],
     ROOT_URLCONF=__name__,
+    DATABASES={
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            # In-memory databases are never closed, which the tests need
+            "NAME": str(Path(gettempdir()) / "lynara-tests.sqlite3"),
+        }
+    },
 )
 
 
@@ -15,11 +29,20 @@ def index(request):
     return HttpResponse("Hello, world!")
 
 
+def database_connection(request):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return HttpResponse(str(id(connection.connection)))
+
+
 urlpatterns = [
     path("django/", index),
+    path("django/connection/", database_connection),
 ]
 
 django_asgi_app = get_asgi_application()
+django_wsgi_app = get_wsgi_application()
+lynara_django_app = get_lynara_asgi_application(warm_up_paths=["/django/"])
 
 
 if __name__ == "__main__":
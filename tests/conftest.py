@@ -7,7 +7,7 @@ from unittest.mock import Mock
 
 import pytest
 
-from tests.apps.django_app import django_asgi_app
+from tests.apps.django_app import django_asgi_app, django_wsgi_app
 from tests.apps.fastapi_app import get_fast_api_app
 
 BASE_PATH = Path(__file__).absolute().parent
@@ -18,6 +18,11 @@ def django_app():
     return django_asgi_app
 
 
+@pytest.fixture()
+def django_wsgi():
+    return django_wsgi_app
+
+
 class AsyncContextManager:
     async def __aenter__(self):
         return self
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+from django.db.backends.signals import connection_created
+
+from lynara import DirectInvocationInterface, Lynara
+from lynara.contrib.django import PERSISTENT_CONNECTIONS
+from lynara.types import LifespanMode
+from tests.apps.django_app import django_asgi_app, lynara_django_app
+
+CONNECTION_EVENT = {"method": "GET", "path": "/django/connection/"}
+
+
+@contextmanager
+def keep_connections():
+    """
+    Keeps the database connections opened meanwhile alive, so a closed one
+    cannot pass its id() on to the next.
+    """
+    connections = []
+
+    def receiver(sender, connection, **kwargs):
+        connections.append(connection.connection)
+
+    connection_created.connect(receiver, weak=False)
+    try:
+        yield connections
+    finally:
+        connection_created.disconnect(receiver)
+
+
+@pytest.fixture()
+def lynara():
+    lynara = Lynara(lynara_django_app, lifespan_mode=LifespanMode.OFF)
+    lynara_django_app.register_health_checks(lynara.resources)
+    yield lynara
+    lynara.close()
+
+
+def test_connection_is_kept_across_invocations(lynara):
+    with keep_connections():
+        connection_ids = {
+            lynara.handle(CONNECTION_EVENT, None, DirectInvocationInterface)
+            for _ in range(3)
+        }
+
+    assert len(connection_ids) == 1
+
+
+def test_plain_handler_connects_per_request():
+    lynara = Lynara(django_asgi_app, lifespan_mode=LifespanMode.OFF)
+    try:
+        with keep_connections() as connections:
+            connection_ids = {
+                lynara.handle(CONNECTION_EVENT, None, DirectInvocationInterface)
+                for _ in range(3)
+            }
+    finally:
+        lynara.close()
+
+    assert len(connection_ids) == 3
+    assert connection_ids == {str(id(connection)) for connection in connections}
+
+
+def test_dead_connection_is_replaced_after_thaw(lynara):
+    lynara.resources.thaw_threshold = 0
+    with keep_connections():
+        first_id = lynara.handle(CONNECTION_EVENT, None, DirectInvocationInterface)
+        connection = PERSISTENT_CONNECTIONS.connections["default"]
+
+        with patch.object(connection, "is_usable", return_value=False):
+            second_id = lynara.handle(CONNECTION_EVENT, None, DirectInvocationInterface)
+
+    assert second_id != first_id
+
+
+def test_warm_up_populates_the_resolver():
+    from django.urls import get_resolver
+
+    assert get_resolver()._populated
+
+
+def test_lifespan_is_not_supported(lynara):
+    lynara.lifespan_mode = LifespanMode.ON
+
+    with pytest.raises(ValueError, match="not lifespan"):
+        lynara.handle(
+            {"method": "GET", "path": "/django/"}, None, DirectInvocationInterface
+        )
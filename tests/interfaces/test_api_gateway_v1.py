@@ -8,7 +8,7 @@ async def test_init_no_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"",
         "more_body": False,
@@ -23,7 +23,7 @@ async def test_init_non_base64_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"Hello, world!",
         "more_body": False,
@@ -38,7 +38,7 @@ async def test_init_bytes_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"Hello, world!",
         "more_body": False,
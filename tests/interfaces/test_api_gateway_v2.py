@@ -1,3 +1,4 @@
+import asyncio
 from base64 import b64decode
 
 import pytest
@@ -13,7 +14,7 @@ async def test_init_no_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"",
         "more_body": False,
@@ -28,7 +29,7 @@ async def test_init_non_base64_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"Hello, world!",
         "more_body": False,
@@ -43,7 +44,7 @@ async def test_init_bytes_body(fastapi_app, lambda_events):
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
 
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.request",
         "body": b"Hello, world!",
         "more_body": False,
@@ -125,7 +126,7 @@ async def test_send_response_body(fastapi_app, lambda_events):
 async def test_send_response_body_more_body(fastapi_app, lambda_events):
     lambda_event = lambda_events["api_gw_v2"]
     interface = APIGatewayProxyEventV2Interface(fastapi_app, lambda_event, context=None)
-    await interface.app_queue.get()
+    await interface.receive()
 
     await interface.send(
         {
@@ -135,7 +136,7 @@ async def test_send_response_body_more_body(fastapi_app, lambda_events):
         }
     )
     assert interface.lambda_response["body"] == '{"message":"Hello, world!"}'
-    assert interface.app_queue.qsize() == 0
+    assert not interface.is_response_completed
 
 
 async def test_full_response(fastapi_app, lambda_events):
@@ -144,7 +145,7 @@ async def test_full_response(fastapi_app, lambda_events):
     interface = APIGatewayProxyEventV2Interface(
         fastapi_app, lambda_event, context=None, base_path="/path/to"
     )
-    await interface.app_queue.get()
+    await interface.receive()
 
     await interface.send(
         {
@@ -171,7 +172,7 @@ async def test_full_response(fastapi_app, lambda_events):
     assert response["headers"]["content-type"] == "application/json"
     assert response["body"] == '{"Hello":"World"}'
     assert response["cookies"] == ["cookie1=value1", "cookie2=value2"]
-    assert await interface.app_queue.get() == {
+    assert await interface.receive() == {
         "type": "http.disconnect",
     }
 
@@ -186,3 +187,25 @@ async def test_send_unknown_type(fastapi_app, lambda_events):
                 "type": "unknown.type",
             }
         )
+
+
+async def test_receive_waits_for_disconnect(fastapi_app, lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    interface = APIGatewayProxyEventV2Interface(fastapi_app, lambda_event, context=None)
+    await interface.receive()
+
+    disconnect = asyncio.create_task(interface.receive())
+    await asyncio.sleep(0)
+    assert not disconnect.done()
+
+    await interface.send({"type": "http.response.start", "status": 200})
+    await interface.send({"type": "http.response.body", "body": b""})
+
+    assert await disconnect == {"type": "http.disconnect"}
+
+
+def test_interface_is_slotted(fastapi_app, lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    interface = APIGatewayProxyEventV2Interface(fastapi_app, lambda_event, context=None)
+
+    assert not hasattr(interface, "__dict__")
@@ -0,0 +1,130 @@
+import pytest
+
+from lynara import APIGatewayProxyEventV1Interface, APIGatewayProxyEventV2Interface
+from lynara.interfaces.conditional import etag_matches, make_etag
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+
+BODY = b'{"items": []}'
+LAST_MODIFIED = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+
+def make_app(status=200, headers=()):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), *headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": BODY})
+
+    return app
+
+
+def get_event(lambda_events, headers, method="GET"):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = method
+    lambda_event["headers"] = headers
+    return lambda_event
+
+
+async def run(app, event, interface_class=APIGatewayProxyEventV2Interface):
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, conditional_requests=True)
+    return await lynara.run(event, None, interface_class)
+
+
+async def test_etag_is_added(lambda_events):
+    response = await run(make_app(), get_event(lambda_events, {}))
+
+    assert response["statusCode"] == 200
+    assert response["body"] == BODY.decode()
+    assert response["headers"]["etag"] == make_etag(BODY)
+
+
+async def test_matching_etag_returns_304(lambda_events):
+    event = get_event(lambda_events, {"if-none-match": make_etag(BODY)})
+
+    response = await run(make_app(), event)
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+    assert response["headers"] == {"etag": make_etag(BODY)}
+
+
+async def test_other_etag_returns_body(lambda_events):
+    event = get_event(lambda_events, {"if-none-match": '"stale"'})
+
+    response = await run(make_app(), event)
+
+    assert response["statusCode"] == 200
+    assert response["body"] == BODY.decode()
+
+
+async def test_app_etag_is_honored(lambda_events):
+    app = make_app(headers=[(b"ETag", b'W/"v2"')])
+    event = get_event(lambda_events, {"if-none-match": '"v1", W/"v2"'})
+
+    response = await run(app, event)
+
+    assert response["statusCode"] == 304
+    assert response["headers"] == {"ETag": 'W/"v2"'}
+
+
+async def test_last_modified_is_honored(lambda_events):
+    app = make_app(headers=[(b"last-modified", LAST_MODIFIED.encode())])
+    event = get_event(lambda_events, {"if-modified-since": LAST_MODIFIED})
+
+    response = await run(app, event)
+
+    assert response["statusCode"] == 304
+
+
+async def test_if_none_match_takes_precedence(lambda_events):
+    app = make_app(headers=[(b"last-modified", LAST_MODIFIED.encode())])
+    event = get_event(
+        lambda_events,
+        {"if-none-match": '"stale"', "if-modified-since": LAST_MODIFIED},
+    )
+
+    response = await run(app, event)
+
+    assert response["statusCode"] == 200
+
+
+@pytest.mark.parametrize(("method", "status"), [("POST", 200), ("GET", 404)])
+async def test_only_successful_reads_are_conditional(lambda_events, method, status):
+    event = get_event(lambda_events, {"if-none-match": "*"}, method=method)
+
+    response = await run(make_app(status=status), event)
+
+    assert response["statusCode"] == status
+    assert "etag" not in response["headers"]
+
+
+async def test_rest_api(lambda_events):
+    event = lambda_events["api_gw_v1"]
+    event["httpMethod"] = "GET"
+    event["headers"]["If-None-Match"] = make_etag(BODY)
+
+    response = await run(make_app(), event, APIGatewayProxyEventV1Interface)
+
+    assert response["statusCode"] == 304
+    assert response["headers"] == {"etag": make_etag(BODY)}
+
+
+async def test_disabled_by_default(lambda_events):
+    event = get_event(lambda_events, {"if-none-match": make_etag(BODY)})
+    lynara = Lynara(make_app(), lifespan_mode=LifespanMode.OFF)
+
+    response = await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+
+    assert response["statusCode"] == 200
+    assert "etag" not in response["headers"]
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', "*")
+    assert etag_matches('W/"a"', '"b", "a"')
+    assert not etag_matches('"a"', '"b"')
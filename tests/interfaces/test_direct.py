@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from lynara import DirectInvocationInterface, Lynara
+from lynara.interfaces.direct import DirectInvocationError
+
+
+async def echo_app(scope, receive, send):
+    message = await receive()
+    status = int(dict(scope["headers"]).get(b"x-status", b"200"))
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send(
+        {
+            "type": "http.response.body",
+            "body": json.dumps(
+                {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope["query_string"].decode(),
+                    "headers": [[k.decode(), v.decode()] for k, v in scope["headers"]],
+                    "body": message["body"].decode(),
+                }
+            ).encode(),
+        }
+    )
+
+
+def test_match(lambda_events):
+    assert DirectInvocationInterface.match({"method": "GET", "path": "/"}) is True
+    assert DirectInvocationInterface.match(lambda_events["api_gw_v1"]) is False
+    assert DirectInvocationInterface.match(lambda_events["api_gw_v2"]) is False
+
+
+async def test_json_envelope():
+    event = {
+        "method": "post",
+        "path": "/items",
+        "query": {"page": "2", "tag": ["a", "b"]},
+        "headers": {"X-Tenant": "acme"},
+        "body": {"name": "Ana"},
+    }
+    response = await DirectInvocationInterface(echo_app, event, None)()
+
+    assert response == {
+        "method": "POST",
+        "path": "/items",
+        "query_string": "page=2&tag=a&tag=b",
+        "headers": [["x-tenant", "acme"], ["content-type", "application/json"]],
+        "body": '{"name": "Ana"}',
+    }
+
+
+async def test_minimal_envelope():
+    event = {"method": "GET", "path": "/items", "query": "page=2", "body": "raw"}
+    response = await DirectInvocationInterface(echo_app, event, None)()
+
+    assert response["query_string"] == "page=2"
+    assert response["headers"] == []
+    assert response["body"] == "raw"
+
+
+async def test_error_status():
+    event = {"method": "GET", "path": "/", "headers": {"x-status": "404"}}
+
+    with pytest.raises(DirectInvocationError) as cm:
+        await DirectInvocationInterface(echo_app, event, None)()
+
+    assert cm.value.status == 404
+    assert cm.value.body["path"] == "/"
+
+
+async def test_fastapi_app(fastapi_app):
+    lynara = Lynara(fastapi_app, lifespan_mode="off")
+    response = await lynara.run(
+        {"method": "GET", "path": "/fastapi/"}, None, DirectInvocationInterface
+    )
+
+    assert response == "Hello, world!"
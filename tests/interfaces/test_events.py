@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+from lynara import EventInterface, EventRule, Lynara
+
+SCHEDULED_EVENT = {
+    "version": "0",
+    "id": "53dc4d37-cffa-4f76-80c9-8b7d4a4d2eaa",
+    "detail-type": "Scheduled Event",
+    "source": "aws.events",
+    "time": "2024-01-01T00:00:00Z",
+    "region": "us-east-1",
+    "resources": ["arn:aws:events:us-east-1:123456789012:rule/cleanup"],
+    "detail": {},
+}
+S3_EVENT = {
+    "Records": [
+        {
+            "eventSource": "aws:s3",
+            "eventName": "ObjectCreated:Put",
+            "s3": {"bucket": {"name": "uploads"}, "object": {"key": "a.png"}},
+        }
+    ]
+}
+SNS_EVENT = {
+    "Records": [
+        {
+            "EventSource": "aws:sns",
+            "Sns": {
+                "TopicArn": "arn:aws:sns:us-east-1:123456789012:orders",
+                "Message": "{}",
+            },
+        }
+    ]
+}
+
+
+async def echo_app(scope, receive, send):
+    message = await receive()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send(
+        {
+            "type": "http.response.body",
+            "body": json.dumps(
+                {
+                    "route": f"{scope['method']} {scope['path']}",
+                    "event": json.loads(message["body"]),
+                }
+            ).encode(),
+        }
+    )
+
+
+Events = EventInterface.with_rules(
+    EventRule.schedule("/jobs/cleanup"),
+    EventRule("/events/orders", source="shop.orders", detail_type="OrderPlaced"),
+    EventRule("/events/shop", "PUT", source="shop.orders"),
+    EventRule("/uploads", bucket="uploads"),
+    EventRule("/orders", topic="arn:aws:sns:us-east-1:123456789012:orders"),
+)
+
+
+@pytest.mark.parametrize(
+    ("event", "route"),
+    [
+        (SCHEDULED_EVENT, "POST /jobs/cleanup"),
+        (
+            {"source": "shop.orders", "detail-type": "OrderPlaced", "detail": {}},
+            "POST /events/orders",
+        ),
+        (
+            {"source": "shop.orders", "detail-type": "OrderShipped", "detail": {}},
+            "PUT /events/shop",
+        ),
+        (S3_EVENT, "POST /uploads"),
+        (SNS_EVENT, "POST /orders"),
+    ],
+)
+async def test_dispatch(event, route):
+    lynara = Lynara(echo_app, lifespan_mode="off")
+    response = await lynara.run(event, None, Events)
+
+    assert response == {"route": route, "event": event}
+
+
+def test_match(lambda_events):
+    assert Events.match(SCHEDULED_EVENT) is True
+    assert Events.match({"source": "other", "detail-type": "Scheduled Event"}) is False
+    assert Events.match(lambda_events["api_gw_v2"]) is False
+    assert EventInterface.match(SCHEDULED_EVENT) is False
+
+
+Schedules = EventInterface.with_rules(
+    EventRule.schedule("/jobs/cleanup", rule="cleanup"),
+    EventRule.schedule(
+        "/jobs/report", rule="arn:aws:events:us-east-1:123456789012:rule/report"
+    ),
+    EventRule.schedule("/jobs/other"),
+)
+
+
+@pytest.mark.parametrize(
+    ("resources", "path"),
+    [
+        (["arn:aws:events:us-east-1:123456789012:rule/cleanup"], "/jobs/cleanup"),
+        (["arn:aws:events:us-east-1:123456789012:rule/report"], "/jobs/report"),
+        (["arn:aws:events:us-east-1:123456789012:rule/bus/report"], "/jobs/report"),
+        (["arn:aws:events:us-east-1:123456789012:rule/nightly"], "/jobs/other"),
+        ([], "/jobs/other"),
+    ],
+)
+def test_schedules_by_rule(resources, path):
+    rule = Schedules.rules.resolve({**SCHEDULED_EVENT, "resources": resources})
+
+    assert rule is not None
+    assert rule.path == path
+
+
+def test_named_schedule_without_fallback():
+    interface_class = EventInterface.with_rules(
+        EventRule.schedule("/jobs/cleanup", rule="cleanup")
+    )
+    nightly = {
+        **SCHEDULED_EVENT,
+        "resources": ["arn:aws:events:us-east-1:123456789012:rule/nightly"],
+    }
+
+    assert interface_class.match(SCHEDULED_EVENT) is True
+    assert interface_class.match(nightly) is False
+
+
+def test_no_rule_matches():
+    with pytest.raises(LookupError):
+        Events(echo_app, {"Records": [{"eventSource": "aws:sqs"}]}, None)
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError):
+        EventRule("/jobs")
+    with pytest.raises(ValueError):
+        EventInterface.with_rules(
+            EventRule("/a", bucket="uploads"), EventRule("/b", bucket="uploads")
+        )
+    with pytest.raises(ValueError):
+        EventInterface.with_rules(
+            EventRule.schedule("/a", rule="cleanup"),
+            EventRule.schedule("/b", rule="cleanup"),
+        )
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from lynara import FunctionURLStreamingInterface
+from lynara.interfaces.function_url import (
+    PRELUDE_DELIMITER,
+    encode_response,
+)
+from lynara.runner import Lynara
+from lynara.streaming import LocalResponseStream
+from lynara.types import LifespanMode
+
+
+def make_app(headers=(), chunks=(b"Hello, ", b"world!"), delay=0.0):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await asyncio.sleep(delay)
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+def split_prelude(data):
+    prelude, _, body = data.partition(PRELUDE_DELIMITER)
+    return json.loads(prelude), body
+
+
+async def run(app, lambda_events, interface_class=FunctionURLStreamingInterface):
+    stream = LocalResponseStream()
+    context = SimpleNamespace(response_stream=stream)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF)
+    response = await lynara.run(lambda_events["api_gw_v2"], context, interface_class)
+    return response, stream
+
+
+async def test_small_response_buffered(lambda_events):
+    response, stream = await run(make_app(), lambda_events)
+
+    assert stream.chunks == []
+    assert response["body"] == "Hello, world!"
+    prelude, body = split_prelude(encode_response(response))
+    assert prelude == {"statusCode": 200, "headers": {}, "cookies": []}
+    assert body == b"Hello, world!"
+
+
+async def test_streams_past_buffer_size(lambda_events):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(size=8)
+
+    response, stream = await run(
+        make_app(chunks=(b"12345", b"67890", b"abc")), lambda_events, interface_class
+    )
+
+    prelude, body = split_prelude(stream.chunks[0])
+    assert prelude["statusCode"] == 200
+    assert body == b"1234567890"
+    assert stream.chunks[1:] == [b"abc"]
+    assert response["body"] == ""
+
+
+async def test_streams_past_buffer_time(lambda_events):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(seconds=0.01)
+
+    _, stream = await run(
+        make_app(chunks=(b"first", b"second"), delay=0.05),
+        lambda_events,
+        interface_class,
+    )
+
+    assert split_prelude(stream.chunks[0])[1] == b"first"
+    assert stream.chunks[1:] == [b"second"]
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        [(b"content-type", b"text/event-stream")],
+        [(b"content-length", b"1000000")],
+    ],
+)
+async def test_streams_from_response_start(lambda_events, headers):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        assert stream.started
+        await send({"type": "http.response.body", "body": b"data"})
+
+    stream = LocalResponseStream()
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF)
+
+    await lynara.run(
+        lambda_events["api_gw_v2"],
+        SimpleNamespace(response_stream=stream),
+        FunctionURLStreamingInterface,
+    )
+
+    assert split_prelude(stream.chunks[0])[1] == b""
+    assert stream.chunks[1:] == [b"data"]
+
+
+async def test_small_content_length_buffered(lambda_events):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(seconds=0.01)
+
+    response, stream = await run(
+        make_app([(b"content-length", b"11")], (b"first", b"second"), delay=0.05),
+        lambda_events,
+        interface_class,
+    )
+
+    assert stream.chunks == []
+    assert response["body"] == "firstsecond"
+
+
+@pytest.mark.parametrize("size", [1024, 4])
+async def test_binary_body(lambda_events, size):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(size=size)
+    png = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+    response, stream = await run(
+        make_app([(b"content-type", b"image/png")], (png[:5], png[5:])),
+        lambda_events,
+        interface_class,
+    )
+
+    assert stream.started is (size < len(png))
+    if stream.started:
+        assert split_prelude(stream.body)[1] == png
+    else:
+        assert response["isBase64Encoded"] is True
+        assert split_prelude(encode_response(response))[1] == png
+
+
+@pytest.mark.parametrize("size", [1024, 2])
+async def test_character_split_across_chunks(lambda_events, size):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(size=size)
+    text = "Olá, Zoë".encode()
+
+    response, stream = await run(
+        make_app(chunks=(text[:3], text[3:])), lambda_events, interface_class
+    )
+
+    assert stream.started is (size < len(text))
+    if stream.started:
+        assert split_prelude(stream.body)[1] == text
+    else:
+        assert response["body"] == "Olá, Zoë"
+        assert response["isBase64Encoded"] is False
+
+
+async def test_large_file_streamed(lambda_events, tmp_path):
+    path = tmp_path / "export.bin"
+    path.write_bytes(bytes(range(256)) * 1024)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.pathsend", "path": str(path)})
+
+    response, stream = await run(app, lambda_events)
+
+    assert split_prelude(stream.body)[1] == path.read_bytes()
+    assert response["body"] == ""
+
+
+async def test_buffered_without_stream(lambda_events):
+    interface_class = FunctionURLStreamingInterface.with_thresholds(size=1)
+    lynara = Lynara(make_app(), lifespan_mode=LifespanMode.OFF)
+
+    response = await lynara.run(lambda_events["api_gw_v2"], None, interface_class)
+
+    assert response["body"] == "Hello, world!"
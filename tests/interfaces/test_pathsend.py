@@ -0,0 +1,100 @@
+from base64 import b64decode
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import FileResponse
+from starlette.routing import Route
+
+from lynara import APIGatewayProxyEventV2Interface, DirectInvocationInterface
+from lynara.interfaces import base
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+
+CONTENT = bytes(range(256)) * 10
+
+
+@pytest.fixture()
+def file_path(tmp_path):
+    path = tmp_path / "report.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.fixture()
+def lynara(file_path):
+    async def download(request):
+        return FileResponse(file_path)
+
+    app = Starlette(routes=[Route("/path/to/resource", download)])
+    return Lynara(app, lifespan_mode=LifespanMode.OFF)
+
+
+async def test_extension_is_advertised(lambda_events):
+    interface = APIGatewayProxyEventV2Interface(
+        None, lambda_events["api_gw_v2"], context=None
+    )
+
+    assert "http.response.pathsend" in interface.scope["extensions"]
+
+
+async def test_file_response(lynara, lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+
+    response = await lynara.run(lambda_event, None, APIGatewayProxyEventV2Interface)
+
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert b64decode(response["body"]) == CONTENT
+    assert response["headers"]["content-length"] == str(len(CONTENT))
+
+
+async def test_empty_file(lynara, file_path, lambda_events):
+    file_path.write_bytes(b"")
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+
+    response = await lynara.run(lambda_event, None, APIGatewayProxyEventV2Interface)
+
+    assert response["body"] == ""
+
+
+async def test_file_over_the_limit(monkeypatch, file_path, lambda_events):
+    monkeypatch.setattr(base, "MAX_RESPONSE_SIZE", len(CONTENT))
+    interface = APIGatewayProxyEventV2Interface(
+        None, lambda_events["api_gw_v2"], context=None
+    )
+
+    with pytest.raises(ValueError, match="exceeds the Lambda response limit"):
+        await interface.send({"type": "http.response.pathsend", "path": str(file_path)})
+
+
+async def test_file_over_the_limit_is_not_hashed(monkeypatch, file_path, lambda_events):
+    monkeypatch.setattr(base, "MAX_RESPONSE_SIZE", len(CONTENT))
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    interface = APIGatewayProxyEventV2Interface(None, lambda_event, context=None)
+    interface.get_scope()  # Sets the request method
+    interface.conditional = True
+    await interface.send({"type": "http.response.start", "status": 200})
+
+    with (
+        patch.object(APIGatewayProxyEventV2Interface, "apply_conditional") as etag,
+        pytest.raises(ValueError, match="exceeds the Lambda response limit"),
+    ):
+        await interface.send({"type": "http.response.pathsend", "path": str(file_path)})
+
+    etag.assert_not_called()
+
+
+async def test_direct_invocation(lynara, file_path):
+    file_path.write_text("report")
+
+    response = await lynara.run(
+        {"method": "GET", "path": "/path/to/resource"},
+        None,
+        DirectInvocationInterface,
+    )
+
+    assert response == "report"
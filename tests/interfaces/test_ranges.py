@@ -0,0 +1,221 @@
+from base64 import b64decode
+
+import pytest
+
+from lynara import APIGatewayProxyEventV1Interface, APIGatewayProxyEventV2Interface
+from lynara.interfaces import base
+from lynara.interfaces.conditional import make_etag
+from lynara.interfaces.ranges import if_range_matches, parse_range
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+
+BODY = b"0123456789" * 10
+LAST_MODIFIED = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+
+def make_app(headers=()):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/plain"), *headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": BODY[:50], "more_body": True})
+        await send({"type": "http.response.body", "body": BODY[50:]})
+
+    return app
+
+
+def get_event(lambda_events, headers, method="GET"):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = method
+    lambda_event["headers"] = headers
+    return lambda_event
+
+
+async def run(app, event, interface_class=APIGatewayProxyEventV2Interface, **kwargs):
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, range_requests=True, **kwargs)
+    return await lynara.run(event, None, interface_class)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", [(0, 9)]),
+        ("bytes=90-", [(90, 99)]),
+        ("bytes=-5", [(95, 99)]),
+        ("bytes=-500", [(0, 99)]),
+        ("bytes=95-200", [(95, 99)]),
+        ("bytes=0-0, 10-19", [(0, 0), (10, 19)]),
+        ("bytes=100-", []),
+        ("bytes=-0", []),
+        ("bytes=9-0", None),
+        ("bytes=a-b", None),
+        ("bytes=-", None),
+        ("items=0-9", None),
+        ("bytes=" + ",".join(["0-0"] * 17), None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+def test_if_range_matches():
+    assert if_range_matches('"abc"', '"abc"', None) is True
+    assert if_range_matches('W/"abc"', 'W/"abc"', None) is False
+    assert if_range_matches('"abc"', '"other"', LAST_MODIFIED) is False
+    assert if_range_matches(LAST_MODIFIED, None, LAST_MODIFIED) is True
+    assert if_range_matches(LAST_MODIFIED, None, None) is False
+
+
+async def test_single_range(lambda_events):
+    response = await run(make_app(), get_event(lambda_events, {"range": "bytes=10-19"}))
+
+    assert response["statusCode"] == 206
+    assert b64decode(response["body"]) == BODY[10:20]
+    assert response["headers"]["content-range"] == "bytes 10-19/100"
+    assert response["headers"]["content-length"] == "10"
+    assert response["headers"]["content-type"] == "text/plain"
+
+
+async def test_multiple_ranges(lambda_events):
+    response = await run(
+        make_app(), get_event(lambda_events, {"range": "bytes=0-4, -3"})
+    )
+
+    assert response["statusCode"] == 206
+    content_type = response["headers"]["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.rpartition("=")[2]
+    assert (
+        b64decode(response["body"])
+        == (
+            f"--{boundary}\r\ncontent-type: text/plain\r\n"
+            "content-range: bytes 0-4/100\r\n\r\n01234\r\n"
+            f"--{boundary}\r\ncontent-type: text/plain\r\n"
+            "content-range: bytes 97-99/100\r\n\r\n789\r\n"
+            f"--{boundary}--\r\n"
+        ).encode()
+    )
+
+
+async def test_unsatisfiable_range(lambda_events):
+    response = await run(make_app(), get_event(lambda_events, {"range": "bytes=500-"}))
+
+    assert response["statusCode"] == 416
+    assert response["body"] == ""
+    assert response["headers"]["content-range"] == "bytes */100"
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {},
+        {"range": "bytes=9-0"},
+        {"range": "bytes=0-9", "if-range": '"stale"'},
+        {"range": "bytes=0-9", "if-range": "Thu, 01 Jan 2026 00:00:00 GMT"},
+    ],
+)
+async def test_whole_body(lambda_events, headers):
+    response = await run(
+        make_app([(b"last-modified", LAST_MODIFIED.encode())]),
+        get_event(lambda_events, headers),
+    )
+
+    assert response["statusCode"] == 200
+    assert response["body"] == BODY.decode()
+    assert response["headers"]["accept-ranges"] == "bytes"
+
+
+async def test_if_range_with_the_current_etag(lambda_events):
+    event = get_event(
+        lambda_events, {"range": "bytes=0-9", "if-range": make_etag(BODY)}
+    )
+
+    response = await run(make_app(), event, conditional_requests=True)
+
+    assert response["statusCode"] == 206
+
+
+async def test_not_modified_takes_precedence(lambda_events):
+    event = get_event(
+        lambda_events, {"range": "bytes=0-9", "if-none-match": make_etag(BODY)}
+    )
+
+    response = await run(make_app(), event, conditional_requests=True)
+
+    assert response["statusCode"] == 304
+
+
+async def test_rest_api(lambda_events):
+    event = lambda_events["api_gw_v1"]
+    event["httpMethod"] = "GET"
+    event["headers"] = {"Range": "bytes=0-1"}
+    event["multiValueHeaders"] = {}
+
+    response = await run(make_app(), event, APIGatewayProxyEventV1Interface)
+
+    assert response["statusCode"] == 206
+    assert b64decode(response["body"]) == b"01"
+
+
+async def test_file_ranges_read_only_the_requested_bytes(
+    lambda_events, tmp_path, monkeypatch
+):
+    path = tmp_path / "export.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.pathsend", "path": str(path)})
+
+    # The whole file is over the limit, the range is not
+    monkeypatch.setattr(base, "MAX_RESPONSE_SIZE", 1024)
+    event = get_event(lambda_events, {"range": "bytes=256-511"})
+
+    response = await run(app, event)
+
+    assert response["statusCode"] == 206
+    assert b64decode(response["body"]) == bytes(range(256))
+    assert response["headers"]["content-range"] == "bytes 256-511/10240"
+
+
+def make_file_app(path):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.pathsend", "path": str(path)})
+
+    return app
+
+
+async def test_file_not_modified_takes_precedence(lambda_events, tmp_path):
+    path = tmp_path / "export.bin"
+    path.write_bytes(BODY)
+    event = get_event(
+        lambda_events, {"range": "bytes=0-9", "if-none-match": make_etag(BODY)}
+    )
+
+    response = await run(make_file_app(path), event, conditional_requests=True)
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+
+
+async def test_file_if_range_with_the_current_etag(
+    lambda_events, tmp_path, monkeypatch
+):
+    path = tmp_path / "export.bin"
+    path.write_bytes(BODY)
+    # The whole file is over the limit, a resumed download is not
+    monkeypatch.setattr(base, "MAX_RESPONSE_SIZE", 64)
+    event = get_event(
+        lambda_events, {"range": "bytes=90-", "if-range": make_etag(BODY)}
+    )
+
+    response = await run(make_file_app(path), event, conditional_requests=True)
+
+    assert response["statusCode"] == 206
+    assert response["headers"]["etag"] == make_etag(BODY)
+    assert b64decode(response["body"]) == BODY[90:]
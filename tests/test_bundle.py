@@ -0,0 +1,133 @@
+import json
+import sys
+import zipfile
+
+import pytest
+
+from lynara.__main__ import main
+from lynara.bundle import (
+    build_bundle,
+    parse_import_time,
+    prune,
+    strip,
+    trace_imports,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "app"
+    package = source / "dependency"
+    (package / "tests").mkdir(parents=True)
+    (package / "__init__.py").write_text("from dependency import used\n")
+    (package / "used.py").write_text("VALUE = 1\n")
+    (package / "unused.py").write_text("VALUE = 2\n")
+    (package / "data.json").write_text("{}")
+    (package / "__init__.pyi").write_text("")
+    (package / "tests" / "test_used.py").write_text("")
+    dist_info = source / "dependency-1.0.dist-info"
+    dist_info.mkdir()
+    for name in ("METADATA", "RECORD", "INSTALLER", "LICENSE.txt"):
+        (dist_info / name).write_text("")
+    (source / "handler.py").write_text(
+        "import dependency\n"
+        "def handle(event, context):\n"
+        "    from dependency import lazy\n"
+        "    return event\n"
+    )
+    (package / "lazy.py").write_text("")
+    return source
+
+
+def get_names(root):
+    return {path.relative_to(root).as_posix() for path in root.rglob("*")}
+
+
+def test_strip(source):
+    strip(source, keep=["dependency/tests*"])
+
+    names = get_names(source)
+    assert "dependency/__init__.pyi" not in names
+    assert "dependency/tests/test_used.py" in names
+    assert {name for name in names if name.startswith("dependency-1.0.dist-info/")} == {
+        "dependency-1.0.dist-info/METADATA",
+        "dependency-1.0.dist-info/LICENSE.txt",
+    }
+
+
+@pytest.mark.parametrize("strip_packages", [False, True])
+def test_strip_subpackages(source, strip_packages, caplog):
+    caplog.set_level("INFO", logger="lynara.bundle")
+    # Imported at runtime, as `django.test` is
+    runtime_tests = source / "dependency" / "test"
+    runtime_tests.mkdir()
+    (runtime_tests / "__init__.py").write_text("")
+    (source / "tests").mkdir()
+    (source / "tests" / "__init__.py").write_text("")
+
+    strip(source, keep=[], strip_packages=strip_packages)
+
+    names = get_names(source)
+    assert ("dependency/test/__init__.py" in names) is not strip_packages
+    assert "tests" not in names
+    assert "dependency/tests" not in names
+    assert "Stripped tests" in caplog.text
+    assert ("Stripped dependency/test\n" in caplog.text) is strip_packages
+
+
+@pytest.mark.parametrize(
+    ("event", "pruned"),
+    [(None, {"unused.py", "lazy.py"}), ({"priming": True}, {"unused.py"})],
+)
+def test_prune_never_imported_modules(source, tmp_path, event, pruned):
+    event_path = None
+    if event is not None:
+        event_path = tmp_path / "event.json"
+        event_path.write_text(json.dumps(event))
+    loaded = trace_imports(sys.executable, source, "handler.handle", event_path)
+
+    assert prune(source, loaded, keep=["dependency/tests/*"]) == len(pruned)
+
+    names = get_names(source / "dependency")
+    assert {"__init__.py", "used.py", "data.json", "tests/test_used.py"} <= names
+    assert not pruned & names
+
+
+def test_parse_import_time():
+    output = (
+        "Deprecated | warned by a module\n"
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   dependency.used\n"
+        "import time:       300 |       1500 | dependency\n"
+    )
+
+    assert parse_import_time(output, "dependency") == 0.0015
+    assert parse_import_time(output, "dependency.used") == 0.00012
+    assert parse_import_time(output, "handler") is None
+
+
+def test_build_bundle(source, tmp_path):
+    output = tmp_path / "bundle.zip"
+
+    report = build_bundle("handler.handle", output, source=source, trace=True)
+
+    with zipfile.ZipFile(output) as bundle:
+        names = set(bundle.namelist())
+    cache_tag = sys.implementation.cache_tag
+    assert f"dependency/__pycache__/used.{cache_tag}.pyc" in names
+    assert "dependency/tests/test_used.py" not in names
+    assert "dependency/unused.py" not in names
+    # The tests were never imported either
+    assert report.pruned_modules == 3
+    assert report.zip_size_before > 0
+    assert report.import_time_before > 0
+    assert report.import_time_after > 0
+
+
+def test_bundle_command(source, tmp_path, capsys):
+    output = tmp_path / "bundle.zip"
+
+    main(["bundle", "handler.handle", "-s", str(source), "-o", str(output)])
+
+    assert output.is_file()
+    assert "unpacked" in capsys.readouterr().out
@@ -0,0 +1,221 @@
+import json
+import os
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep, time
+from types import SimpleNamespace
+
+import pytest
+
+from lynara.extension import (
+    ExtensionSpanExporter,
+    TelemetryClient,
+    TelemetryExtension,
+)
+from lynara.interfaces import DirectInvocationInterface
+from lynara.runner import Lynara
+from lynara.tracing import Tracer
+from lynara.types import LifespanMode
+
+
+class FakeExtensionsAPI(ThreadingHTTPServer):
+    """Stands in for the Lambda Extensions API of the execution environment."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FakeExtensionsAPIHandler)
+        self.registrations: list[tuple[str, dict]] = []
+        self.events: queue.Queue[dict] = queue.Queue()
+
+    @property
+    def runtime_api(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def invoke(self, request_id: str) -> None:
+        self.events.put(
+            {
+                "eventType": "INVOKE",
+                "requestId": request_id,
+                "deadlineMs": (time() + 5) * 1000,
+            }
+        )
+
+
+class FakeExtensionsAPIHandler(BaseHTTPRequestHandler):
+    server: FakeExtensionsAPI
+
+    def do_POST(self):
+        assert self.path == "/2020-01-01/extension/register"
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.registrations.append((self.headers["Lambda-Extension-Name"], body))
+        self._respond({}, {"Lambda-Extension-Identifier": "extension-1"})
+
+    def do_GET(self):
+        assert self.path == "/2020-01-01/extension/event/next"
+        assert self.headers["Lambda-Extension-Identifier"] == "extension-1"
+        self._respond(self.server.events.get(timeout=5))
+
+    def _respond(self, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def extensions_api():
+    server = FakeExtensionsAPI()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def socket_path(tmp_path):
+    return str(tmp_path / "telemetry.sock")
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def test_telemetry_is_exported_by_the_extension(extensions_api, socket_path):
+    batches = []
+    extension = TelemetryExtension(
+        batches.append,
+        socket_path=socket_path,
+        batch_size=3,
+        runtime_api=extensions_api.runtime_api,
+    )
+    extension_thread = threading.Thread(target=extension.run, daemon=True)
+    extension_thread.start()
+    while not os.path.exists(socket_path):
+        sleep(0.01)
+
+    client = TelemetryClient(socket_path)
+    lynara = Lynara(
+        app,
+        lifespan_mode=LifespanMode.OFF,
+        tracer=Tracer(exporter=ExtensionSpanExporter(client)),
+        telemetry=client,
+    )
+    for request_id in ("request-1", "request-2"):
+        extensions_api.invoke(request_id)
+        await lynara.run(
+            {"method": "GET", "path": "/"},
+            SimpleNamespace(aws_request_id=request_id),
+            DirectInvocationInterface,
+        )
+    extensions_api.events.put({"eventType": "SHUTDOWN"})
+    extension_thread.join(timeout=5)
+
+    assert extensions_api.registrations == [
+        ("lynara-telemetry", {"events": ["INVOKE", "SHUTDOWN"]})
+    ]
+    # Batched after the second invocation, nothing left for the shutdown
+    assert len(batches) == 1
+    assert [record["type"] for record in batches[0]] == [
+        "trace",
+        "metrics",
+        "trace",
+        "metrics",
+    ]
+    assert not os.path.exists(socket_path)
+
+
+def test_unreachable_extension_drops_telemetry(socket_path, caplog):
+    client = TelemetryClient(socket_path)
+    client.emit("metrics", {"duration": 0.1})
+
+    client.end_invocation("request-1")
+
+    assert client.records == []
+    assert "Dropped the telemetry of request-1" in caplog.text
+
+
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_internal_extension_exports_on_close(extensions_api, socket_path, tmp_path):
+    output = tmp_path / "telemetry.jsonl"
+
+    def export(batch):
+        # Replaced at once, the test never reads a partly written file
+        partial = tmp_path / "telemetry.partial"
+        partial.write_text(json.dumps(batch))
+        partial.replace(output)
+
+    extension = TelemetryExtension(
+        export, socket_path=socket_path, runtime_api=extensions_api.runtime_api
+    )
+    extension.start()
+    # Registered before start returns
+    assert extensions_api.registrations == [
+        ("lynara-telemetry", {"events": ["INVOKE"]})
+    ]
+    client = TelemetryClient(socket_path)
+    extensions_api.invoke("request-1")
+    client.emit("metrics", {"duration": 0.1})
+    client.end_invocation("request-1")
+
+    client.close()
+    for _ in range(500):
+        if output.exists():
+            break
+        sleep(0.01)
+    extensions_api.events.put({"eventType": "SHUTDOWN"})
+
+    assert json.loads(output.read_text()) == [
+        {"type": "metrics", "data": {"duration": 0.1}}
+    ]
+
+
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_start_fails_without_registration(socket_path):
+    extensions_api = FakeExtensionsAPI()
+    runtime_api = extensions_api.runtime_api
+    # Nothing listens there anymore
+    extensions_api.server_close()
+    extension = TelemetryExtension(socket_path=socket_path, runtime_api=runtime_api)
+
+    with pytest.raises(RuntimeError, match="failed to register"):
+        extension.start()
+
+
+def test_reconnected_client_is_waited_for(extensions_api, socket_path):
+    extension = TelemetryExtension(
+        socket_path=socket_path,
+        events=["INVOKE"],
+        runtime_api=extensions_api.runtime_api,
+    )
+    extension.bind()
+    threading.Thread(target=extension._accept, daemon=True).start()
+    try:
+        client = TelemetryClient(socket_path)
+        client.end_invocation("request-1")
+        client.close()
+        for _ in range(500):
+            if extension._closed.is_set():
+                break
+            sleep(0.01)
+
+        client.end_invocation("request-2")
+        for _ in range(500):
+            if "request-2" in extension._ended:
+                break
+            sleep(0.01)
+        start = time()
+        extension.wait_for_invocation("request-3", time() + 0.2)
+    finally:
+        client.close()
+        extension.close()
+
+    # Not cut short by the first connection's disconnect
+    assert time() - start >= 0.2
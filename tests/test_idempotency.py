@@ -0,0 +1,210 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock, call
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface, DirectInvocationInterface
+from lynara.extension import TelemetryClient
+from lynara.idempotency import (
+    DynamoDBStore,
+    Idempotency,
+    LocalDynamoDBClient,
+    MemoryStore,
+    get_json_path,
+)
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+
+SQS_EVENT = {
+    "method": "POST",
+    "path": "/orders",
+    "Records": [{"messageId": "message-1", "body": "{}"}],
+}
+
+
+class CountingApp:
+    def __init__(self, status: int = 200, delay: float = 0) -> None:
+        self.calls = 0
+        self.status = status
+        self.delay = delay
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        await send(
+            {"type": "http.response.start", "status": self.status, "headers": []}
+        )
+        await send({"type": "http.response.body", "body": str(self.calls).encode()})
+
+
+def get_context(request_id):
+    return SimpleNamespace(aws_request_id=request_id)
+
+
+@pytest.mark.parametrize(
+    "store", [MemoryStore(), DynamoDBStore("responses", LocalDynamoDBClient())]
+)
+async def test_retries_return_the_stored_response(store):
+    app = CountingApp()
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=Idempotency(store))
+
+    responses = [
+        await lynara.run(SQS_EVENT, get_context("request-1"), DirectInvocationInterface)
+        for _ in range(3)
+    ]
+    other = await lynara.run(
+        SQS_EVENT, get_context("request-2"), DirectInvocationInterface
+    )
+
+    assert responses == ["1", "1", "1"]
+    assert other == "2"
+    assert app.calls == 2
+    assert lynara.idempotency.hits == 2
+
+
+async def test_stored_responses_end_the_invocation(tmp_path):
+    telemetry = TelemetryClient(str(tmp_path / "telemetry.sock"))
+    telemetry.end_invocation = Mock()
+    lynara = Lynara(
+        CountingApp(),
+        lifespan_mode=LifespanMode.OFF,
+        idempotency=Idempotency(),
+        telemetry=telemetry,
+    )
+
+    for _ in range(2):
+        await lynara.run(SQS_EVENT, get_context("request-1"), DirectInvocationInterface)
+
+    assert lynara.idempotency.hits == 1
+    assert telemetry.end_invocation.call_args_list == [call("request-1")] * 2
+
+
+async def test_key_from_json_path():
+    app = CountingApp()
+    idempotency = Idempotency(json_path="$.Records.0.messageId")
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=idempotency)
+
+    for request_id in ("request-1", "request-2"):
+        await lynara.run(SQS_EVENT, get_context(request_id), DirectInvocationInterface)
+
+    assert app.calls == 1
+
+
+async def test_key_from_header(lambda_events):
+    app = CountingApp()
+    idempotency = Idempotency(header="Idempotency-Key")
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=idempotency)
+    event = lambda_events["api_gw_v2"]
+
+    event["headers"] = {"idempotency-key": "abc"}
+    first = await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+    second = await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+    event["headers"] = {}
+    await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+
+    assert first == second
+    assert app.calls == 2
+
+    # The same key sent to another route is another request
+    event["headers"] = {"idempotency-key": "abc"}
+    event["requestContext"]["http"]["path"] = "/other"
+    await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+
+    assert app.calls == 3
+
+
+async def test_store_errors_run_the_event(caplog):
+    class BrokenStore:
+        async def get(self, key):
+            raise ConnectionError("DynamoDB is unavailable")
+
+        async def put(self, key, response, ttl):
+            raise ConnectionError("DynamoDB is unavailable")
+
+    app = CountingApp()
+    idempotency = Idempotency(BrokenStore())
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=idempotency)
+
+    response = await lynara.run(
+        SQS_EVENT, get_context("request-1"), DirectInvocationInterface
+    )
+
+    assert response == "1"
+    assert "Reading the stored response of request-1 failed" in caplog.text
+
+
+async def test_concurrent_duplicates_wait_for_the_first():
+    app = CountingApp(delay=0.01)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=Idempotency())
+    context = get_context("request-1")
+
+    responses = await asyncio.gather(
+        *(lynara.run(SQS_EVENT, context, DirectInvocationInterface) for _ in range(5))
+    )
+
+    assert responses == ["1"] * 5
+    assert app.calls == 1
+
+
+async def test_server_errors_are_not_stored(lambda_events):
+    app = CountingApp(status=503)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, idempotency=Idempotency())
+    context = get_context("request-1")
+
+    for _ in range(2):
+        await lynara.run(
+            lambda_events["api_gw_v2"], context, APIGatewayProxyEventV2Interface
+        )
+
+    assert app.calls == 2
+
+
+async def test_memory_store_evicts_and_expires():
+    store = MemoryStore(maxsize=2)
+
+    await store.put("a", 1, ttl=60)
+    await store.put("b", 2, ttl=60)
+    await store.get("a")
+    await store.put("c", 3, ttl=60)
+
+    assert await store.get("a") == 1
+    assert await store.get("b") is None
+
+    await store.put("d", 4, ttl=-1)
+
+    assert await store.get("d") is None
+
+
+async def test_memory_store_is_bounded_by_bytes():
+    store = MemoryStore(maxbytes=15)
+
+    await store.put("a", "x" * 8, ttl=60)
+    await store.put("b", "y" * 8, ttl=60)
+    await store.put("c", "z" * 50, ttl=60)
+
+    assert await store.get("a") is None
+    assert await store.get("b") == "y" * 8
+    assert await store.get("c") is None
+
+
+async def test_memory_store_returns_copies():
+    store = MemoryStore()
+    response = {"statusCode": 200, "headers": {"etag": '"1"'}, "body": "ok"}
+    await store.put("a", response, ttl=60)
+
+    response["headers"]["x-mutated"] = "later"
+    stored = await store.get("a")
+    stored["body"] = ""
+
+    assert await store.get("a") == {
+        "statusCode": 200,
+        "headers": {"etag": '"1"'},
+        "body": "ok",
+    }
+
+
+def test_get_json_path():
+    assert get_json_path(SQS_EVENT, "Records.0.messageId") == "message-1"
+    assert get_json_path(SQS_EVENT, "Records.1.messageId") is None
+    assert get_json_path(SQS_EVENT, "missing.key") is None
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+
+import pytest
+
+import lynara
+
+IMPORT_TIME_BUDGET_US = 50_000
+IMPORTED_MODULES_BUDGET = 5
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.rsplit("|", 2)
+        import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+def test_import_budget():
+    baseline = get_import_times("pass")
+    import_times = get_import_times("import lynara")
+
+    imported_modules = import_times.keys() - baseline.keys()
+    assert len(imported_modules) <= IMPORTED_MODULES_BUDGET, sorted(imported_modules)
+    assert import_times["lynara"] <= IMPORT_TIME_BUDGET_US
+
+
+def test_import_lynara_is_lazy():
+    import_times = get_import_times("import lynara")
+
+    assert not [module for module in import_times if module.startswith("lynara.")]
+    assert "asyncio" not in import_times
+
+
+def test_lazy_exports():
+    from lynara.interfaces.api_http import APIGatewayProxyEventV2Interface
+    from lynara.runner import Lynara
+
+    assert lynara.Lynara is Lynara
+    assert lynara.APIGatewayProxyEventV2Interface is APIGatewayProxyEventV2Interface
+    assert set(lynara.__all__) <= set(dir(lynara))
+
+
+def test_unknown_export():
+    with pytest.raises(AttributeError, match="NotAnExport"):
+        lynara.NotAnExport
+
+
+def test_interface_features_are_lazy():
+    import_times = get_import_times(
+        "import lynara.interfaces.api_http, lynara.interfaces.api_rest"
+    )
+
+    assert "lynara.interfaces.conditional" not in import_times
+    assert "lynara.interfaces.ranges" not in import_times
+    assert "secrets" not in import_times
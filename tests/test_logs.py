@@ -0,0 +1,131 @@
+import asyncio
+import io
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lynara.interfaces import DirectInvocationInterface
+from lynara.logs import BufferedJSONHandler
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+
+LOGGER = logging.getLogger("tests.app")
+
+
+class CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+    @property
+    def logs(self) -> list[dict]:
+        return [json.loads(line) for line in self.getvalue().splitlines()]
+
+
+@pytest.fixture()
+def stream():
+    return CountingStream()
+
+
+@pytest.fixture()
+def handler(stream):
+    handler = BufferedJSONHandler(stream=stream)
+    logger = logging.getLogger()
+    previous_level = logger.level
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    yield handler
+    logger.removeHandler(handler)
+    logger.setLevel(previous_level)
+
+
+async def app(scope, receive, send):
+    LOGGER.info("Handling %s", scope["path"])
+    LOGGER.warning("Slow query")
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def test_invocation_is_flushed_in_one_write(handler, stream):
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, log_handler=handler)
+    context = SimpleNamespace(aws_request_id="request-1")
+
+    await lynara.run(
+        {"method": "GET", "path": "/items"}, context, DirectInvocationInterface
+    )
+
+    assert stream.writes == 1
+    logs = stream.logs
+    assert [log["message"] for log in logs[:2]] == ["Handling /items", "Slow query"]
+    assert logs[-1]["logger"] == "lynara.runner"
+    assert {log["requestId"] for log in logs} == {"request-1"}
+    assert logs[1]["level"] == "WARNING"
+    assert logs[0]["timestamp"].endswith("Z")
+
+
+async def test_overlapping_invocations_keep_their_request_id(handler, stream):
+    async def invocation(request_id):
+        handler.begin(request_id)
+        await asyncio.sleep(0)
+        LOGGER.info("In %s", request_id)
+
+    await asyncio.gather(invocation("request-1"), invocation("request-2"))
+    handler.flush()
+
+    assert {log["message"]: log["requestId"] for log in stream.logs} == {
+        "In request-1": "request-1",
+        "In request-2": "request-2",
+    }
+
+
+def test_errors_are_flushed_immediately(handler, stream):
+    LOGGER.info("Before")
+    assert stream.writes == 0
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        LOGGER.exception("Failed")
+
+    assert stream.writes == 1
+    logs = stream.logs
+    assert [log["message"] for log in logs] == ["Before", "Failed"]
+    assert "ValueError: boom" in logs[1]["exception"]
+
+
+def test_capacity(stream):
+    handler = BufferedJSONHandler(stream=stream, capacity=2)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "line", (), None)
+
+    handler.emit(record)
+    handler.emit(record)
+    handler.emit(record)
+
+    assert stream.writes == 1
+    assert len(stream.logs) == 2
+
+
+def test_close_flushes(stream):
+    handler = BufferedJSONHandler(stream=stream)
+    handler.emit(logging.LogRecord("test", logging.INFO, __file__, 1, "line", (), None))
+
+    handler.close()
+
+    assert [log["message"] for log in stream.logs] == ["line"]
+
+
+def test_shutdown_flushes(handler, stream):
+    lynara = Lynara(AsyncMock(), lifespan_mode=LifespanMode.OFF, log_handler=handler)
+    lynara.handle({"method": "GET", "path": "/"}, None, DirectInvocationInterface)
+    LOGGER.info("Shutting down")
+
+    lynara.close()
+
+    assert stream.logs[-1]["message"] == "Shutting down"
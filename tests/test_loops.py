@@ -0,0 +1,49 @@
+import asyncio
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.loops import get_loop_factory
+
+
+def test_get_loop_factory_prefers_uvloop():
+    uvloop = pytest.importorskip("uvloop")
+
+    assert get_loop_factory() is uvloop.new_event_loop
+
+
+def test_get_loop_factory_falls_back_to_asyncio(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    assert get_loop_factory() is asyncio.new_event_loop
+
+
+@pytest.mark.parametrize("loop_factory", [asyncio.new_event_loop, get_loop_factory()])
+def test_handle_uses_the_loop_factory(
+    fastapi_app, mock_lifespan, lambda_events, loop_factory
+):
+    factory = Mock(return_value=loop_factory())
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lynara = Lynara(fastapi_app, loop_factory=factory)
+
+    try:
+        for _ in range(2):
+            response = lynara.handle(
+                lambda_event,
+                None,
+                APIGatewayProxyEventV2Interface,
+                base_path="/path/to",
+            )
+            assert response["statusCode"] == 200
+        assert lynara._loop is factory.return_value
+    finally:
+        lynara.close()
+
+    factory.assert_called_once_with()
+    assert [call.args[1] for call in mock_lifespan.call_args_list] == [
+        "startup",
+        "shutdown",
+    ]
@@ -0,0 +1,108 @@
+import json
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from lynara import (
+    APIGatewayProxyEventV1Interface,
+    APIGatewayProxyEventV2Interface,
+    Lynara,
+)
+from lynara.memory import MemoryGrowthDetector
+
+
+async def plain_text_app(scope, receive, send):
+    await receive()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.mark.limit_memory("24 KB")
+@pytest.mark.parametrize(
+    ("event_name", "interface_class"),
+    [
+        ("api_gw_v1", APIGatewayProxyEventV1Interface),
+        ("api_gw_v2", APIGatewayProxyEventV2Interface),
+    ],
+)
+async def test_interface_allocations(event_name, interface_class, load_lambda_events):
+    lambda_event = load_lambda_events[event_name]
+    for _ in range(1000):
+        await interface_class(plain_text_app, lambda_event, context=None)()
+
+
+def test_growth_detector_rss(caplog):
+    caplog.set_level("INFO", logger="lynara.memory")
+    detector = MemoryGrowthDetector(every=2, recycle_threshold=1000)
+
+    with patch("lynara.memory.get_rss", side_effect=[10_000, 10_500, 11_500]):
+        for _ in range(4):
+            detector.after_invocation()
+        assert detector.recycle_requested is False
+
+        report = detector.check()
+
+    assert report == {
+        "invocations": 4,
+        "size": 11_500,
+        "growth": 1000,
+        "total_growth": 1500,
+    }
+    assert detector.recycle_requested is True
+    assert '{"lynara.memory": {"invocations": 2' in caplog.text
+
+
+def test_growth_detector_tracemalloc():
+    leak = []
+    detector = MemoryGrowthDetector(use_tracemalloc=True)
+    try:
+        detector.check()
+        leak.extend(bytearray(1024) for _ in range(100))
+        report = detector.check()
+    finally:
+        tracemalloc.stop()
+
+    assert report["growth"] > 100 * 1024
+    assert __file__ in report["top"][0]["site"]
+
+
+def test_recycle_after_response(lambda_events, monkeypatch):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204})
+        await send({"type": "http.response.body"})
+
+    monkeypatch.setenv("AWS_LAMBDA_RUNTIME_API", "127.0.0.1:9001")
+    detector = MemoryGrowthDetector(every=1, recycle_threshold=0)
+    lynara = Lynara(app, lifespan_mode="off", memory_detector=detector)
+    context = SimpleNamespace(aws_request_id="request-id")
+
+    with (
+        patch("lynara.memory.get_rss", side_effect=[1000, 2000]),
+        patch("urllib.request.urlopen") as urlopen,
+        patch("os._exit") as exit_mock,
+    ):
+        lynara.handle(
+            lambda_events["api_gw_v2"], context, APIGatewayProxyEventV2Interface
+        )
+        urlopen.assert_not_called()
+        response = lynara.handle(
+            lambda_events["api_gw_v2"], context, APIGatewayProxyEventV2Interface
+        )
+        # Shut down before exiting, as on exit
+        assert lynara._loop is None
+    lynara.close()
+
+    request = urlopen.call_args.args[0]
+    assert request.full_url == (
+        "http://127.0.0.1:9001/2018-06-01/runtime/invocation/request-id/response"
+    )
+    assert json.loads(request.data) == response
+    exit_mock.assert_called_once_with(0)
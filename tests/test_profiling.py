@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from lynara import APIGatewayProxyEventV2Interface, DirectInvocationInterface, Lynara
+from lynara.profiling import SlowInvocationProfiler, to_collapsed
+
+
+def slow_function():
+    time.sleep(0.05)
+
+
+async def slow_app(scope, receive, send):
+    slow_function()
+    await send({"type": "http.response.start", "status": 204})
+    await send({"type": "http.response.body"})
+
+
+def test_to_collapsed():
+    stack_a = (to_collapsed.__code__, slow_function.__code__)
+    stack_b = (to_collapsed.__code__,)
+
+    lines = to_collapsed([stack_a, stack_b, stack_a]).splitlines()
+
+    assert lines[0].startswith("to_collapsed (")
+    assert ";slow_function (" in lines[0]
+    assert lines[0].endswith(" 2")
+    assert lines[1].endswith(" 1")
+
+
+async def test_slow_invocation_profile_logged(lambda_events, caplog):
+    profiler = SlowInvocationProfiler(threshold=0.01, interval=0.001)
+    lynara = Lynara(slow_app, lifespan_mode="off", profiler=profiler)
+    context = SimpleNamespace(aws_request_id="request-id")
+
+    await lynara.run(
+        lambda_events["api_gw_v2"], context, APIGatewayProxyEventV2Interface
+    )
+
+    assert "Slow invocation request-id took" in caplog.text
+    assert "slow_function (" in caplog.text
+
+
+async def test_fast_invocation_not_profiled(lambda_events, caplog, tmp_path):
+    profiler = SlowInvocationProfiler(threshold=10, output_dir=tmp_path)
+    lynara = Lynara(slow_app, lifespan_mode="off", profiler=profiler)
+
+    await lynara.run(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+
+    assert "Slow invocation" not in caplog.text
+    assert not list(tmp_path.iterdir())
+
+
+async def test_speedscope_output(lambda_events, tmp_path):
+    profiler = SlowInvocationProfiler(
+        threshold=0.01,
+        interval=0.001,
+        output_format="speedscope",
+        output_dir=tmp_path,
+    )
+    lynara = Lynara(slow_app, lifespan_mode="off", profiler=profiler)
+    context = SimpleNamespace(aws_request_id="request-id")
+
+    await lynara.run(
+        lambda_events["api_gw_v2"], context, APIGatewayProxyEventV2Interface
+    )
+
+    output = json.loads((tmp_path / "request-id.speedscope.json").read_text())
+    frame_names = [frame["name"] for frame in output["shared"]["frames"]]
+    assert "slow_function" in frame_names
+    profile = output["profiles"][0]
+    assert profile["name"] == "request-id"
+    assert len(profile["samples"]) == len(profile["weights"]) > 0
+
+
+def test_overlapping_invocations(caplog):
+    profiler = SlowInvocationProfiler(threshold=0, interval=0.001)
+    first, second = profiler.profile("first"), profiler.profile("second")
+
+    with first:
+        slow_function()
+        alone = len(first.samples)
+        with second:
+            # Either invocation could be running, neither is sampled
+            slow_function()
+        assert len(first.samples) == alone
+        assert second.samples == []
+        slow_function()
+
+    assert len(first.samples) > alone > 0
+    assert "Slow invocation first took" in caplog.text
+    assert "Slow invocation second" not in caplog.text
+
+
+async def test_batch_profiled(caplog):
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.02)
+        await slow_app(scope, receive, send)
+
+    profiler = SlowInvocationProfiler(threshold=0.01, interval=0.001)
+    lynara = Lynara(app, lifespan_mode="off", profiler=profiler)
+    events = [{"method": "GET", "path": f"/{i}"} for i in range(2)]
+
+    responses = await lynara.run_batch(events, None, DirectInvocationInterface)
+
+    assert responses == ["", ""]
+    assert profiler._profiles == []
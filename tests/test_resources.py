@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.resources import ResourceRegistry
+
+
+async def test_revalidate_only_after_thaw():
+    registry = ResourceRegistry(thaw_threshold=60)
+    validate = AsyncMock(return_value=True)
+    registry.register("db", "connection", validate=validate, reconnect=AsyncMock())
+
+    with patch("lynara.resources.time", return_value=1000):
+        await registry.before_invocation()
+        registry.after_invocation()
+    with patch("lynara.resources.time", return_value=1030):
+        await registry.before_invocation()
+    validate.assert_not_called()
+
+    with patch("lynara.resources.time", return_value=1100):
+        await registry.before_invocation()
+    validate.assert_awaited_once_with("connection")
+
+
+async def test_reconnect_dead_resources():
+    registry = ResourceRegistry()
+    registry.register(
+        "db",
+        "stale",
+        validate=AsyncMock(return_value=False),
+        reconnect=AsyncMock(return_value="fresh"),
+    )
+    registry.register(
+        "http",
+        "client",
+        validate=AsyncMock(side_effect=ConnectionError),
+        reconnect=AsyncMock(return_value="new client"),
+    )
+    registry.register(
+        "cache",
+        "cache",
+        validate=AsyncMock(return_value=True),
+        reconnect=AsyncMock(),
+    )
+
+    await registry.revalidate()
+
+    assert registry["db"] == "fresh"
+    assert registry["http"] == "new client"
+    assert registry["cache"] == "cache"
+
+
+async def test_overlapping_invocations_reconnect_once():
+    registry = ResourceRegistry(thaw_threshold=60)
+
+    async def reconnect(value):
+        await asyncio.sleep(0.01)
+        return "fresh"
+
+    reconnect_mock = AsyncMock(side_effect=reconnect)
+    registry.register(
+        "db", "stale", validate=AsyncMock(return_value=False), reconnect=reconnect_mock
+    )
+    with patch("lynara.resources.time", return_value=1000):
+        registry.after_invocation()
+
+    with patch("lynara.resources.time", return_value=1100):
+        await asyncio.gather(registry.before_invocation(), registry.before_invocation())
+
+    reconnect_mock.assert_awaited_once_with("stale")
+    assert registry["db"] == "fresh"
+
+
+async def test_reconnect_failure_is_logged(caplog):
+    registry = ResourceRegistry()
+    registry.register(
+        "db",
+        "stale",
+        validate=AsyncMock(return_value=False),
+        reconnect=AsyncMock(side_effect=ConnectionError),
+    )
+
+    await registry.revalidate()
+
+    assert registry["db"] == "stale"
+    assert "Reconnecting resource db failed" in caplog.text
+
+
+def test_resources_closed_at_shutdown(lambda_events):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204})
+        await send({"type": "http.response.body"})
+
+    close = AsyncMock()
+    lynara = Lynara(app, lifespan_mode="off")
+    lynara.resources.register(
+        "db", "connection", validate=AsyncMock(), reconnect=AsyncMock(), close=close
+    )
+
+    lynara.handle(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+    close.assert_not_called()
+
+    lynara.close()
+    close.assert_awaited_once_with("connection")
+    assert "db" not in lynara.resources
@@ -0,0 +1,114 @@
+from contextlib import asynccontextmanager
+from unittest.mock import call
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara, Mount
+from lynara.routing import MountRouter
+from tests.apps.fastapi_app import get_fast_api_app
+
+
+def make_app(name):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200})
+        await send(
+            {
+                "type": "http.response.body",
+                "body": f"{name} {scope['root_path']} {scope['path']}".encode(),
+            }
+        )
+
+    return app
+
+
+@pytest.fixture
+def apps():
+    return {name: make_app(name) for name in ("root", "api", "v2", "admin")}
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/", "root"),
+        ("/other", "root"),
+        ("/api", "api"),
+        ("/api/", "api"),
+        ("/api/items", "api"),
+        ("/apix", "root"),
+        ("/api/v2/items", "v2"),
+        ("/api/v2x", "api"),
+    ],
+)
+def test_resolve_longest_prefix(apps, path, expected):
+    router = MountRouter(
+        {"/": apps["root"], "/api": apps["api"], "/api/v2/": apps["v2"]}
+    )
+
+    assert router.resolve(path).app is apps[expected]
+
+
+def test_resolve_host_and_stage(apps):
+    router = MountRouter(
+        [
+            Mount("/", apps["root"]),
+            Mount("/", apps["admin"], host="Admin.example.com"),
+            Mount("/api", apps["api"], stage="prod"),
+        ]
+    )
+
+    assert router.resolve("/", host="admin.example.com").app is apps["admin"]
+    assert router.resolve("/", host="example.com").app is apps["root"]
+    assert router.resolve("/api", stage="prod").app is apps["api"]
+    assert router.resolve("/api", stage="dev").app is apps["root"]
+
+
+def test_resolve_no_match(apps):
+    assert MountRouter({"/api": apps["api"]}).resolve("/other") is None
+
+
+async def test_dispatch_root_path(apps, lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    lynara = Lynara({"/to": apps["api"]}, lifespan_mode="off")
+    response = await lynara.run(
+        lambda_event, None, APIGatewayProxyEventV2Interface, base_path="/path"
+    )
+
+    assert response["body"] == "api /to /to/resource"
+
+
+async def test_dispatch_not_found(apps, lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    lynara = Lynara({"/api": apps["api"]}, lifespan_mode="off")
+    response = await lynara.run(lambda_event, None, APIGatewayProxyEventV2Interface)
+
+    assert response["statusCode"] == 404
+
+
+def test_mounted_lifespan_once_per_container(lambda_events, mock_lifespan):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lambda_event["requestContext"]["http"]["path"] = "/first/resource"
+
+    def get_app(name):
+        @asynccontextmanager
+        async def life(app):
+            mock_lifespan(name, "startup")
+            yield
+            mock_lifespan(name, "shutdown")
+
+        return get_fast_api_app(lifespan_func=life)
+
+    lynara = Lynara({"/first": get_app("first"), "/second": get_app("second")})
+    for _ in range(3):
+        response = lynara.handle(lambda_event, None, APIGatewayProxyEventV2Interface)
+        assert response["statusCode"] == 200
+
+    assert mock_lifespan.call_args_list == [
+        call("first", "startup"),
+        call("second", "startup"),
+    ]
+    lynara.close()
+    assert mock_lifespan.call_args_list[2:] == [
+        call("second", "shutdown"),
+        call("first", "shutdown"),
+    ]
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 from lynara.interfaces import APIGatewayProxyEventV2Interface, LifespanInterface
 from lynara.runner import Lynara
+from lynara.stats import ContainerStats
 from lynara.types import LifespanMode
 
 
@@ -29,3 +30,63 @@ async def test_runner(lambda_events):
         app=mock_app,
         lifespan_mode=LifespanMode.AUTO,
     )
+
+
+def make_app(supports_lifespan):
+    scopes = []
+
+    async def app(scope, receive, send):
+        scopes.append(scope["type"])
+        if scope["type"] == "lifespan":
+            if not supports_lifespan:
+                raise ValueError("Only HTTP connections are handled")
+            message = await receive()
+            await send({"type": f"{message['type']}.complete"})
+            message = await receive()
+            await send({"type": f"{message['type']}.complete"})
+            return
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app, scopes
+
+
+async def test_unsupported_lifespan_probed_once(lambda_events):
+    app, scopes = make_app(supports_lifespan=False)
+    stats = ContainerStats("secret")
+    lynara = Lynara(app, stats=stats)
+
+    for _ in range(3):
+        response = await lynara.run(
+            lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface
+        )
+        assert response["statusCode"] == 204
+
+    assert scopes == ["lifespan", "http", "http", "http"]
+    assert lynara.lifespan_supported == [False]
+    assert stats.counters["lifespan_probes"] == 1
+
+
+async def test_supported_lifespan_run_every_invocation(lambda_events):
+    app, scopes = make_app(supports_lifespan=True)
+    lynara = Lynara(app)
+
+    for _ in range(2):
+        await lynara.run(
+            lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface
+        )
+
+    assert scopes == ["lifespan", "http", "lifespan", "http"]
+    assert lynara.lifespan_supported == [True]
+
+
+def test_unsupported_lifespan_not_probed_on_restart(lambda_events):
+    app, scopes = make_app(supports_lifespan=False)
+    lynara = Lynara(app)
+
+    lynara.handle(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+    lynara.close()
+    lynara.handle(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+    lynara.close()
+
+    assert scopes == ["lifespan", "http", "http"]
@@ -0,0 +1,152 @@
+import gzip
+from base64 import b64decode
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface
+from lynara.interfaces.conditional import make_etag
+from lynara.runner import Lynara
+from lynara.static import StaticFiles, get_accepted_encodings
+from lynara.types import LifespanMode
+
+SCRIPT = b"console.log('lynara');" * 20
+
+
+@pytest.fixture()
+def directory(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "app.js").write_bytes(SCRIPT)
+    (tmp_path / "js" / "app.js.gz").write_bytes(gzip.compress(SCRIPT))
+    (tmp_path / "style.css").write_bytes(b"body {}")
+    return tmp_path
+
+
+def get_event(lambda_events, path, headers=None, method="GET"):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["path"] = path
+    lambda_event["requestContext"]["http"]["method"] = method
+    lambda_event["headers"] = headers or {}
+    return lambda_event
+
+
+async def run(static, event):
+    app = AsyncMock()
+    lynara = Lynara(app, lifespan_mode=LifespanMode.ON, static=static)
+    response = await lynara.run(event, None, APIGatewayProxyEventV2Interface)
+    return app, response
+
+
+def test_index(directory):
+    static = StaticFiles("/static/", directory)
+
+    assert set(static.assets) == {"/static/js/app.js", "/static/style.css"}
+    asset = static.assets["/static/js/app.js"]
+    assert asset.content_type == "text/javascript"
+    assert [variant.encoding for variant in asset.variants] == ["gzip", None]
+    assert asset.variants[1].etag == make_etag(SCRIPT)
+
+
+async def test_served_without_the_app(directory, lambda_events):
+    static = StaticFiles("/static", directory)
+
+    app, response = await run(static, get_event(lambda_events, "/static/style.css"))
+
+    app.assert_not_called()
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert b64decode(response["body"]) == b"body {}"
+    assert response["headers"]["content-type"] == "text/css"
+    assert response["headers"]["content-length"] == "7"
+    assert "vary" not in response["headers"]
+
+
+async def test_precompressed_variant(directory, lambda_events):
+    static = StaticFiles("/static", directory)
+    event = get_event(
+        lambda_events, "/static/js/app.js", {"accept-encoding": "br;q=0, gzip"}
+    )
+
+    _, response = await run(static, event)
+
+    assert response["headers"]["content-encoding"] == "gzip"
+    assert response["headers"]["vary"] == "accept-encoding"
+    assert gzip.decompress(b64decode(response["body"])) == SCRIPT
+
+
+async def test_not_modified(directory, lambda_events):
+    static = StaticFiles("/static", directory)
+    event = get_event(
+        lambda_events, "/static/js/app.js", {"if-none-match": make_etag(SCRIPT)}
+    )
+
+    _, response = await run(static, event)
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+
+
+async def test_over_budget_files_are_mapped(directory, lambda_events):
+    static = StaticFiles("/static", directory, cache_budget=100)
+
+    _, response = await run(static, get_event(lambda_events, "/static/js/app.js"))
+
+    assert static.cached_size <= 100
+    assert static.assets["/static/js/app.js"].variants[1].body is None
+    assert b64decode(response["body"]) == SCRIPT
+
+
+def test_budget_filled_past_a_large_variant(directory):
+    # The compressed script is sorted first but only the stylesheet fits
+    static = StaticFiles("/static", directory, cache_budget=20)
+
+    assert static.assets["/static/js/app.js"].variants[0].body is None
+    assert static.assets["/static/style.css"].variants[0].body is not None
+    assert static.cached_size == 12
+
+
+@pytest.mark.parametrize(
+    ("path", "method"),
+    [("/static/missing.js", "GET"), ("/static/style.css", "POST"), ("/api", "GET")],
+)
+async def test_other_requests_reach_the_app(directory, lambda_events, path, method):
+    static = StaticFiles("/static", directory)
+
+    app, _ = await run(static, get_event(lambda_events, path, method=method))
+
+    app.assert_called()
+
+
+def test_get_accepted_encodings():
+    assert get_accepted_encodings("gzip, deflate, br;q=0.5") == {
+        "gzip",
+        "deflate",
+        "br",
+    }
+    assert get_accepted_encodings("br;q=0.0, gzip") == {"gzip"}
+    assert get_accepted_encodings(None) == set()
+
+
+class CountingInterface(APIGatewayProxyEventV2Interface):
+    __slots__ = ()
+
+    builds = 0
+
+    @property
+    def scope(self):
+        type(self).builds += 1
+        return super().scope
+
+
+async def test_scope_built_once(directory, lambda_events):
+    app = AsyncMock()
+    lynara = Lynara(
+        app,
+        lifespan_mode=LifespanMode.OFF,
+        static=[StaticFiles("/static", directory), StaticFiles("/media", directory)],
+    )
+
+    await lynara.run(get_event(lambda_events, "/api"), None, CountingInterface)
+
+    app.assert_called_once()
+    assert CountingInterface.builds == 1
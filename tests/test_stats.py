@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface, DirectInvocationInterface
+from lynara.runner import Lynara
+from lynara.stats import ContainerStats, Histogram
+from lynara.types import LifespanMode
+from lynara.workers import WorkerPool
+
+SECRET = "s3cr3t"
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"x" * 300})
+
+
+def get_event(lambda_events, path, headers=None):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["path"] = path
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lambda_event["headers"] = headers or {}
+    return lambda_event
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(precision=4)
+
+    for value in range(1, 10_001):
+        histogram.record(value)
+
+    assert histogram.count == 10_000
+    assert histogram.min == 1
+    assert histogram.max == 10_000
+    for percentile in (50, 90, 99):
+        expected = percentile * 100
+        assert expected <= histogram.percentile(percentile) <= expected * (1 + 2**-4)
+
+
+@pytest.mark.parametrize("value", [0, 1, 15, 16, 17, 31, 32, 1000, 123_456_789])
+def test_histogram_bucket_bounds(value):
+    histogram = Histogram(precision=4)
+
+    lowest_value = histogram._lowest_value(histogram._index(value))
+
+    assert lowest_value <= value
+    assert value - lowest_value <= value * 2**-4
+
+
+def test_histogram_clamps_large_values():
+    histogram = Histogram(max_bits=10)
+
+    histogram.record(10**9)
+
+    assert histogram.counts[-1] == 1
+    assert histogram.max == 10**9
+
+
+async def test_stats_endpoint(lambda_events):
+    stats = ContainerStats(SECRET)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, stats=stats)
+    for _ in range(3):
+        await lynara.run(
+            get_event(lambda_events, "/items"), None, APIGatewayProxyEventV2Interface
+        )
+
+    response = await lynara.run(
+        get_event(lambda_events, "/_lynara/stats", {"x-lynara-stats-secret": SECRET}),
+        None,
+        APIGatewayProxyEventV2Interface,
+    )
+
+    assert response["headers"]["content-type"] == "application/json"
+    body = json.loads(response["body"])
+    assert body["invocations"] == 3
+    assert body["warm"] is True
+    assert set(body["histograms"]) == {"lifespan", "scope", "app", "response_size"}
+    assert body["histograms"]["app"]["count"] == 3
+    assert body["histograms"]["response_size"]["p50"] == 300
+
+
+async def test_lifespan_support_is_reported(lambda_events):
+    stats = ContainerStats(SECRET)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.AUTO, stats=stats)
+    assert stats.to_dict()["lifespan_supported"] == [None]
+
+    await lynara.run(
+        get_event(lambda_events, "/items"), None, APIGatewayProxyEventV2Interface
+    )
+
+    assert stats.to_dict()["lifespan_supported"] == [False]
+    assert stats.counters["lifespan_probes"] == 1
+
+
+class CountingInterface(APIGatewayProxyEventV2Interface):
+    __slots__ = ()
+
+    builds = 0
+
+    @property
+    def scope(self):
+        type(self).builds += 1
+        return super().scope
+
+
+async def test_scope_built_once(lambda_events):
+    lynara = Lynara(
+        app,
+        lifespan_mode=LifespanMode.OFF,
+        stats=ContainerStats(SECRET),
+        worker_pool=WorkerPool(processes=1, paths=["/reports"]),
+    )
+
+    await lynara.run(get_event(lambda_events, "/items"), None, CountingInterface)
+
+    assert CountingInterface.builds == 1
+    assert not lynara.worker_pool.started
+
+
+@pytest.mark.parametrize("headers", [None, {"x-lynara-stats-secret": "guess"}])
+async def test_stats_endpoint_requires_the_secret(lambda_events, headers):
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, stats=ContainerStats(SECRET))
+
+    response = await lynara.run(
+        get_event(lambda_events, "/_lynara/stats", headers),
+        None,
+        APIGatewayProxyEventV2Interface,
+    )
+
+    assert "invocations" not in response["body"]
+    assert lynara.stats.counters["invocations"] == 1
+
+
+async def test_direct_invocations_are_counted():
+    stats = ContainerStats(SECRET)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, stats=stats)
+
+    await lynara.run({"method": "GET", "path": "/"}, None, DirectInvocationInterface)
+
+    assert stats.counters["invocations"] == 1
+    assert stats.histograms["response_size"].count == 0
@@ -0,0 +1,159 @@
+import json
+import threading
+from base64 import b64decode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from lynara.interfaces.function_url import PRELUDE_DELIMITER
+from lynara.memory import MemoryGrowthDetector
+from lynara.runner import Lynara
+from lynara.streaming import StreamingRuntime
+from lynara.types import LifespanMode
+
+
+class RuntimeAPIHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = json.dumps(self.server.event).encode()
+        self.send_response(200)
+        self.send_header("Lambda-Runtime-Aws-Request-Id", "request-1")
+        self.send_header("Lambda-Runtime-Deadline-Ms", "4102444800000")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_chunked(self):
+        chunks, trailers = [], {}
+        while size := int(self.rfile.readline(), 16):
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        while line := self.rfile.readline().strip():
+            name, _, value = line.decode().partition(": ")
+            trailers[name] = value
+        return chunks, trailers
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            chunks, trailers = self.read_chunked()
+        else:
+            chunks = [self.rfile.read(int(self.headers["Content-Length"]))]
+            trailers = {}
+        self.server.posts.append((self.path, dict(self.headers), chunks, trailers))
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture()
+def runtime_api(lambda_events):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RuntimeAPIHandler)
+    server.event = lambda_events["api_gw_v2"]
+    server.posts = []
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_once(server, app):
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF)
+    host, port = server.server_address
+    runtime = StreamingRuntime(lynara, runtime_api=f"{host}:{port}")
+    try:
+        runtime.run_once()
+    finally:
+        lynara.close()
+    [post] = server.posts
+    return post
+
+
+def test_buffered_response_posted_once(runtime_api):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"created"})
+
+    path, headers, chunks, _ = run_once(runtime_api, app)
+
+    assert path == "/2018-06-01/runtime/invocation/request-1/response"
+    assert headers["Lambda-Runtime-Function-Response-Mode"] == "streaming"
+    [chunk] = chunks
+    prelude, _, body = chunk.partition(PRELUDE_DELIMITER)
+    assert json.loads(prelude)["statusCode"] == 201
+    assert body == b"created"
+
+
+def test_streamed_response(runtime_api):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"a", "more_body": True})
+        await send({"type": "http.response.body", "body": b"b"})
+
+    _, _, chunks, trailers = run_once(runtime_api, app)
+
+    assert chunks[0].endswith(PRELUDE_DELIMITER)
+    assert chunks[1:] == [b"a", b"b"]
+    assert trailers == {}
+
+
+def test_error_after_streaming_started(runtime_api):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"a", "more_body": True})
+        raise RuntimeError("Lost the upstream")
+
+    _, _, chunks, trailers = run_once(runtime_api, app)
+
+    assert chunks[1:] == [b"a"]
+    assert trailers["Lambda-Runtime-Function-Error-Type"] == "RuntimeError"
+    error = json.loads(b64decode(trailers["Lambda-Runtime-Function-Error-Body"]))
+    assert error["errorMessage"] == "Lost the upstream"
+
+
+def test_error_before_the_response(runtime_api):
+    async def app(scope, receive, send):
+        raise RuntimeError("Broken")
+
+    path, headers, chunks, _ = run_once(runtime_api, app)
+
+    assert path == "/2018-06-01/runtime/invocation/request-1/error"
+    assert headers["Lambda-Runtime-Function-Error-Type"] == "Unhandled"
+    assert json.loads(chunks[0])["errorType"] == "RuntimeError"
+
+
+def test_recycle_after_the_streamed_response(runtime_api):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+
+    detector = MemoryGrowthDetector(every=1, recycle_threshold=-1)
+    lynara = Lynara(app, lifespan_mode=LifespanMode.OFF, memory_detector=detector)
+    lynara.recycle = Mock()
+    host, port = runtime_api.server_address
+    try:
+        StreamingRuntime(lynara, runtime_api=f"{host}:{port}").run_once()
+    finally:
+        lynara.close()
+
+    # Only the streamed response is posted, the runtime recycles after it
+    [(_, headers, _, _)] = runtime_api.posts
+    assert headers["Lambda-Runtime-Function-Response-Mode"] == "streaming"
+    lynara.recycle.assert_called_once_with()
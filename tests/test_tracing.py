@@ -0,0 +1,161 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface, Lynara
+from lynara.static import StaticFiles
+from lynara.tracing import (
+    Tracer,
+    extract_context,
+    parse_traceparent,
+    parse_xray_header,
+)
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+XRAY_HEADER = (
+    "Root=1-5759e988-bd862e3fe1be46a994272793;Parent=53995c3f42cd8ad8;Sampled=0"
+)
+
+
+def test_parse_traceparent():
+    context = parse_traceparent(TRACEPARENT)
+
+    assert context.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    assert context.parent_id == "b7ad6b7169203331"
+    assert context.sampled is True
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331",
+        "ff-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        "00-00000000000000000000000000000000-b7ad6b7169203331-01",
+        "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-zz",
+    ],
+)
+def test_parse_invalid_traceparent(value):
+    assert parse_traceparent(value) is None
+
+
+def test_parse_xray_header():
+    context = parse_xray_header(XRAY_HEADER)
+
+    assert context.trace_id == "5759e988bd862e3fe1be46a994272793"
+    assert context.parent_id == "53995c3f42cd8ad8"
+    assert context.sampled is False
+    assert parse_xray_header("Root=1-5759e988;Sampled=1") is None
+
+
+def test_extract_context_precedence(monkeypatch):
+    monkeypatch.setenv("_X_AMZN_TRACE_ID", XRAY_HEADER)
+    event = {"headers": {"TraceParent": TRACEPARENT, "X-Amzn-Trace-Id": XRAY_HEADER}}
+    assert extract_context(event).parent_id == "b7ad6b7169203331"
+
+    event = {"headers": {"X-Amzn-Trace-Id": XRAY_HEADER}}
+    assert extract_context(event).trace_id == "5759e988bd862e3fe1be46a994272793"
+
+    assert extract_context({"headers": None}).parent_id == "53995c3f42cd8ad8"
+
+    monkeypatch.delenv("_X_AMZN_TRACE_ID")
+    assert extract_context({}) is None
+
+
+def test_head_sampling():
+    tracer = Tracer(exporter=Mock(), sample_rate=0.5)
+
+    with patch("lynara.tracing.random", return_value=0.7):
+        assert tracer.start_trace({}).sampled is False
+    with patch("lynara.tracing.random", return_value=0.3):
+        assert tracer.start_trace({}).sampled is True
+    with patch("lynara.tracing.random", return_value=0.7):
+        event = {"headers": {"traceparent": TRACEPARENT}}
+        assert tracer.start_trace(event).sampled is True
+
+
+async def test_traced_invocation(lambda_events, fastapi_app):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lambda_event["headers"]["traceparent"] = TRACEPARENT
+    exporter = Mock()
+    lynara = Lynara(fastapi_app, tracer=Tracer(exporter=exporter))
+
+    response = await lynara.run(
+        lambda_event, None, APIGatewayProxyEventV2Interface, base_path="/path/to"
+    )
+
+    assert response["statusCode"] == 200
+    trace = exporter.export.call_args.args[0]
+    assert trace.trace_id == "0af7651916cd43dd8448eb211c80319c"
+    spans = {span.name: span for span in trace.spans}
+    assert list(spans) == ["invocation", "lifespan", "scope", "app", "response"]
+    assert spans["invocation"].parent_id == "b7ad6b7169203331"
+    assert spans["response"].parent_id == spans["app"].span_id
+    assert all(span.end_ns >= span.start_ns > 0 for span in trace.spans)
+
+
+async def test_not_sampled_invocation(lambda_events):
+    scopes = []
+
+    async def app(scope, receive, send):
+        scopes.append(scope)
+        await send({"type": "http.response.start", "status": 204})
+        await send({"type": "http.response.body"})
+
+    exporter = Mock()
+    lynara = Lynara(app, lifespan_mode="off", tracer=Tracer(exporter, sample_rate=0))
+    await lynara.run(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+
+    exporter.export.assert_not_called()
+    assert scopes[0]["lynara.trace"].traceparent().endswith("-00")
+    assert scopes[0]["lynara.trace"].spans == [scopes[0]["lynara.trace"].root]
+
+
+async def test_tracing_disabled(lambda_events):
+    scopes = []
+
+    async def app(scope, receive, send):
+        scopes.append(scope)
+        await send({"type": "http.response.start", "status": 204})
+        await send({"type": "http.response.body"})
+
+    lynara = Lynara(app, lifespan_mode="off")
+    await lynara.run(lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface)
+
+    assert "lynara.trace" not in scopes[0]
+
+
+async def test_trace_finished_when_the_app_raises(lambda_events):
+    async def app(scope, receive, send):
+        raise RuntimeError("Broken")
+
+    exporter = Mock()
+    lynara = Lynara(app, lifespan_mode="off", tracer=Tracer(exporter, sample_rate=1))
+
+    with pytest.raises(RuntimeError):
+        await lynara.run(
+            lambda_events["api_gw_v2"], None, APIGatewayProxyEventV2Interface
+        )
+
+    trace = exporter.export.call_args.args[0]
+    assert trace.root.end_ns >= trace.root.start_ns
+
+
+async def test_trace_finished_for_static_files(lambda_events, tmp_path):
+    (tmp_path / "app.js").write_bytes(b"")
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lambda_event["requestContext"]["http"]["path"] = "/static/app.js"
+    exporter = Mock()
+    lynara = Lynara(
+        Mock(),
+        lifespan_mode="off",
+        tracer=Tracer(exporter, sample_rate=1),
+        static=StaticFiles("/static", tmp_path),
+    )
+
+    response = await lynara.run(lambda_event, None, APIGatewayProxyEventV2Interface)
+
+    assert response["statusCode"] == 200
+    exporter.export.assert_called_once()
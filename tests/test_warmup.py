@@ -0,0 +1,151 @@
+import io
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from lynara import APIGatewayProxyEventV2Interface
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+from lynara.warmup import COPY_KEY, LambdaInvoker, LocalInvoker, WarmUp
+
+
+@pytest.mark.parametrize(
+    ("event", "expected"),
+    [
+        ({"warmer": True}, True),
+        ({"warmer": True, "concurrency": 3}, True),
+        ({"source": "serverless-plugin-warmup"}, True),
+        ({"warmer": False}, False),
+        ({"source": "aws.events"}, False),
+        ([{"warmer": True}], False),
+    ],
+)
+def test_matches(event, expected):
+    assert WarmUp().matches(event) is expected
+
+
+def test_custom_patterns():
+    warm_up = WarmUp([{"action": "ping"}])
+
+    assert warm_up.matches({"action": "ping"}) is True
+    assert warm_up.matches({"warmer": True}) is False
+
+
+async def test_ping_skips_the_app():
+    app = AsyncMock()
+    prime = AsyncMock()
+    lynara = Lynara(app, warm_up=WarmUp(prime=prime))
+
+    # Not an API Gateway event, the interface would fail on it
+    response = await lynara.run({"warmer": True}, None, APIGatewayProxyEventV2Interface)
+
+    assert response == {"warm_up": True, "concurrency": 1, "failed": 0}
+    app.assert_not_called()
+    prime.assert_awaited_once()
+
+
+async def test_ping_ends_the_invocation():
+    telemetry = Mock()
+    log_handler = Mock()
+    lynara = Lynara(
+        AsyncMock(), warm_up=WarmUp(), telemetry=telemetry, log_handler=log_handler
+    )
+
+    await lynara.run(
+        {"warmer": True},
+        SimpleNamespace(aws_request_id="request-1"),
+        APIGatewayProxyEventV2Interface,
+    )
+
+    log_handler.begin.assert_called_once_with("request-1")
+    log_handler.flush.assert_called_once_with()
+    telemetry.end_invocation.assert_called_once_with("request-1")
+
+
+def test_ping_starts_the_container(fastapi_app, mock_lifespan):
+    lynara = Lynara(fastapi_app, lifespan_mode=LifespanMode.ON, warm_up=WarmUp())
+
+    try:
+        lynara.handle({"warmer": True}, None, APIGatewayProxyEventV2Interface)
+
+        mock_lifespan.assert_called_once_with(fastapi_app, "startup")
+        assert lynara._lifespan_stack is not None
+    finally:
+        lynara.close()
+
+
+async def test_ping_without_handle_leaves_lifespans(fastapi_app, mock_lifespan):
+    lynara = Lynara(fastapi_app, lifespan_mode=LifespanMode.ON, warm_up=WarmUp())
+
+    await lynara.run({"warmer": True}, None, APIGatewayProxyEventV2Interface)
+
+    # Invocations run alone start their own lifespan
+    mock_lifespan.assert_not_called()
+
+
+async def test_fan_out():
+    copies = Lynara(AsyncMock(), warm_up=WarmUp(delay=0))
+    invoker = LocalInvoker(
+        lambda payload, context: copies.run(
+            payload, context, APIGatewayProxyEventV2Interface
+        )
+    )
+    lynara = Lynara(AsyncMock(), warm_up=WarmUp(invoker=invoker))
+
+    response = await lynara.run(
+        {"warmer": True, "concurrency": 4}, None, APIGatewayProxyEventV2Interface
+    )
+
+    assert response == {"warm_up": True, "concurrency": 4, "failed": 0}
+    assert invoker.payloads == [{"warmer": True, "concurrency": 1, COPY_KEY: True}] * 3
+
+
+async def test_fan_out_failures_are_counted():
+    def handler(payload, context):
+        raise TimeoutError
+
+    warm_up = WarmUp(invoker=LocalInvoker(handler))
+    lynara = Lynara(AsyncMock(), warm_up=warm_up)
+
+    response = await lynara.run(
+        {"warmer": True, "concurrency": 3}, None, APIGatewayProxyEventV2Interface
+    )
+
+    assert response["failed"] == 2
+
+
+async def test_fan_out_needs_an_invoker():
+    lynara = Lynara(AsyncMock(), warm_up=WarmUp())
+
+    with pytest.raises(ValueError, match="invoker"):
+        await lynara.run(
+            {"warmer": True, "concurrency": 2}, None, APIGatewayProxyEventV2Interface
+        )
+
+
+@pytest.mark.parametrize(
+    ("concurrency", "expected"),
+    [("3", 3), ("many", 1), (None, 1), ([2], 1), (-5, 1), (10_000, 8)],
+)
+def test_concurrency_is_validated(concurrency, expected):
+    warm_up = WarmUp(max_concurrency=8)
+
+    assert warm_up.get_concurrency({"concurrency": concurrency}) == expected
+
+
+async def test_lambda_invoker_invokes_the_copies_at_once():
+    copies = 12
+    # Each copy waits for all the others, run in batches they would time out
+    barrier = threading.Barrier(copies, timeout=5)
+
+    def invoke(**kwargs):
+        barrier.wait()
+        return {"Payload": io.BytesIO(b'{"warm_up": true}')}
+
+    invoker = LambdaInvoker("function", client=Mock(invoke=invoke))
+
+    results = await invoker.invoke({"warmer": True}, None, copies)
+
+    assert results == [{"warm_up": True}] * copies
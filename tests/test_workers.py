@@ -0,0 +1,161 @@
+import asyncio
+import os
+
+import pytest
+
+from lynara.interfaces import DirectInvocationInterface
+from lynara.interfaces.direct import DirectInvocationError
+from lynara.runner import Lynara
+from lynara.types import LifespanMode
+from lynara.workers import WorkerPool
+
+# Daemon threads left by other tests, e.g. the profiler's sampler, trigger it
+pytestmark = pytest.mark.filterwarnings(
+    "ignore:This process .* is multi-threaded:DeprecationWarning"
+)
+
+
+async def pid_app(scope, receive, send):
+    await receive()
+    if scope["path"] == "/cpu/slow":
+        await asyncio.sleep(0.5)
+    status = 500 if scope["path"] == "/cpu/error" else 200
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send(
+        {
+            "type": "http.response.body",
+            "body": f'{{"pid": {os.getpid()}, "path": "{scope["path"]}"}}'.encode(),
+        }
+    )
+
+
+@pytest.fixture()
+def lynara():
+    lynara = Lynara(
+        pid_app,
+        lifespan_mode=LifespanMode.OFF,
+        worker_pool=WorkerPool(processes=2, paths=["/cpu"]),
+    )
+    yield lynara
+    lynara.close()
+
+
+def test_marked_route_runs_in_worker(lynara):
+    response = lynara.handle(
+        {"method": "GET", "path": "/cpu/render"}, None, DirectInvocationInterface
+    )
+
+    assert response["path"] == "/cpu/render"
+    assert response["pid"] != os.getpid()
+
+
+def test_other_routes_run_in_container(lynara):
+    response = lynara.handle(
+        {"method": "GET", "path": "/items"}, None, DirectInvocationInterface
+    )
+
+    assert response["pid"] == os.getpid()
+
+
+def test_pool_is_started_once_and_reused(lynara):
+    pids = {
+        lynara.handle(
+            {"method": "GET", "path": "/cpu"}, None, DirectInvocationInterface
+        )["pid"]
+        for _ in range(6)
+    }
+    workers = lynara.worker_pool._workers
+
+    assert len(workers) == 2
+    assert pids <= {worker.process.pid for worker in workers}
+
+
+def test_worker_errors_are_raised(lynara):
+    with pytest.raises(DirectInvocationError) as exc_info:
+        lynara.handle(
+            {"method": "GET", "path": "/cpu/error"}, None, DirectInvocationInterface
+        )
+
+    assert exc_info.value.status == 500
+
+
+def test_predicate_offloads_whole_events():
+    lynara = Lynara(
+        pid_app,
+        lifespan_mode=LifespanMode.OFF,
+        worker_pool=WorkerPool(
+            processes=1, predicate=lambda event: event.get("offload", False)
+        ),
+    )
+    try:
+        response = lynara.handle(
+            {"method": "GET", "path": "/", "offload": True},
+            None,
+            DirectInvocationInterface,
+        )
+    finally:
+        lynara.close()
+
+    assert response["pid"] != os.getpid()
+
+
+def test_batch_is_spread_over_workers(lynara):
+    events = [{"method": "GET", "path": f"/cpu/{i}"} for i in range(8)]
+    events.append({"method": "GET", "path": "/cpu/error"})
+    lynara.handle(events[0], None, DirectInvocationInterface)
+
+    responses = lynara._loop.run_until_complete(
+        lynara.run_batch(events, None, DirectInvocationInterface)
+    )
+
+    assert [response["path"] for response in responses[:-1]] == [
+        f"/cpu/{i}" for i in range(8)
+    ]
+    assert isinstance(responses[-1], DirectInvocationError)
+
+
+def test_close_stops_workers(lynara):
+    lynara.handle({"method": "GET", "path": "/cpu"}, None, DirectInvocationInterface)
+    workers = list(lynara.worker_pool._workers)
+
+    lynara.close()
+
+    assert not lynara.worker_pool.started
+    assert not any(worker.process.is_alive() for worker in workers)
+
+
+def test_cancelled_job_replaces_the_worker():
+    lynara = Lynara(
+        pid_app,
+        lifespan_mode=LifespanMode.OFF,
+        worker_pool=WorkerPool(processes=1, paths=["/cpu"]),
+    )
+    slow = {"method": "GET", "path": "/cpu/slow"}
+    try:
+        lynara.handle(
+            {"method": "GET", "path": "/cpu"}, None, DirectInvocationInterface
+        )
+        [worker] = lynara.worker_pool._workers
+
+        with pytest.raises(TimeoutError):
+            lynara._loop.run_until_complete(
+                asyncio.wait_for(
+                    lynara.run(slow, None, DirectInvocationInterface), 0.05
+                )
+            )
+        response = lynara.handle(
+            {"method": "GET", "path": "/cpu/fast"}, None, DirectInvocationInterface
+        )
+    finally:
+        lynara.close()
+
+    # The slow job's response is not taken for the next one's
+    assert response["path"] == "/cpu/fast"
+    assert response["pid"] != worker.process.pid
+    assert not worker.process.is_alive()
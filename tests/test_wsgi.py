@@ -0,0 +1,85 @@
+from lynara import (
+    APIGatewayProxyEventV1Interface,
+    APIGatewayProxyEventV2Interface,
+    LynaraWSGI,
+)
+from lynara.wsgi import build_environ
+
+
+def echo_app(environ, start_response):
+    write = start_response(
+        "201 Created",
+        [("Content-Type", "text/plain"), ("Set-Cookie", "cookie=test")],
+    )
+    write(environ["REQUEST_METHOD"].encode())
+    return [b" ", environ["PATH_INFO"].encode(), b" ", environ["wsgi.input"].read()]
+
+
+def test_build_environ():
+    scope = {
+        "method": "POST",
+        "root_path": "/api",
+        "path": "/resource",
+        "query_string": b"foo=bar",
+        "server": ("lynara", 443),
+        "client": ("192.168.0.1", 0),
+        "http_version": "1.1",
+        "scheme": "https",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"x-custom", b"one"),
+            (b"x-custom", b"two"),
+        ],
+    }
+    environ = build_environ(scope, b"{}")
+
+    assert environ["REQUEST_METHOD"] == "POST"
+    assert environ["SCRIPT_NAME"] == "/api"
+    assert environ["PATH_INFO"] == "/resource"
+    assert environ["QUERY_STRING"] == "foo=bar"
+    assert environ["SERVER_NAME"] == "lynara"
+    assert environ["SERVER_PORT"] == "443"
+    assert environ["REMOTE_ADDR"] == "192.168.0.1"
+    assert environ["CONTENT_TYPE"] == "application/json"
+    assert environ["CONTENT_LENGTH"] == "2"
+    assert environ["HTTP_X_CUSTOM"] == "one,two"
+    assert environ["wsgi.url_scheme"] == "https"
+    assert environ["wsgi.input"].read() == b"{}"
+
+
+def test_wsgi_api_gateway_v2(lambda_events):
+    lambda_event = lambda_events["api_gw_v2"]
+    response = LynaraWSGI(echo_app).run(
+        lambda_event, None, APIGatewayProxyEventV2Interface, base_path="/path/to"
+    )
+
+    assert response["statusCode"] == 201
+    assert response["headers"] == {"Content-Type": "text/plain"}
+    assert response["cookies"] == ["cookie=test"]
+    assert response["body"] == 'POST /resource {"test":"body"}'
+
+
+def test_wsgi_api_gateway_v1(lambda_events):
+    lambda_event = lambda_events["api_gw_v1"]
+    response = LynaraWSGI(echo_app).run(
+        lambda_event, None, APIGatewayProxyEventV1Interface
+    )
+
+    assert response["statusCode"] == 201
+    assert response["headers"] == {
+        "content-type": "text/plain",
+        "set-cookie": "cookie=test",
+    }
+    assert response["body"] == 'POST /path/to/resource {"test":"body"}'
+
+
+def test_wsgi_django_app(lambda_events, django_wsgi):
+    lambda_event = lambda_events["api_gw_v2"]
+    lambda_event["requestContext"]["http"]["method"] = "GET"
+    lambda_event["requestContext"]["http"]["path"] = "/django/"
+    response = LynaraWSGI(django_wsgi).run(
+        lambda_event, None, APIGatewayProxyEventV2Interface
+    )
+
+    assert response["statusCode"] == 200
+    assert response["body"] == "Hello, world!"